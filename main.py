@@ -1,8 +1,35 @@
-import tkinter as tk
-from modules.interface import AvaliacaoFuzzyApp
+from modules.inicializacao import medir_etapa, relatorio_inicializacao
+import argparse
+import atexit
+
+with medir_etapa("importação do tkinter"):
+    import tkinter as tk
+with medir_etapa("importação de modules.interface"):
+    from modules.interface import AvaliacaoFuzzyApp
 
 # Iniciar a aplicação
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = AvaliacaoFuzzyApp(root)
+    parser = argparse.ArgumentParser(description="Sistema de Avaliação Fuzzy de Alunos")
+    parser.add_argument("--regras", default=None,
+                        help="Definição da base de regras em JSON ou TOML (padrão: modules/regras_padrao.json); "
+                             "alterações no arquivo são recarregadas com o aplicativo aberto")
+    parser.add_argument("--tempos-inicializacao", action="store_true",
+                        help="Exibe o detalhamento dos tempos quando o sistema fuzzy fica pronto")
+    parser.add_argument("--metricas", default=None, metavar="ARQUIVO",
+                        help="Liga a medição por etapa da avaliação e grava os histogramas neste arquivo "
+                             "(.json ou .prom para o formato do Prometheus); ver também a tecla F12")
+    parser.add_argument("--intervalo-metricas", type=float, default=60.0,
+                        help="Segundos entre as gravações do arquivo de métricas (padrão: %(default)s)")
+    args = parser.parse_args()
+    
+    if args.metricas:
+        from modules import instrumentacao
+        instrumentacao.ativar()
+        instrumentacao.iniciar_exportacao_periodica(args.metricas, args.intervalo_metricas)
+        atexit.register(instrumentacao.exportar, args.metricas)
+    
+    with medir_etapa("criação da janela"):
+        root = tk.Tk()
+        app = AvaliacaoFuzzyApp(root, relatar_inicializacao=args.tempos_inicializacao,
+                                arquivo_regras=args.regras)
     root.mainloop()
\ No newline at end of file
@@ -1,106 +1,233 @@
-import tkinter as tk
+import numpy as np
+
+from modules.avaliacao import CLASSIFICACOES, valores_motivacao
+
+# Campo dos dados da interface correspondente a cada coluna da tabela de alunos
+CAMPOS_DADOS = {
+    'Nota_Teoria1': 'nota_da_primeira_avaliação_teórica',
+    'Nota_Teoria2': 'nota_da_segunda_avaliação_teórica',
+    'Nota_Pratica': 'nota_da_avaliação_prática',
+    'Nota_Grupo': 'nota_da_avaliação_em_grupo',
+    'Frequencia': 'frequência',
+    'Participacao': 'participação',
+    'Socioemocional': 'habilidades_socioemocionais',
+    'Contexto': 'contexto_socioeconômico',
+    'Motivacao': 'motivacao',
+    'Motivacao_Cat': 'motivacao_valor',
+    'Perfil_Aluno': 'perfil_aluno',
+    'Metodo_Ensino': 'metodo_ensino'
+}
+
+COLUNAS_NUMERICAS_ANALISE = ['Nota_Teoria1', 'Nota_Teoria2', 'Nota_Pratica', 'Nota_Grupo', 'Frequencia',
+                             'Participacao', 'Socioemocional', 'Contexto', 'Motivacao', 'Desempenho']
+
+# Observações da análise, em grupos (como um if/elif): condições sobre as colunas do lote
+OBSERVACOES = [
+    # Evolução entre as avaliações teóricas
+    [(lambda c: (c['Nota_Teoria1'] < 5) & (c['Nota_Teoria2'] > 7),
+      "O aluno mostrou evolução significativa entre as avaliações teóricas."),
+     (lambda c: (c['Nota_Teoria1'] > 7) & (c['Nota_Teoria2'] < 5),
+      "O aluno apresentou queda no rendimento nas avaliações teóricas.")],
+    # Prática vs. teoria
+    [(lambda c: (c['Nota_Pratica'] > 7) & ((c['Nota_Teoria1'] < 5) | (c['Nota_Teoria2'] < 5)),
+      "O aluno demonstra melhor desempenho prático que teórico."),
+     (lambda c: (c['Nota_Pratica'] < 5) & ((c['Nota_Teoria1'] > 7) | (c['Nota_Teoria2'] > 7)),
+      "O aluno demonstra melhor desempenho teórico que prático.")],
+    # Trabalho em grupo
+    [(lambda c: (c['Nota_Grupo'] > 7) & ((c['Nota_Pratica'] < 5) |
+                                         ((c['Nota_Teoria1'] + c['Nota_Teoria2']) / 2 < 5)),
+      "O aluno tem melhor desempenho em trabalhos colaborativos.")],
+    # Nota vs. motivação
+    [(lambda c: (c['Nota_Pratica'] < 5) & (c['Motivacao'] > 7),
+      "O aluno demonstra alta motivação apesar do baixo desempenho prático."),
+     (lambda c: (c['Nota_Pratica'] > 7) & (c['Motivacao'] < 5),
+      "O aluno tem bom desempenho prático com baixa motivação registrada."),
+     (lambda c: (c['Nota_Pratica'] > 7) & (c['Motivacao'] > 7),
+      "Excelente combinação de desempenho prático e motivação.")],
+    # Participação e frequência
+    [(lambda c: c['Frequencia'] < 60,
+      "A baixa frequência pode estar prejudicando o desempenho geral do aluno.")],
+    [(lambda c: c['Participacao'] < 5,
+      "Aumentar a participação em aula poderia melhorar o envolvimento com o conteúdo.")],
+    # Fatores contextuais
+    [(lambda c: (c['Contexto'] < 5) & (c['Desempenho'] > 60),
+      "O aluno demonstra capacidade de superação frente a desafios socioeconômicos.")],
+    # Habilidades socioemocionais
+    [(lambda c: c['Socioemocional'] > 7,
+      "Boas habilidades socioemocionais contribuem para o desempenho."),
+     (lambda c: c['Socioemocional'] < 5,
+      "O desenvolvimento de habilidades socioemocionais pode beneficiar o aluno.")]
+]
+
+# Perfil vs. método (a única observação que depende do texto de cada aluno)
+MODELO_DISCREPANCIA = ("• O método de ensino {metodo} apresenta discrepância com o perfil de "
+                       "aprendizagem {perfil} do aluno.\n")
+
+# Recomendações por classificação
+RECOMENDACOES = {
+    "Insuficiente": [
+        "Estabelecer metas específicas de curto prazo para melhorar frequência e participação.",
+        "Criar plano de recuperação com foco nas áreas de maior dificuldade.",
+        "Considerar adaptações no método de ensino para maior compatibilidade com o perfil do aluno.",
+        "Realizar feedback mais frequente para acompanhar a evolução do aluno."
+    ],
+    "Regular com dificuldades": [
+        "Identificar fatores específicos que afetam a consistência do desempenho.",
+        "Considerar tutoria ou apoio adicional para superar dificuldades pontuais.",
+        "Verificar se o método de ensino está adequado ao perfil de aprendizagem.",
+        "Propor atividades que alternem entre trabalho individual e em grupo."
+    ],
+    "Regular com potencial": [
+        "Reconhecer e incentivar áreas de maior aptidão do aluno.",
+        "Propor atividades desafiadoras nas áreas onde demonstra maior facilidade.",
+        "Considerar estratégias para aumentar a motivação e o engajamento.",
+        "Estabelecer metas progressivas que estimulem o desenvolvimento."
+    ],
+    "Bom com superação": [
+        "Reconhecer e valorizar o esforço e a superação do aluno.",
+        "Continuar estimulando o desenvolvimento das áreas de maior potencial.",
+        "Incentivar a colaboração com outros alunos para compartilhar experiências.",
+        "Propor desafios que integrem diferentes habilidades."
+    ],
+    "Excelente com equilíbrio": [
+        "Propor desafios adicionais para manter o engajamento e motivação.",
+        "Considerar o aluno como potencial monitor ou apoio a outros estudantes.",
+        "Incentivar o desenvolvimento de projetos pessoais relacionados ao conteúdo.",
+        "Explorar possibilidades de participação em atividades extracurriculares."
+    ]
+}
+
+# === TEXTOS PRÉ-MONTADOS ===
+# Cada observação vira um bit do código da linha; o texto de cada código
+# (e o bloco de recomendações de cada classificação) é montado uma única vez.
+_FRASES = [f"• {frase}\n" for grupo in OBSERVACOES for _, frase in grupo]
+_NOMES_CLASSIFICACAO = [nome for _, nome in CLASSIFICACOES]
+_BLOCOS_RECOMENDACAO = ["\nRecomendações:\n" + "".join(f"• {frase}\n" for frase in RECOMENDACOES.get(nome, []))
+                        for nome in _NOMES_CLASSIFICACAO] + ["\nRecomendações:\n"]
+
+
+def _colunas_analise(tabela):
+    """Extrai da tabela as colunas usadas nas regras da análise (ausentes valem 0 ou texto vazio)"""
+    tamanho = len(next(iter(tabela.values()))) if isinstance(tabela, dict) else len(tabela)
+    colunas = {}
+    for nome in COLUNAS_NUMERICAS_ANALISE:
+        if nome in tabela:
+            colunas[nome] = np.asarray(tabela[nome], dtype=np.float64)
+        else:
+            colunas[nome] = np.zeros(tamanho)
+    for nome in ('Motivacao_Cat', 'Perfil_Aluno', 'Metodo_Ensino', 'Classificacao'):
+        if nome in tabela:
+            valores = np.asarray(tabela[nome], dtype=object)
+            colunas[nome] = np.where([valor is None or valor != valor for valor in valores], "", valores)
+        else:
+            colunas[nome] = np.full(tamanho, "", dtype=object)
+    # A categoria de motivação prevalece sobre o valor numérico (como na inferência)
+    colunas['Motivacao'] = valores_motivacao(colunas['Motivacao_Cat'], colunas['Motivacao'])
+    return colunas
+
+
+def codigos_observacoes(tabela):
+    """
+    Avalia as regras da análise para todos os alunos de uma vez
+
+    Args:
+        tabela (pd.DataFrame ou dict): Colunas do histórico (Nota_Teoria1, ..., Motivacao,
+            Motivacao_Cat, Desempenho); as ausentes valem 0
+
+    Returns:
+        np.ndarray: Código de cada aluno, com um bit por frase de _FRASES
+    """
+    return _codigos(_colunas_analise(tabela))
+
+
+def _codigos(colunas):
+    codigos = np.zeros(len(colunas['Desempenho']), dtype=np.int64)
+    bit = 0
+    for grupo in OBSERVACOES:
+        livres = np.ones(len(codigos), dtype=bool)
+        for condicao, _ in grupo:
+            mascara = condicao(colunas) & livres
+            codigos |= mascara.astype(np.int64) << bit
+            livres &= ~mascara
+            bit += 1
+    return codigos
+
+
+def gerar_analises(tabela):
+    """
+    Gera o texto da análise personalizada de cada aluno de uma tabela
+
+    Args:
+        tabela (pd.DataFrame ou dict): Colunas do histórico, com Desempenho e
+            Classificacao preenchidos; Perfil_Aluno e Metodo_Ensino são opcionais
+
+    Returns:
+        np.ndarray: Texto da análise de cada aluno (array de objetos)
+    """
+    import pandas as pd
+
+    colunas = _colunas_analise(tabela)
+    codigos = _codigos(colunas)
+    classificacoes = pd.Index(_NOMES_CLASSIFICACAO).get_indexer(colunas['Classificacao'])
+    perfis, metodos = _discrepancias(colunas)
+
+    chaves = pd.MultiIndex.from_arrays([codigos, classificacoes, perfis, metodos])
+    posicoes, unicas = pd.factorize(chaves)
+
+    textos = np.empty(len(unicas), dtype=object)
+    for indice, chave in enumerate(unicas):
+        textos[indice] = _montar_texto(*chave)
+    return textos[posicoes]
+
+
+def _discrepancias(colunas):
+    """Perfil e método dos alunos em que eles diferem (texto vazio nos demais)"""
+    discrepancia = ((colunas['Perfil_Aluno'] != "") & (colunas['Metodo_Ensino'] != "") &
+                    (colunas['Perfil_Aluno'] != colunas['Metodo_Ensino']))
+    return np.where(discrepancia, colunas['Perfil_Aluno'], ""), np.where(discrepancia, colunas['Metodo_Ensino'], "")
+
+
+def _montar_texto(codigo, classificacao, perfil, metodo):
+    """Texto de uma combinação de observações (código), classificação (índice, -1 se desconhecida) e discrepância"""
+    partes = ["Análise personalizada:\n"]
+    partes.extend(frase for bit, frase in enumerate(_FRASES) if codigo >> bit & 1)
+    if perfil:
+        partes.append(MODELO_DISCREPANCIA.format(metodo=metodo, perfil=perfil))
+    partes.append(_BLOCOS_RECOMENDACAO[classificacao])
+    return "".join(partes)
+
+
+def analise_personalizada(dados, resultado, classificacao):
+    """
+    Gera a análise personalizada de um aluno
+
+    Args:
+        dados (dict): Dicionário com dados do aluno (campos da interface)
+        resultado (float): Resultado numérico da avaliação fuzzy
+        classificacao (str): Classificação qualitativa do desempenho
+
+    Returns:
+        str: Texto da análise com as recomendações
+    """
+    tabela = {coluna: [dados.get(campo, "" if coluna in ('Motivacao_Cat', 'Perfil_Aluno', 'Metodo_Ensino') else 0)]
+              for coluna, campo in CAMPOS_DADOS.items()}
+    tabela['Desempenho'] = [resultado]
+    tabela['Classificacao'] = [classificacao]
+    # Um único aluno: as mesmas regras, sem o agrupamento do pandas
+    colunas = _colunas_analise(tabela)
+    perfis, metodos = _discrepancias(colunas)
+    indice = _NOMES_CLASSIFICACAO.index(classificacao) if classificacao in _NOMES_CLASSIFICACAO else -1
+    return _montar_texto(int(_codigos(colunas)[0]), indice, perfis[0], metodos[0])
+
 
 def adicionar_analise_personalizada(resultado_texto, dados, resultado, classificacao):
     """
     Adiciona uma análise personalizada com base nos dados e no resultado
-    
+
     Args:
         resultado_texto (tk.Text): Elemento de texto onde será adicionada a análise
         dados (dict): Dicionário com dados do aluno
         resultado (float): Resultado numérico da avaliação fuzzy
         classificacao (str): Classificação qualitativa do desempenho
     """
-    analise = "Análise personalizada:\n"
-    
-    # Analisar notas
-    nota_teoria1 = dados.get('nota_da_primeira_avaliação_teórica', 0)
-    nota_teoria2 = dados.get('nota_da_segunda_avaliação_teórica', 0)
-    nota_pratica = dados.get('nota_da_avaliação_prática', 0)
-    nota_grupo = dados.get('nota_da_avaliação_em_grupo', 0)
-    
-    if nota_teoria1 < 5 and nota_teoria2 > 7:
-        analise += "• O aluno mostrou evolução significativa entre as avaliações teóricas.\n"
-    elif nota_teoria1 > 7 and nota_teoria2 < 5:
-        analise += "• O aluno apresentou queda no rendimento nas avaliações teóricas.\n"
-    
-    if nota_pratica > 7 and (nota_teoria1 < 5 or nota_teoria2 < 5):
-        analise += "• O aluno demonstra melhor desempenho prático que teórico.\n"
-    elif nota_pratica < 5 and (nota_teoria1 > 7 or nota_teoria2 > 7):
-        analise += "• O aluno demonstra melhor desempenho teórico que prático.\n"
-        
-    if nota_grupo > 7 and (nota_pratica < 5 or (nota_teoria1 + nota_teoria2)/2 < 5):
-        analise += "• O aluno tem melhor desempenho em trabalhos colaborativos.\n"
-    
-    # Analisar nota vs. motivação
-    motivacao = dados.get('motivação', 0)
-    
-    if nota_pratica < 5 and motivacao > 7:
-        analise += "• O aluno demonstra alta motivação apesar do baixo desempenho prático.\n"
-    elif nota_pratica > 7 and motivacao < 5:
-        analise += "• O aluno tem bom desempenho prático com baixa motivação registrada.\n"
-    elif nota_pratica > 7 and motivacao > 7:
-        analise += "• Excelente combinação de desempenho prático e motivação.\n"
-    
-    # Analisar participação e frequência
-    participacao = dados.get('participação', 0)
-    frequencia = dados.get('frequência', 0)
-    
-    if frequencia < 60:
-        analise += "• A baixa frequência pode estar prejudicando o desempenho geral do aluno.\n"
-    if participacao < 5:
-        analise += "• Aumentar a participação em aula poderia melhorar o envolvimento com o conteúdo.\n"
-    
-    # Analisar fatores contextuais
-    contexto = dados.get('contexto_socioeconômico', 0)
-    if contexto < 5 and resultado > 60:
-        analise += "• O aluno demonstra capacidade de superação frente a desafios socioeconômicos.\n"
-    
-    # Analisar habilidades socioemocionais
-    socioemocional = dados.get('habilidades_socioemocionais', 0)
-    
-    if socioemocional > 7:
-        analise += "• Boas habilidades socioemocionais contribuem para o desempenho.\n"
-    elif socioemocional < 5:
-        analise += "• O desenvolvimento de habilidades socioemocionais pode beneficiar o aluno.\n"
-    
-    # Analisar perfil vs. método
-    perfil_aluno = dados.get('perfil_aluno', '')
-    metodo_ensino = dados.get('metodo_ensino', '')
-    
-    if perfil_aluno and metodo_ensino and perfil_aluno != metodo_ensino:
-        analise += f"• O método de ensino {metodo_ensino} apresenta discrepância com o perfil de aprendizagem {perfil_aluno} do aluno.\n"
-    
-    # Adicionar recomendações com base na classificação atualizada
-    analise += "\nRecomendações:\n"
-    
-    if classificacao == "Insuficiente":
-        analise += "• Estabelecer metas específicas de curto prazo para melhorar frequência e participação.\n"
-        analise += "• Criar plano de recuperação com foco nas áreas de maior dificuldade.\n"
-        analise += "• Considerar adaptações no método de ensino para maior compatibilidade com o perfil do aluno.\n"
-        analise += "• Realizar feedback mais frequente para acompanhar a evolução do aluno.\n"
-        
-    elif classificacao == "Regular com dificuldades":
-        analise += "• Identificar fatores específicos que afetam a consistência do desempenho.\n"
-        analise += "• Considerar tutoria ou apoio adicional para superar dificuldades pontuais.\n"
-        analise += "• Verificar se o método de ensino está adequado ao perfil de aprendizagem.\n"
-        analise += "• Propor atividades que alternem entre trabalho individual e em grupo.\n"
-        
-    elif classificacao == "Regular com potencial":
-        analise += "• Reconhecer e incentivar áreas de maior aptidão do aluno.\n"
-        analise += "• Propor atividades desafiadoras nas áreas onde demonstra maior facilidade.\n"
-        analise += "• Considerar estratégias para aumentar a motivação e o engajamento.\n"
-        analise += "• Estabelecer metas progressivas que estimulem o desenvolvimento.\n"
-        
-    elif classificacao == "Bom com superação":
-        analise += "• Reconhecer e valorizar o esforço e a superação do aluno.\n"
-        analise += "• Continuar estimulando o desenvolvimento das áreas de maior potencial.\n"
-        analise += "• Incentivar a colaboração com outros alunos para compartilhar experiências.\n"
-        analise += "• Propor desafios que integrem diferentes habilidades.\n"
-        
-    elif classificacao == "Excelente com equilíbrio":
-        analise += "• Propor desafios adicionais para manter o engajamento e motivação.\n"
-        analise += "• Considerar o aluno como potencial monitor ou apoio a outros estudantes.\n"
-        analise += "• Incentivar o desenvolvimento de projetos pessoais relacionados ao conteúdo.\n"
-        analise += "• Explorar possibilidades de participação em atividades extracurriculares.\n"
-    
-    resultado_texto.insert(tk.END, analise)
\ No newline at end of file
+    resultado_texto.insert("end", analise_personalizada(dados, resultado, classificacao))
@@ -0,0 +1,186 @@
+import numpy as np
+
+from modules.compatibilidade import ajustar_notas_lote
+
+# Valor numérico usado pelo sistema fuzzy para cada categoria de motivação
+VALORES_MOTIVACAO = {"Alta": 9.0, "Média": 5.0, "Baixa": 2.0}
+
+# Limites superiores (exclusivos) de cada classificação, em ordem crescente
+CLASSIFICACOES = [
+    (30, "Insuficiente"),
+    (45, "Regular com dificuldades"),
+    (60, "Regular com potencial"),
+    (75, "Bom com superação"),
+    (np.inf, "Excelente com equilíbrio")
+]
+
+
+def calcular_nota_media(nota_teoria1, nota_teoria2, nota_pratica, nota_grupo):
+    """
+    Calcula a média das quatro avaliações usada como entrada do sistema fuzzy
+
+    Returns:
+        float ou np.ndarray: Média simples das notas
+    """
+    return (nota_teoria1 + nota_teoria2 + nota_pratica + nota_grupo) / 4
+
+
+def verificar_casos_extremos(nota_ajustada, frequencia, participacao, socioemocional,
+                             contexto, motivacao_cat):
+    """
+    Identifica alunos com todos os parâmetros mínimos ou todos máximos
+
+    Args:
+        nota_ajustada: Nota já ajustada pela compatibilidade
+        frequencia: Frequência (0-100)
+        participacao: Participação (0-10)
+        socioemocional: Habilidades socioemocionais (0-10)
+        contexto: Contexto socioeconômico (0-10)
+        motivacao_cat: Categoria de motivação ("Alta", "Média" ou "Baixa")
+
+    Returns:
+        tuple: (todas_maximas, todas_minimas), booleanos ou arrays de booleanos
+    """
+    motivacao_cat = np.asarray(motivacao_cat, dtype=object)
+
+    # Usar o texto da motivação em vez do valor numérico
+    todas_minimas = (
+        (np.asarray(nota_ajustada) <= 1.0) &
+        (np.asarray(frequencia) <= 20) &
+        (np.asarray(participacao) <= 1.0) &
+        (np.asarray(socioemocional) <= 1.0) &
+        (np.asarray(contexto) <= 1.0) &
+        (motivacao_cat == "Baixa")
+    )
+    todas_maximas = (
+        (np.asarray(nota_ajustada) >= 9.7) &
+        (np.asarray(frequencia) >= 97) &
+        (np.asarray(participacao) >= 9.7) &
+        (np.asarray(socioemocional) >= 9.7) &
+        (np.asarray(contexto) >= 9.7) &
+        (motivacao_cat == "Alta")
+    )
+    if np.ndim(todas_maximas) == 0:
+        return bool(todas_maximas), bool(todas_minimas)
+    return todas_maximas, todas_minimas
+
+
+def aplicar_casos_extremos(resultado, todas_maximas, todas_minimas):
+    """
+    Força 100 para os casos todos máximos e 0 para os todos mínimos e limita a 0-100
+
+    Returns:
+        float ou np.ndarray: Resultado ajustado
+    """
+    resultado = np.where(todas_maximas, 100.0, np.where(todas_minimas, 0.0, resultado))
+    resultado = np.clip(resultado, 0, 100)
+    return float(resultado) if resultado.ndim == 0 else resultado
+
+
+def desempenho_alternativo(nota_ajustada, frequencia, participacao, socioemocional,
+                           contexto, motivacao_cat):
+    """
+    Método alternativo simples, baseado em média ponderada, usado quando o cálculo fuzzy falha
+
+    Returns:
+        float ou np.ndarray: Desempenho estimado (0-100)
+    """
+    # Converter motivação para valor ponderado baseado no texto
+    pesos = {"Alta": 0.9, "Média": 0.5, "Baixa": 0.2}
+    categorias = np.asarray(motivacao_cat, dtype=object)
+    peso_motivacao = np.vectorize(lambda categoria: pesos.get(categoria, 0.5), otypes=[float])(categorias)
+
+    resultado = (np.asarray(nota_ajustada) * 0.4 +
+                 np.asarray(frequencia) * 0.15 / 10 +
+                 np.asarray(participacao) * 0.15 +
+                 np.asarray(socioemocional) * 0.1 +
+                 np.asarray(contexto) * 0.1 +
+                 (10 * peso_motivacao) * 0.1) * 10  # Usando a ponderação de motivação
+    return float(resultado) if resultado.ndim == 0 else resultado
+
+
+def classificar_desempenho(resultado):
+    """
+    Converte o resultado numérico na classificação qualitativa
+
+    Args:
+        resultado (float ou array_like): Desempenho (0-100)
+
+    Returns:
+        str ou np.ndarray: Classificação (array de objetos para entradas em lote); um
+            resultado indefinido (NaN) não é classificado e recebe texto vazio
+    """
+    limites = np.array([limite for limite, _ in CLASSIFICACOES[:-1]])
+    nomes = np.array([nome for _, nome in CLASSIFICACOES], dtype=object)
+    resultado = np.asarray(resultado, dtype=np.float64)
+    # O searchsorted colocaria o NaN depois de todos os limites, na classificação mais alta
+    classificacao = np.where(np.isnan(resultado), "", nomes[np.searchsorted(limites, resultado, side='right')])
+    return classificacao.astype(object) if classificacao.ndim else str(classificacao)
+
+
+def valores_motivacao(motivacao_cat, motivacao=None):
+    """
+    Converte categorias de motivação no valor numérico do sistema fuzzy
+
+    Args:
+        motivacao_cat (array_like): Categorias ("Alta", "Média" ou "Baixa")
+        motivacao (array_like): Valores numéricos usados quando a categoria é desconhecida
+
+    Returns:
+        np.ndarray: Motivação numérica (0-10)
+    """
+    categorias = np.asarray(motivacao_cat, dtype=object)
+    reserva = np.zeros(categorias.shape) if motivacao is None else np.asarray(motivacao, dtype=np.float64)
+    valores = np.array([VALORES_MOTIVACAO.get(categoria, np.nan) for categoria in categorias.ravel()],
+                       dtype=np.float64).reshape(categorias.shape)
+    return np.where(np.isnan(valores), reserva, valores)
+
+
+def pontuar_alunos(sistema, notas, perfis, metodos, frequencia, participacao, socioemocional,
+                   contexto, motivacao_cat, motivacao=None):
+    """
+    Aplica ao lote o mesmo fluxo de avaliar_aluno (ajuste, inferência, casos extremos e classificação)
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        notas (array_like): Média das avaliações de cada aluno
+        perfis (array_like): Perfil de aprendizagem de cada aluno
+        metodos (array_like): Método de ensino de cada aluno
+        frequencia, participacao, socioemocional, contexto (array_like): Demais entradas
+        motivacao_cat (array_like): Categoria de motivação de cada aluno
+        motivacao (array_like): Motivação numérica usada quando a categoria é desconhecida
+
+    Returns:
+        dict: Arrays 'nota_ajustada', 'desempenho' e 'classificacao'
+    """
+    nota_ajustada = ajustar_notas_lote(notas, perfis, metodos)
+    frequencia = np.asarray(frequencia, dtype=np.float64)
+    participacao = np.asarray(participacao, dtype=np.float64)
+    socioemocional = np.asarray(socioemocional, dtype=np.float64)
+    contexto = np.asarray(contexto, dtype=np.float64)
+
+    desempenho = sistema.avaliar(
+        nota=nota_ajustada,
+        frequencia=frequencia,
+        participacao=participacao,
+        socioemocional=socioemocional,
+        contexto=contexto,
+        motivacao=valores_motivacao(motivacao_cat, motivacao)
+    )
+
+    # Alunos em que o cálculo fuzzy falhou recebem o método alternativo
+    falhas = np.isnan(desempenho)
+    if falhas.any():
+        alternativo = desempenho_alternativo(nota_ajustada, frequencia, participacao,
+                                             socioemocional, contexto, motivacao_cat)
+        desempenho = np.where(falhas, alternativo, desempenho)
+
+    todas_maximas, todas_minimas = verificar_casos_extremos(
+        nota_ajustada, frequencia, participacao, socioemocional, contexto, motivacao_cat)
+    desempenho = aplicar_casos_extremos(desempenho, todas_maximas, todas_minimas)
+
+    return {
+        'nota_ajustada': nota_ajustada,
+        'desempenho': desempenho,
+        'classificacao': classificar_desempenho(desempenho)
+    }
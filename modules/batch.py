@@ -0,0 +1,270 @@
+"""
+Avaliação em lote sem interface gráfica
+
+Uso:
+    python -m modules.batch alunos.csv resultados.csv [--tamanho-bloco 50000] [--trabalhadores 8]
+                            [--regras minhas_regras.json] [--analise]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.analise import gerar_analises
+from modules.avaliacao import VALORES_MOTIVACAO, calcular_nota_media, pontuar_alunos
+from modules.motor_compilado import carregar_sistema
+from modules.paralelo import mapear_blocos
+
+COLUNAS_NUMERICAS = ["Nota_Teoria1", "Nota_Teoria2", "Nota_Pratica", "Nota_Grupo", "Frequencia",
+                     "Participacao", "Socioemocional", "Contexto", "Motivacao"]
+
+TIPOS_COLUNAS = {
+    "Matricula": str,
+    "Nome": str,
+    "Motivacao_Cat": str,
+    "Perfil_Aluno": str,
+    "Metodo_Ensino": str,
+    **{coluna: np.float64 for coluna in COLUNAS_NUMERICAS}
+}
+
+# Valor máximo de cada coluna numérica obrigatória (o mínimo é 0), como nos campos da interface
+LIMITES_COLUNAS = {
+    "Nota_Teoria1": 10,
+    "Nota_Teoria2": 10,
+    "Nota_Pratica": 10,
+    "Nota_Grupo": 10,
+    "Frequencia": 100,
+    "Participacao": 10,
+    "Socioemocional": 10,
+    "Contexto": 10
+}
+
+# Linhas relatadas pela linha de comando; as demais entram só na contagem
+MAXIMO_REJEITADOS_EXIBIDOS = 20
+
+
+def _numeros(bloco, coluna):
+    """Valores da coluna como float64, com as máscaras de células vazias e de textos não numéricos"""
+    serie = bloco[coluna]
+    if pd.api.types.is_numeric_dtype(serie.dtype) and not pd.api.types.is_bool_dtype(serie.dtype):
+        valores = serie.to_numpy(dtype=np.float64)
+        return valores, np.isnan(valores), np.zeros(len(valores), dtype=bool)
+    texto = serie.fillna("").astype(str).str.strip()
+    valores = pd.to_numeric(texto, errors="coerce").to_numpy(dtype=np.float64)
+    vazio = (texto == "").to_numpy()
+    return valores, vazio, np.isnan(valores) & ~vazio
+
+
+def validar_bloco(bloco):
+    """
+    Confere cada linha do bloco com as regras dos campos da interface
+
+    Args:
+        bloco (pd.DataFrame): Linhas com as colunas do histórico (numéricas ou em texto)
+
+    Returns:
+        tuple: (linhas válidas, com as colunas numéricas convertidas para float64,
+            lista de (linha no arquivo, mensagem) das linhas rejeitadas)
+    """
+    erros = np.full(len(bloco), None, dtype=object)
+
+    def rejeitar(mascara, mensagem):
+        # Só o primeiro problema de cada linha é relatado, como no formulário
+        for posicao in np.flatnonzero(mascara & (erros == None)):  # noqa: E711
+            erros[posicao] = mensagem(posicao)
+
+    convertidas = {}
+    for coluna, maximo in LIMITES_COLUNAS.items():
+        valores, vazio, invalido = _numeros(bloco, coluna)
+        texto = bloco[coluna].to_numpy()
+        rejeitar(vazio, lambda _, coluna=coluna: f"O campo {coluna} não pode estar vazio.")
+        rejeitar(invalido, lambda posicao, coluna=coluna, texto=texto:
+                 f"O valor '{texto[posicao]}' no campo {coluna} não é um número válido.")
+        with np.errstate(invalid="ignore"):
+            fora = ~vazio & ~invalido & ~((valores >= 0) & (valores <= maximo))
+        rejeitar(fora, lambda _, coluna=coluna, maximo=maximo:
+                 f"O valor do campo {coluna} deve estar entre 0 e {maximo}.")
+        convertidas[coluna] = valores
+
+    # Motivação: categoria conhecida ou, sem categoria, a Motivacao numérica (0-10)
+    categorias = (bloco["Motivacao_Cat"].fillna("").astype(str).str.strip().to_numpy()
+                  if "Motivacao_Cat" in bloco.columns else np.full(len(bloco), "", dtype=object))
+    conhecida = np.isin(categorias, list(VALORES_MOTIVACAO))
+    if "Motivacao" in bloco.columns:
+        motivacao, vazio, invalido = _numeros(bloco, "Motivacao")
+        texto = bloco["Motivacao"].to_numpy()
+    else:
+        motivacao = np.full(len(bloco), np.nan)
+        vazio, invalido = np.ones(len(bloco), dtype=bool), np.zeros(len(bloco), dtype=bool)
+    rejeitar(~conhecida & ((categorias != "") | vazio),
+             lambda _: f"O campo Motivacao_Cat deve ser {', '.join(VALORES_MOTIVACAO)} "
+                       f"(ou informe a Motivacao numérica).")
+    rejeitar(~conhecida & invalido,
+             lambda posicao: f"O valor '{texto[posicao]}' no campo Motivacao não é um número válido.")
+    with np.errstate(invalid="ignore"):
+        rejeitar(~conhecida & ~vazio & ~invalido & ~((motivacao >= 0) & (motivacao <= 10)),
+                 lambda _: "O valor do campo Motivacao deve estar entre 0 e 10.")
+    convertidas["Motivacao"] = motivacao
+
+    validas = erros == None  # noqa: E711
+    rejeitados = [(int(linha) + 2, mensagem)  # cabeçalho é a linha 1 do arquivo
+                  for linha, mensagem in zip(bloco.index[~validas], erros[~validas])]
+    bloco = bloco.assign(**convertidas)
+    if "Motivacao_Cat" in bloco.columns:
+        bloco["Motivacao_Cat"] = categorias
+    return bloco[validas], rejeitados
+
+
+def avaliar_bloco(sistema, bloco):
+    """
+    Avalia um bloco da planilha e preenche Desempenho e Classificacao
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        bloco (pd.DataFrame): Linhas com as colunas do histórico
+
+    Returns:
+        tuple: (linhas válidas com as colunas de resultado preenchidas,
+            lista de (linha no arquivo, mensagem) das linhas rejeitadas por validar_bloco)
+
+    Raises:
+        ValueError: Faltam colunas obrigatórias
+    """
+    _conferir_colunas(bloco.columns)
+    bloco, rejeitados = validar_bloco(bloco)
+
+    def coluna(nome, padrao):
+        if nome in bloco.columns:
+            return bloco[nome].to_numpy()
+        return np.full(len(bloco), padrao, dtype=object)
+
+    notas = calcular_nota_media(*(bloco[nome].to_numpy(dtype=np.float64) for nome in COLUNAS_NUMERICAS[:4]))
+    motivacao = bloco["Motivacao"].to_numpy(dtype=np.float64) if "Motivacao" in bloco.columns else None
+
+    resultado = pontuar_alunos(
+        sistema,
+        notas,
+        coluna("Perfil_Aluno", ""),
+        coluna("Metodo_Ensino", ""),
+        bloco["Frequencia"].to_numpy(dtype=np.float64),
+        bloco["Participacao"].to_numpy(dtype=np.float64),
+        bloco["Socioemocional"].to_numpy(dtype=np.float64),
+        bloco["Contexto"].to_numpy(dtype=np.float64),
+        coluna("Motivacao_Cat", ""),
+        motivacao
+    )
+    bloco["Desempenho"] = resultado['desempenho']
+    bloco["Classificacao"] = resultado['classificacao']
+    return bloco, rejeitados
+
+
+def avaliar_bloco_com_analise(sistema, bloco):
+    """Avalia o bloco (avaliar_bloco) e preenche a coluna Analise com a análise personalizada"""
+    bloco, rejeitados = avaliar_bloco(sistema, bloco)
+    bloco["Analise"] = gerar_analises(bloco) if len(bloco) else []
+    return bloco, rejeitados
+
+
+def _conferir_colunas(colunas):
+    faltando = [coluna for coluna in LIMITES_COLUNAS if coluna not in colunas]
+    if faltando:
+        raise ValueError(f"Colunas ausentes no arquivo de entrada: {', '.join(faltando)}.")
+
+
+def processar_arquivo(entrada, saida, sistema, tamanho_bloco=50000, relatar=None, trabalhadores=1,
+                      analise=False, rejeitados=None):
+    """
+    Avalia um CSV em blocos e grava os resultados (via arquivo temporário)
+
+    Args:
+        entrada (str): Caminho do CSV de entrada
+        saida (str): Caminho do CSV de saída (sobrescrito)
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        tamanho_bloco (int): Linhas lidas e avaliadas por vez
+        relatar (callable): Chamado como relatar(linhas, segundos) após cada bloco
+        trabalhadores (int): Processos usados na avaliação (1 executa em série, 0 usa todos os núcleos)
+        analise (bool): Acrescenta a coluna Analise com a análise personalizada
+        rejeitados (list): Recebe (linha no arquivo, mensagem) de cada linha inválida, que não vai para a saída
+
+    Returns:
+        tuple: (total de linhas avaliadas, segundos decorridos)
+
+    Raises:
+        ValueError: Faltam colunas obrigatórias no arquivo de entrada
+    """
+    inicio = time.perf_counter()
+    total = 0
+    # Cabeçalho conferido antes de criar qualquer arquivo de saída
+    _conferir_colunas(pd.read_csv(entrada, nrows=0).columns)
+    # Colunas numéricas lidas como texto: validar_bloco relata valores inválidos por linha
+    leitor = pd.read_csv(entrada, chunksize=tamanho_bloco, dtype=str, keep_default_na=False)
+
+    temporario = f"{saida}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, "w", newline="", encoding="utf-8") as arquivo:
+            avaliados = mapear_blocos(avaliar_bloco_com_analise if analise else avaliar_bloco, leitor, sistema,
+                                      trabalhadores)
+            cabecalho = True
+            for bloco, invalidos in avaliados:
+                if rejeitados is not None:
+                    rejeitados.extend(invalidos)
+                if len(bloco) or cabecalho:
+                    bloco.to_csv(arquivo, index=False, header=cabecalho)
+                    cabecalho = False
+                total += len(bloco)
+                if relatar:
+                    relatar(total, time.perf_counter() - inicio)
+        os.replace(temporario, saida)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+    return total, time.perf_counter() - inicio
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Avaliação fuzzy de alunos em lote (sem interface gráfica)")
+    parser.add_argument("entrada", help="CSV de alunos com as colunas do histórico")
+    parser.add_argument("saida", help="CSV de saída com Desempenho e Classificacao preenchidos")
+    parser.add_argument("--tamanho-bloco", type=int, default=50000, help="Linhas processadas por vez")
+    parser.add_argument("--trabalhadores", type=int, default=1,
+                        help="Processos para avaliação paralela (0 usa todos os núcleos)")
+    parser.add_argument("--metodo", choices=["centroid", "bisector", "mom"], default=None,
+                        help="Método de defuzzificação (padrão: o do sistema)")
+    parser.add_argument("--regras", default=None,
+                        help="Definição da base de regras em JSON ou TOML (padrão: modules/regras_padrao.json)")
+    parser.add_argument("--analise", action="store_true",
+                        help="Inclui a coluna Analise com a análise personalizada de cada aluno")
+    parser.add_argument("--silencioso", action="store_true", help="Não exibir o progresso")
+    args = parser.parse_args(argumentos)
+
+    sistema = carregar_sistema(metodo_defuzzificacao=args.metodo, arquivo_regras=args.regras)
+
+    def relatar(linhas, segundos):
+        if not args.silencioso:
+            print(f"\r{linhas} linhas ({linhas / max(segundos, 1e-9):.0f} linhas/s)",
+                  end="", file=sys.stderr, flush=True)
+
+    rejeitados = []
+    try:
+        total, segundos = processar_arquivo(args.entrada, args.saida, sistema, args.tamanho_bloco, relatar,
+                                            args.trabalhadores, args.analise, rejeitados)
+    except (OSError, ValueError) as erro:
+        print(f"Erro: {erro}", file=sys.stderr)
+        return 1
+    if not args.silencioso:
+        print(file=sys.stderr)
+    for linha, mensagem in rejeitados[:MAXIMO_REJEITADOS_EXIBIDOS]:
+        print(f"Linha {linha}: {mensagem}", file=sys.stderr)
+    if len(rejeitados) > MAXIMO_REJEITADOS_EXIBIDOS:
+        print(f"... e mais {len(rejeitados) - MAXIMO_REJEITADOS_EXIBIDOS} linhas inválidas", file=sys.stderr)
+    print(f"{total} alunos avaliados em {segundos:.2f} s ({total / max(segundos, 1e-9):.0f} linhas/s)"
+          + (f"; {len(rejeitados)} linhas inválidas ignoradas" if rejeitados else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
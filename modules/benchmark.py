@@ -0,0 +1,424 @@
+"""
+Benchmark do sistema de avaliação (resultados em JSON)
+
+Uso:
+    python -m modules.benchmark [--saida benchmark.json] [--rapido] [--comparar anterior.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+# Tamanhos padrão das turmas sintéticas e dos históricos medidos
+TAMANHOS_LOTE = (1000, 10000, 100000, 1000000)
+TAMANHOS_HISTORICO = (0, 10000, 100000)
+
+# Módulos medidos na importação a frio
+MODULOS_IMPORTACAO = ("modules.interface", "modules.motor_compilado", "modules.fuzzy_logic", "modules.batch")
+
+# Tolerância padrão da comparação: 20% mais lento que a execução anterior
+TOLERANCIA_PADRAO = 0.2
+
+
+def medir(funcao, repeticoes=20, aquecimento=1):
+    """
+    Mede o tempo de várias chamadas de uma função
+
+    Args:
+        funcao (callable): Chamada sem argumentos
+        repeticoes (int): Chamadas medidas
+        aquecimento (int): Chamadas iniciais descartadas
+
+    Returns:
+        dict: 'segundos' (mediana), 'p95', 'minimo', 'maximo' e 'repeticoes'
+    """
+    for _ in range(aquecimento):
+        funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tempos = np.array(tempos)
+    return {
+        'segundos': float(np.median(tempos)),
+        'p95': float(np.percentile(tempos, 95)),
+        'minimo': float(tempos.min()),
+        'maximo': float(tempos.max()),
+        'repeticoes': repeticoes
+    }
+
+
+def gerar_turma(quantidade, semente=0):
+    """
+    Gera uma turma sintética com as colunas da planilha de modules.batch
+
+    Args:
+        quantidade (int): Número de alunos
+        semente (int): Semente do sorteio
+
+    Returns:
+        pd.DataFrame: Uma linha por aluno
+    """
+    import pandas as pd
+    from modules.avaliacao import VALORES_MOTIVACAO
+    from modules.compatibilidade import MATRIZ_DIFICULDADE
+
+    gerador = np.random.default_rng(semente)
+    perfis = list(MATRIZ_DIFICULDADE)
+    metodos = list(MATRIZ_DIFICULDADE[perfis[0]])
+    motivacoes = list(VALORES_MOTIVACAO)
+    nota = lambda: np.round(gerador.uniform(0, 10, quantidade), 1)
+    return pd.DataFrame({
+        "Matricula": np.arange(quantidade).astype(str),
+        "Nome": "Aluno",
+        "Nota_Teoria1": nota(),
+        "Nota_Teoria2": nota(),
+        "Nota_Pratica": nota(),
+        "Nota_Grupo": nota(),
+        "Frequencia": np.round(gerador.uniform(0, 100, quantidade), 1),
+        "Participacao": nota(),
+        "Socioemocional": nota(),
+        "Contexto": nota(),
+        "Motivacao_Cat": np.array(motivacoes)[gerador.integers(len(motivacoes), size=quantidade)],
+        "Perfil_Aluno": np.array(perfis)[gerador.integers(len(perfis), size=quantidade)],
+        "Metodo_Ensino": np.array(metodos)[gerador.integers(len(metodos), size=quantidade)]
+    })
+
+
+@contextmanager
+def _diretorio_temporario():
+    """Executa o bloco em um diretório temporário (o histórico do usuário não é tocado)"""
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            yield diretorio
+        finally:
+            os.chdir(diretorio_original)
+
+
+def _dados_aluno(gerador):
+    """Dados de um aluno no formato lido dos campos da interface"""
+    from modules.avaliacao import VALORES_MOTIVACAO
+    from modules.compatibilidade import MATRIZ_DIFICULDADE
+
+    perfis = list(MATRIZ_DIFICULDADE)
+    categoria = str(gerador.choice(list(VALORES_MOTIVACAO)))
+    valor = lambda maximo=10: round(float(gerador.uniform(0, maximo)), 1)
+    return {
+        'matrícula': str(gerador.integers(10 ** 6)),
+        'nome_do_aluno': "Aluno",
+        'nota_da_primeira_avaliação_teórica': valor(),
+        'nota_da_segunda_avaliação_teórica': valor(),
+        'nota_da_avaliação_prática': valor(),
+        'nota_da_avaliação_em_grupo': valor(),
+        'frequência': valor(100),
+        'participação': valor(),
+        'habilidades_socioemocionais': valor(),
+        'contexto_socioeconômico': valor(),
+        'motivacao': VALORES_MOTIVACAO[categoria],
+        'motivacao_valor': categoria,
+        'perfil_aluno': str(gerador.choice(perfis)),
+        'metodo_ensino': str(gerador.choice(perfis))
+    }
+
+
+def medir_avaliacao_individual(sistema, repeticoes=200):
+    """
+    Latência de uma avaliação pelo fluxo do botão "Avaliar Aluno", sem a janela
+    """
+    from types import SimpleNamespace
+
+    from modules.cache import CacheAvaliacoes
+    from modules.interface import AvaliacaoFuzzyApp
+
+    def inferir(**entradas):
+        resultado = float(sistema.avaliar(**entradas))
+        if np.isnan(resultado):
+            raise ValueError("Nenhuma regra fuzzy foi ativada.")
+        return resultado
+
+    impressao = sistema.impressao_digital()
+    cache = CacheAvaliacoes(inferir, impressao)
+    aplicativo = SimpleNamespace(calcular_desempenho=lambda entradas: cache.avaliar(**entradas),
+                                 sistema_compilado=sistema, base_regras=impressao[:16],
+                                 trava_sistema=threading.Lock())
+    gerador = np.random.default_rng(0)
+    alunos = [_dados_aluno(gerador) for _ in range(repeticoes + 1)]
+    proximo = iter(alunos)
+
+    with _diretorio_temporario():
+        resultados = {
+            'avaliacao_individual': medir(
+                lambda: AvaliacaoFuzzyApp.processar_avaliacao(aplicativo, next(proximo)), repeticoes),
+            'avaliacao_individual_cache': medir(
+                lambda: AvaliacaoFuzzyApp.processar_avaliacao(aplicativo, dict(alunos[0])), repeticoes)
+        }
+    resultados['inferencia_individual'] = medir(lambda: inferir(**{
+        'nota': 7.5, 'frequencia': 85.0, 'participacao': 6.0, 'socioemocional': 7.0,
+        'contexto': 5.0, 'motivacao': 9.0}), repeticoes)
+    return resultados
+
+
+def medir_lote(sistema, tamanhos=TAMANHOS_LOTE, repeticoes=3, tamanho_bloco=50000):
+    """Vazão de modules.batch.avaliar_bloco em turmas sintéticas de cada tamanho, em blocos de tamanho_bloco"""
+    from modules.batch import avaliar_bloco
+
+    def avaliar_turma(bloco, cheios, resto):
+        for _ in range(cheios):
+            avaliar_bloco(sistema, bloco.copy())
+        if resto:
+            avaliar_bloco(sistema, bloco.iloc[:resto].copy())
+
+    resultados = {}
+    for tamanho in tamanhos:
+        # Um único bloco sintético, avaliado quantas vezes a turma pedir: a memória não cresce
+        # com a turma, como em batch.processar_arquivo
+        bloco = gerar_turma(min(tamanho, tamanho_bloco))
+        cheios, resto = divmod(tamanho, tamanho_bloco)
+        medida = medir(lambda: avaliar_turma(bloco, cheios, resto), repeticoes, aquecimento=0)
+        medida['alunos'] = tamanho
+        medida['alunos_por_segundo'] = tamanho / medida['segundos']
+        resultados[f'lote_{tamanho}'] = medida
+    return resultados
+
+
+def medir_historico(sistema, tamanhos=TAMANHOS_HISTORICO, repeticoes=20):
+    """
+    Custo de gravar e carregar o histórico CSV (em um diretório temporário)
+    """
+    from modules import historico
+    from modules.batch import avaliar_bloco
+
+    resultados = {}
+    with _diretorio_temporario():
+        gerador = np.random.default_rng(1)
+        registro = {**_dados_aluno(gerador), 'desempenho': 72.5, 'classificacao': "Bom com superação"}
+        for tamanho in tamanhos:
+            # Histórico pré-preenchido com avaliações sintéticas (uma única gravação)
+            if os.path.exists(historico.ARQUIVO_HISTORICO):
+                os.remove(historico.ARQUIVO_HISTORICO)
+            if tamanho:
+                turma, _ = avaliar_bloco(sistema, gerar_turma(tamanho, semente=2))
+                turma["Motivacao"] = 0.0
+                with open(historico.ARQUIVO_HISTORICO, "w", newline="", encoding="utf-8") as arquivo:
+                    turma.reindex(columns=historico.COLUNAS_HISTORICO).to_csv(arquivo, index=False)
+            # O arquivo foi substituído: o índice de linhas (por caminho) recomeça do zero
+            historico._indices_linhas.clear()
+
+            gravacao = medir(lambda: historico.salvar_historico(registro), repeticoes)
+            gravacao['registros'] = tamanho
+            resultados[f'historico_gravar_{tamanho}'] = gravacao
+
+            total = historico.contar_registros()
+            carga = medir(historico.carregar_historico_para_treeview, 3 if total > 10000 else repeticoes)
+            carga['registros'] = total
+            resultados[f'historico_carregar_{tamanho}'] = carga
+
+            pagina = medir(lambda: historico.carregar_pagina(max(total - 200, 0), 200), repeticoes)
+            pagina['registros'] = total
+            resultados[f'historico_pagina_{tamanho}'] = pagina
+    return resultados
+
+
+def medir_grafico(sistema, repeticoes=50):
+    """Desenho do gráfico de desempenho no backend Agg: criação, atualização e desenho completo"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from modules.grafico import atualizar_grafico, capturar_fundo, montar_grafico, redesenhar_dinamicos
+
+    def criar():
+        grafico = montar_grafico(sistema)
+        canvas = FigureCanvasAgg(grafico['figura'])
+        canvas.draw()
+        capturar_fundo(grafico, canvas)
+        return grafico, canvas
+
+    resultados = {'grafico_criacao': medir(criar, max(repeticoes // 10, 3))}
+
+    grafico, canvas = criar()
+    valores = iter(np.random.default_rng(3).uniform(0, 100, 2 * repeticoes + 2))
+
+    def atualizar(completo):
+        resultado = float(next(valores))
+        atualizar_grafico(grafico, resultado, sistema.graus_categorias(resultado))
+        if completo:
+            canvas.draw()
+        else:
+            redesenhar_dinamicos(grafico, canvas)
+
+    resultados['grafico_atualizacao'] = medir(lambda: atualizar(False), repeticoes)
+    resultados['grafico_desenho_completo'] = medir(lambda: atualizar(True), repeticoes)
+    return resultados
+
+
+def medir_importacao(modulos=MODULOS_IMPORTACAO, repeticoes=5):
+    """Tempo de importação a frio de cada módulo, em um processo Python novo por medida"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ambiente = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [raiz, os.environ.get("PYTHONPATH")]))}
+    codigo = ("import time; inicio = time.perf_counter(); import {}; "
+              "print(time.perf_counter() - inicio)")
+
+    resultados = {}
+    for modulo in modulos:
+        tempos = []
+        for _ in range(repeticoes):
+            saida = subprocess.run([sys.executable, "-c", codigo.format(modulo)], env=ambiente, cwd=raiz,
+                                   capture_output=True, text=True, check=True)
+            tempos.append(float(saida.stdout.strip().splitlines()[-1]))
+        resultados[f'importacao_{modulo}'] = {
+            'segundos': float(np.median(tempos)),
+            'minimo': float(min(tempos)),
+            'maximo': float(max(tempos)),
+            'repeticoes': repeticoes
+        }
+    return resultados
+
+
+def _ambiente():
+    """Versões e máquina da execução (para comparar apenas execuções comparáveis)"""
+    from importlib import metadata
+
+    versoes = {}
+    for pacote in ("numpy", "pandas", "matplotlib", "scikit-fuzzy"):
+        try:
+            versoes[pacote] = metadata.version(pacote)
+        except metadata.PackageNotFoundError:
+            versoes[pacote] = None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'nucleos': os.cpu_count(),
+        'versoes': versoes,
+        'commit': commit
+    }
+
+
+def executar(grupos=None, tamanhos_lote=TAMANHOS_LOTE, tamanhos_historico=TAMANHOS_HISTORICO, relatar=None,
+             tamanho_bloco=50000):
+    """
+    Executa os grupos de medidas pedidos
+
+    Args:
+        grupos (iterable): Subconjunto de 'individual', 'lote', 'historico', 'grafico'
+            e 'importacao' (None executa todos)
+        tamanhos_lote (iterable): Tamanhos das turmas sintéticas
+        tamanhos_historico (iterable): Tamanhos dos históricos pré-preenchidos
+        relatar (callable): Chamado como relatar(grupo) antes de cada grupo
+        tamanho_bloco (int): Alunos avaliados por vez nas turmas sintéticas
+
+    Returns:
+        dict: 'data', 'ambiente' e 'resultados' (nome da medida -> estatísticas em segundos)
+    """
+    from modules.motor_compilado import carregar_sistema
+
+    grupos = set(grupos or ('individual', 'lote', 'historico', 'grafico', 'importacao'))
+    sistema = carregar_sistema(arquivo=None)
+    medidas = [
+        ('importacao', lambda: medir_importacao()),
+        ('individual', lambda: medir_avaliacao_individual(sistema)),
+        ('lote', lambda: medir_lote(sistema, tamanhos_lote, tamanho_bloco=tamanho_bloco)),
+        ('historico', lambda: medir_historico(sistema, tamanhos_historico)),
+        ('grafico', lambda: medir_grafico(sistema))
+    ]
+
+    resultados = {}
+    for grupo, medida in medidas:
+        if grupo in grupos:
+            if relatar:
+                relatar(grupo)
+            resultados.update(medida())
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': _ambiente(),
+        'resultados': resultados
+    }
+
+
+def comparar(atual, anterior, tolerancia=TOLERANCIA_PADRAO):
+    """
+    Compara duas execuções medida a medida (pela mediana)
+
+    Args:
+        atual (dict): Resultado de executar
+        anterior (dict): Resultado de uma execução anterior (lido do JSON)
+        tolerancia (float): Aumento relativo aceito antes de apontar regressão
+
+    Returns:
+        list: Tuplas (medida, segundos anteriores, segundos atuais, razão, regressão)
+            das medidas presentes nas duas execuções
+    """
+    linhas = []
+    for nome, medida in atual['resultados'].items():
+        if nome not in anterior.get('resultados', {}):
+            continue
+        antes, agora = anterior['resultados'][nome]['segundos'], medida['segundos']
+        razao = agora / antes if antes > 0 else float('inf')
+        linhas.append((nome, antes, agora, razao, razao > 1 + tolerancia))
+    return linhas
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark do sistema de avaliação fuzzy")
+    parser.add_argument("--saida", default="benchmark.json", help="Arquivo JSON com os resultados")
+    parser.add_argument("--grupos", nargs="+", choices=["individual", "lote", "historico", "grafico", "importacao"],
+                        default=None, help="Grupos de medidas (padrão: todos)")
+    parser.add_argument("--tamanhos-lote", nargs="+", type=int, default=list(TAMANHOS_LOTE),
+                        help="Alunos por turma sintética (padrão: %(default)s)")
+    parser.add_argument("--tamanhos-historico", nargs="+", type=int, default=list(TAMANHOS_HISTORICO),
+                        help="Registros nos históricos medidos (padrão: %(default)s)")
+    parser.add_argument("--tamanho-bloco", type=int, default=50000,
+                        help="Alunos avaliados por vez nas turmas sintéticas (padrão: %(default)s)")
+    parser.add_argument("--rapido", action="store_true",
+                        help="Turmas e históricos pequenos (1 mil e 10 mil), para uma verificação rápida")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help="Aumento relativo tolerado na comparação (padrão: %(default)s)")
+    args = parser.parse_args(argumentos)
+
+    if args.rapido:
+        args.tamanhos_lote = [1000, 10000]
+        args.tamanhos_historico = [0, 10000]
+
+    relatorio = executar(args.grupos, args.tamanhos_lote, args.tamanhos_historico,
+                         relatar=lambda grupo: print(f"Medindo: {grupo}...", file=sys.stderr, flush=True),
+                         tamanho_bloco=args.tamanho_bloco)
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    print(f"{'medida':<40} {'mediana':>12} {'p95':>12}")
+    for nome, medida in relatorio['resultados'].items():
+        p95 = f"{medida['p95'] * 1000:10.2f}ms" if 'p95' in medida else ""
+        print(f"{nome:<40} {medida['segundos'] * 1000:10.2f}ms {p95:>12}")
+    print(f"Resultados gravados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        linhas = comparar(relatorio, anterior, args.tolerancia)
+        print(f"\nComparação com {args.comparar} (tolerância {args.tolerancia:.0%}):")
+        for nome, antes, agora, razao, regressao in linhas:
+            marca = "  REGRESSÃO" if regressao else ""
+            print(f"{nome:<40} {antes * 1000:10.2f}ms -> {agora * 1000:10.2f}ms ({razao:5.2f}x){marca}")
+        if any(linha[4] for linha in linhas):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Nome do banco de resultados usado pela interface (no diretório de cache do usuário)
+ARQUIVO_CACHE_AVALIACOES = "cache_avaliacoes.sqlite"
+
+
+class CacheAvaliacoes:
+    """
+    Cache LRU de resultados do sistema fuzzy (chave: valores exatos das entradas), com persistência opcional
+
+    Args:
+        funcao (callable): Função de avaliação chamada como funcao(**entradas)
+        impressao_digital (str): Identificador da base de regras (ver SistemaCompilado.impressao_digital)
+        capacidade (int): Número máximo de resultados mantidos em memória
+        arquivo (str): Caminho do banco SQLite para persistência (None desativa; o diretório é criado)
+    """
+
+    def __init__(self, funcao, impressao_digital, capacidade=4096, arquivo=None):
+        self.funcao = funcao
+        self.impressao_digital = impressao_digital
+        self.capacidade = capacidade
+        self.acertos = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+        self._pendentes = 0
+
+        self._conexao = None
+        if arquivo:
+            os.makedirs(os.path.dirname(os.path.abspath(arquivo)), mode=0o700, exist_ok=True)
+            self._conexao = sqlite3.connect(arquivo, check_same_thread=False)
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS avaliacoes ("
+                "impressao TEXT NOT NULL, chave TEXT NOT NULL, valor REAL NOT NULL, "
+                "PRIMARY KEY (impressao, chave))")
+            self._conexao.commit()
+
+    @staticmethod
+    def _chave(entradas):
+        """Chave do resultado: (nome, valor exato) de cada entrada, em ordem de nome"""
+        return tuple((nome, float(entradas[nome])) for nome in sorted(entradas))
+
+    def avaliar(self, **entradas):
+        """
+        Retorna o resultado em cache ou avalia e armazena
+
+        Args:
+            **entradas: Valor de cada antecedente do sistema fuzzy
+
+        Returns:
+            float: Resultado da função de avaliação para as entradas
+        """
+        chave = self._chave(entradas)
+
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+
+            valor = self._buscar_disco(chave)
+            if valor is not None:
+                self.acertos_disco += 1
+                self._guardar(chave, valor)
+                return valor
+
+        # Avaliação fora da trava para não serializar o cálculo
+        valor = float(self.funcao(**entradas))
+
+        with self._trava:
+            self.falhas += 1
+            self._guardar(chave, valor)
+            self._gravar_disco(chave, valor)
+        return valor
+
+    def _guardar(self, chave, valor):
+        """Insere na memória, descartando o item usado há mais tempo"""
+        self._itens[chave] = valor
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+
+    def _buscar_disco(self, chave):
+        if self._conexao is None:
+            return None
+        linha = self._conexao.execute(
+            "SELECT valor FROM avaliacoes WHERE impressao = ? AND chave = ?",
+            (self.impressao_digital, repr(chave))).fetchone()
+        return linha[0] if linha else None
+
+    def _gravar_disco(self, chave, valor):
+        if self._conexao is None:
+            return
+        self._conexao.execute(
+            "INSERT OR REPLACE INTO avaliacoes (impressao, chave, valor) VALUES (?, ?, ?)",
+            (self.impressao_digital, repr(chave), valor))
+        self._pendentes += 1
+        # Agrupa as gravações para não pagar um commit por avaliação
+        if self._pendentes >= 64:
+            self._conexao.commit()
+            self._pendentes = 0
+
+    def estatisticas(self):
+        """
+        Retorna os contadores do cache
+
+        Returns:
+            dict: Acertos em memória e em disco, falhas, itens em memória e taxa de acerto
+        """
+        with self._trava:
+            total = self.acertos + self.acertos_disco + self.falhas
+            return {
+                'acertos': self.acertos,
+                'acertos_disco': self.acertos_disco,
+                'falhas': self.falhas,
+                'itens': len(self._itens),
+                'taxa_acerto': (self.acertos + self.acertos_disco) / total if total else 0.0
+            }
+
+    def limpar(self):
+        """Esvazia a memória e zera os contadores (o arquivo em disco é mantido)"""
+        with self._trava:
+            self._itens.clear()
+            self.acertos = self.acertos_disco = self.falhas = 0
+
+    def fechar(self):
+        """Grava as entradas pendentes e fecha o arquivo em disco"""
+        with self._trava:
+            if self._conexao is not None:
+                self._conexao.commit()
+                self._conexao.close()
+                self._conexao = None
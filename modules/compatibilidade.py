@@ -1,3 +1,5 @@
+import numpy as np
+
 # Matriz de dificuldade (quanto maior, mais compensação)
 MATRIZ_DIFICULDADE = {
     'Visual': {'Visual': 0.0, 'Auditivo': 0.5, 'Cinestésico': 1.0},
@@ -24,4 +26,20 @@ def ajustar_nota(nota_original, perfil_aluno, metodo_ensino):
         nota_ajustada = nota_original * (1 + fator * PESO_AJUSTE)
         return min(nota_ajustada, 10.0)  # Limita em 10.0
     except KeyError:
-        return nota_original  # Retorna sem ajuste se houver erro
\ No newline at end of file
+        return nota_original  # Retorna sem ajuste se houver erro
+
+def ajustar_notas_lote(notas, perfis, metodos):
+    """
+    Versão vetorizada de ajustar_nota para um lote de alunos
+    
+    Args:
+        notas (array_like): Notas originais dos alunos
+        perfis (array_like): Perfil de aprendizagem de cada aluno
+        metodos (array_like): Método de ensino utilizado para cada aluno
+        
+    Returns:
+        np.ndarray: Notas ajustadas (sem ajuste quando o par perfil/método é desconhecido)
+    """
+    fatores = np.array([MATRIZ_DIFICULDADE.get(perfil, {}).get(metodo, 0.0)
+                        for perfil, metodo in zip(perfis, metodos)], dtype=np.float64)
+    return np.minimum(np.asarray(notas, dtype=np.float64) * (1 + fatores * PESO_AJUSTE), 10.0)
@@ -0,0 +1,128 @@
+import numpy as np
+
+# Métodos resolvidos de forma exata por este módulo
+METODOS_ANALITICOS = ('centroid', 'bisector', 'mom')
+
+
+def pontos_criticos_estaticos(pontos_saida, limites):
+    """
+    Calcula as abscissas de quebra que não dependem das ativações
+
+    Args:
+        pontos_saida (np.ndarray): Matriz (n_termos, 4) com os pontos de cada termo
+        limites (tuple): Mínimo e máximo do universo da saída
+
+    Returns:
+        np.ndarray: Pontos ordenados e sem repetição dentro do universo
+    """
+    a, b, c, d = pontos_saida.T
+    candidatos = [np.asarray(limites, dtype=np.float64), pontos_saida.ravel()]
+
+    # Retas de cada aresta na forma y = inclinacao * x + intercepto
+    retas = []
+    for k in range(len(pontos_saida)):
+        if b[k] > a[k]:
+            retas.append((1.0 / (b[k] - a[k]), -a[k] / (b[k] - a[k])))
+        if d[k] > c[k]:
+            retas.append((-1.0 / (d[k] - c[k]), d[k] / (d[k] - c[k])))
+
+    for i, (m1, q1) in enumerate(retas):
+        for m2, q2 in retas[i + 1:]:
+            if m1 != m2:
+                candidatos.append(np.array([(q2 - q1) / (m1 - m2)]))
+
+    pontos = np.concatenate(candidatos)
+    pontos = pontos[(pontos >= limites[0]) & (pontos <= limites[1])]
+    return np.unique(pontos)
+
+
+def _agregar(x, pontos_saida, cortes):
+    """Máximo dos trapézios limitados pelos cortes, avaliado nas abscissas x (n_alunos, n_pontos)"""
+    a, b, c, d = (pontos_saida[:, i][:, None, None] for i in range(4))
+    h = cortes.T[:, :, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        subida = np.where(x >= b, 1.0, (x - a) / (b - a))
+        descida = np.where(x <= c, 1.0, (d - x) / (d - c))
+    mu = np.clip(np.minimum(subida, descida), 0.0, 1.0)
+    return np.minimum(mu, h).max(axis=0)
+
+
+def defuzzificar_analitico(pontos_saida, cortes, metodo='centroid', limites=(0.0, 100.0),
+                           pontos_estaticos=None):
+    """
+    Defuzzifica de forma exata a agregação de trapézios limitados pelos cortes
+
+    Args:
+        pontos_saida (np.ndarray): Matriz (n_termos, 4) com os pontos [a, b, c, d] de cada termo
+        cortes (np.ndarray): Matriz (n_alunos, n_termos) com a ativação de cada termo
+        metodo (str): 'centroid', 'bisector' ou 'mom'
+        limites (tuple): Mínimo e máximo do universo da saída
+        pontos_estaticos (np.ndarray): Resultado pré-calculado de pontos_criticos_estaticos
+
+    Returns:
+        np.ndarray: Valor defuzzificado de cada aluno (NaN quando a agregação é vazia)
+    """
+    metodo = metodo.lower()
+    if metodo not in METODOS_ANALITICOS:
+        raise ValueError(f"Método de defuzzificação '{metodo}' não suportado.")
+
+    pontos_saida = np.asarray(pontos_saida, dtype=np.float64)
+    cortes = np.clip(np.atleast_2d(np.asarray(cortes, dtype=np.float64)), 0.0, 1.0)
+    n_alunos = cortes.shape[0]
+    if pontos_estaticos is None:
+        pontos_estaticos = pontos_criticos_estaticos(pontos_saida, limites)
+
+    # Pontos onde as arestas de cada termo cruzam o nível de cada corte
+    a, b, c, d = (pontos_saida[:, i][None, :, None] for i in range(4))
+    h = cortes[:, None, :]
+    cruzamentos = np.concatenate([(a + h * (b - a)).reshape(n_alunos, -1),
+                                  (d - h * (d - c)).reshape(n_alunos, -1)], axis=1)
+    x = np.concatenate([np.broadcast_to(pontos_estaticos, (n_alunos, len(pontos_estaticos))),
+                        np.clip(cruzamentos, limites[0], limites[1])], axis=1)
+    x.sort(axis=1)
+    y = _agregar(x, pontos_saida, cortes)
+
+    dx = np.diff(x, axis=1)
+    y1, y2 = y[:, :-1], y[:, 1:]
+    area = 0.5 * dx * (y1 + y2)
+    area_total = area.sum(axis=1)
+    vazio = area_total <= 0
+
+    if metodo == 'centroid':
+        soma_y = y1 + y2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            momento = np.where(soma_y > 0, x[:, :-1] + dx * (y1 + 2 * y2) / (3 * soma_y), 0.0)
+        resultado = (area * momento).sum(axis=1) / np.where(vazio, 1.0, area_total)
+
+    elif metodo == 'bisector':
+        acumulada = np.cumsum(area, axis=1)
+        metade = area_total / 2
+        indice = np.argmax(acumulada >= metade[:, None], axis=1)
+        linhas = np.arange(n_alunos)
+        anterior = np.where(indice > 0, acumulada[linhas, indice - 1], 0.0)
+        alvo = metade - anterior
+
+        # Dentro do segmento: y1 * t + inclinacao * t**2 / 2 = alvo
+        largura = dx[linhas, indice]
+        inicio, fim = y1[linhas, indice], y2[linhas, indice]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            inclinacao = np.where(largura > 0, (fim - inicio) / largura, 0.0)
+            raiz = np.sqrt(np.maximum(inicio ** 2 + 2 * inclinacao * alvo, 0.0))
+            denominador = inicio + raiz
+            t = np.where(denominador > 0, 2 * alvo / denominador, 0.0)
+        resultado = x[linhas, indice] + np.clip(t, 0.0, largura)
+
+    else:  # mom
+        maximo = y.max(axis=1, keepdims=True)
+        no_maximo = np.isclose(y, maximo, rtol=0.0, atol=1e-12)
+        # Trechos planos no máximo pesam pelo comprimento; sem trechos, média dos pontos
+        plano = no_maximo[:, :-1] & no_maximo[:, 1:] & (dx > 0)
+        comprimento = np.where(plano, dx, 0.0).sum(axis=1)
+        meio = 0.5 * (x[:, :-1] + x[:, 1:])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media_trechos = np.where(plano, dx * meio, 0.0).sum(axis=1) / comprimento
+            media_pontos = np.where(no_maximo, x, 0.0).sum(axis=1) / no_maximo.sum(axis=1)
+        resultado = np.where(comprimento > 0, media_trechos, media_pontos)
+
+    resultado[vazio] = np.nan
+    return resultado
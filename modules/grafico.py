@@ -0,0 +1,155 @@
+"""Gráfico do desempenho fuzzy, independente da interface"""
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.patches import Polygon
+
+# Nome exibido no gráfico para cada termo de saída do sistema fuzzy
+NOMES_DESEMPENHO = {
+    'insuficiente': 'Insuficiente',
+    'regular_com_dificuldades': 'Regular com dificuldades',
+    'regular_com_potencial': 'Regular com potencial',
+    'bom_com_superacao': 'Bom com superação',
+    'excelente_com_equilibrio': 'Excelente com equilíbrio'
+}
+
+
+def montar_grafico(sistema):
+    """
+    Monta a figura do gráfico de desempenho com as curvas fixas da saída
+
+    Args:
+        sistema (SistemaCompilado): Sistema com as curvas pré-calculadas da saída
+
+    Returns:
+        dict: 'figura', os elementos dinâmicos ('saida_agregada', 'linha_resultado',
+            'rotulo_resultado', 'barras', 'valores', 'titulo_barras'), a lista 'dinamicos',
+            o 'universo' da saída e o 'fundo' (None até o primeiro desenho completo)
+    """
+    # Figure em vez de pyplot: a figura não entra no registro global e é liberada com o app
+    fig = Figure(figsize=(8, 8))
+    ax1, ax2 = fig.subplots(2, 1)
+
+    # === GRÁFICO 1: FUNÇÕES DE PERTINÊNCIA DA SAÍDA ===
+    # Plotar as funções de pertinência para o desempenho (curvas pré-calculadas na compilação)
+    cores = ['r', 'orange', 'y', 'g', 'b']
+    for indice, (termo, curva) in enumerate(zip(sistema.termos_saida, sistema.mfs_saida)):
+        ax1.plot(sistema.universo_saida, curva, color=cores[indice % len(cores)], linewidth=2,
+                 label=NOMES_DESEMPENHO.get(termo, termo))
+
+    # Saída agregada da inferência (termos limitados pelos cortes), quando disponível
+    saida_agregada = Polygon(np.zeros((2, 2)), closed=True, facecolor='gray', edgecolor='none', alpha=0.35,
+                             label='Saída agregada')
+    ax1.add_patch(saida_agregada)
+
+    # Linha do resultado (posicionada a cada avaliação)
+    linha_resultado = ax1.axvline(x=0, color='k', linestyle='--', alpha=0.7, label='Resultado')
+    # Valor junto à linha (a legenda é fixa: redesenhá-la a cada avaliação custaria mais que o resto)
+    rotulo_resultado = ax1.text(0, 0.98, '', transform=ax1.get_xaxis_transform(),
+                                ha='left', va='top', fontsize=9)
+
+    # Configurar o gráfico
+    ax1.set_title('Avaliação de Desempenho Fuzzy')
+    ax1.set_xlabel('Nível de Desempenho')
+    ax1.set_ylabel('Grau de Pertinência')
+    ax1.grid(True, linestyle='--', alpha=0.7)
+
+    # Legenda no lado direito do gráfico
+    ax1.legend(loc='center left', bbox_to_anchor=(1.02, 0.5), ncol=1)
+    # Só depois da legenda, para que ela mostre a cor da área
+    saida_agregada.set_visible(False)
+
+    # === GRÁFICO 2: VISUALIZAÇÃO DO RESULTADO ===
+    # Gráfico de barras com o grau de pertinência do resultado em cada categoria
+    # (uma barra por termo da saída; a base de regras pode ser recarregada com outros termos)
+    categorias = [NOMES_DESEMPENHO.get(termo, termo).replace(' com ', ' com\n') for termo in sistema.termos_saida]
+    cores = ['red', 'orange', 'yellow', 'green', 'blue']
+    barras = ax2.bar(categorias, [0] * len(categorias),
+                     color=[cores[indice % len(cores)] for indice in range(len(categorias))], alpha=0.7)
+
+    # Valores sobre as barras
+    valores = [ax2.text(barra.get_x() + barra.get_width()/2., 0.02, '',
+                        ha='center', va='bottom', fontweight='bold')
+               for barra in barras]
+
+    # Configurar o gráfico
+    titulo_barras = ax2.set_title('Grau de Pertinência do Resultado (100.0) em Cada Categoria')
+    ax2.set_ylabel('Grau de Pertinência')
+    ax2.set_ylim(0, 1.1)  # Para dar espaço para os textos
+    ax2.grid(True, linestyle='--', alpha=0.3, axis='y')
+
+    # Ajuste de layout para dar espaço à legenda no lado direito
+    fig.subplots_adjust(right=0.8)
+    fig.tight_layout(pad=3.0, rect=[0, 0, 0.85, 1])
+
+    # Elementos que mudam a cada avaliação ficam fora do desenho completo e
+    # são redesenhados sobre o fundo salvo (blitting)
+    dinamicos = [saida_agregada, linha_resultado, rotulo_resultado, *barras, *valores, titulo_barras]
+    for artista in dinamicos:
+        artista.set_animated(True)
+
+    return {
+        'figura': fig,
+        'universo': np.asarray(sistema.universo_saida),
+        'saida_agregada': saida_agregada,
+        'linha_resultado': linha_resultado,
+        'rotulo_resultado': rotulo_resultado,
+        'barras': barras,
+        'valores': valores,
+        'titulo_barras': titulo_barras,
+        'dinamicos': dinamicos,
+        'fundo': None
+    }
+
+
+def atualizar_grafico(grafico, resultado, graus, agregada=None):
+    """
+    Posiciona a linha do resultado e atualiza as barras e os rótulos
+
+    Args:
+        grafico (dict): Gráfico retornado por montar_grafico
+        resultado (float): Desempenho (0-100)
+        graus (array_like): Grau de pertinência do resultado em cada termo da saída
+        agregada (array_like): Saída agregada sobre o universo (SistemaCompilado.saida_agregada);
+            sem ela, a área não é exibida
+    """
+    # Área da saída agregada, fechada sobre o eixo horizontal
+    if agregada is None:
+        grafico['saida_agregada'].set_visible(False)
+    else:
+        universo = grafico['universo']
+        grafico['saida_agregada'].set_xy(np.column_stack([
+            np.concatenate([universo[:1], universo, universo[-1:]]),
+            np.concatenate([[0.0], agregada, [0.0]])]))
+        grafico['saida_agregada'].set_visible(True)
+
+    # Marcar o resultado
+    grafico['linha_resultado'].set_xdata([resultado, resultado])
+    grafico['rotulo_resultado'].set_x(resultado)
+    grafico['rotulo_resultado'].set_text(f' Resultado: {resultado:.1f}')
+
+    # Atualizar as barras e os valores sobre elas
+    for barra, texto, grau in zip(grafico['barras'], grafico['valores'], graus):
+        barra.set_height(grau)
+        texto.set_y(grau + 0.02)
+        texto.set_text(f'{grau:.2f}')
+    grafico['titulo_barras'].set_text(f'Grau de Pertinência do Resultado ({resultado:.1f}) em Cada Categoria')
+
+
+def capturar_fundo(grafico, canvas):
+    """Guarda a figura sem os elementos dinâmicos e os desenha por cima (após um desenho completo)"""
+    grafico['fundo'] = canvas.copy_from_bbox(grafico['figura'].bbox)
+    for artista in grafico['dinamicos']:
+        grafico['figura'].draw_artist(artista)
+
+
+def redesenhar_dinamicos(grafico, canvas):
+    """Redesenha apenas os elementos dinâmicos do gráfico sobre o fundo salvo"""
+    if grafico['fundo'] is None:
+        # Primeiro desenho: o draw_event captura o fundo e desenha os elementos dinâmicos
+        canvas.draw()
+        return
+
+    canvas.restore_region(grafico['fundo'])
+    for artista in grafico['dinamicos']:
+        grafico['figura'].draw_artist(artista)
+    canvas.blit(grafico['figura'].bbox)
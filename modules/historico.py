@@ -1,18 +1,52 @@
-import pandas as pd
+import csv
+import errno
+import io
+import numpy as np
 import os
+from contextlib import contextmanager
 from tkinter import messagebox
 
-def salvar_historico(dados):
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+ARQUIVO_HISTORICO = "historico_alunos_fuzzy.csv"
+
+# Armazenamento do histórico: "csv" (padrão) ou "sqlite" (modules.historico_sqlite).
+# Pode ser escolhido pela variável de ambiente HISTORICO_BACKEND ou por configurar_backend.
+_configuracao = {
+    "backend": os.environ.get("HISTORICO_BACKEND", "csv"),
+    "caminho_banco": os.environ.get("HISTORICO_BANCO", "historico_alunos_fuzzy.db"),
+    "migrar_csv": True,
+    "banco": None
+}
+
+# Colunas do histórico, na ordem em que são gravadas em um arquivo novo
+COLUNAS_HISTORICO = [
+    "Matricula", "Nome", "Nota_Teoria1", "Nota_Teoria2", "Nota_Pratica", "Nota_Grupo",
+    "Frequencia", "Participacao", "Socioemocional", "Contexto", "Motivacao",
+    "Motivacao_Cat", "Desempenho", "Classificacao", "Nota_Ajustada", "Base_Regras", "Rastro"
+]
+
+# Tipos de cada coluna na leitura do histórico (evita a inferência de tipos do pandas)
+COLUNAS_TEXTO_HISTORICO = ["Matricula", "Nome", "Motivacao_Cat", "Classificacao", "Base_Regras", "Rastro"]
+TIPOS_HISTORICO = {
+    coluna: (str if coluna in COLUNAS_TEXTO_HISTORICO else np.float64) for coluna in COLUNAS_HISTORICO
+}
+
+def montar_registro(dados):
     """
-    Salva os dados do aluno no histórico CSV
+    Converte os dados da avaliação em um registro com as colunas do histórico
     
     Args:
         dados (dict): Dicionário com dados do aluno e resultado da avaliação
+        
+    Returns:
+        dict: Registro indexado pelos nomes de COLUNAS_HISTORICO
     """
-    arquivo_csv = "historico_alunos_fuzzy.csv"
-    
-    # Preparar o registro
-    registro = {
+    return {
         "Matricula": dados.get('matrícula', ''),
         "Nome": dados.get('nome_do_aluno', ''),
         "Nota_Teoria1": dados.get('nota_da_primeira_avaliação_teórica', 0),
@@ -26,59 +60,488 @@ def salvar_historico(dados):
         "Motivacao": dados.get('motivação', 0),
         "Motivacao_Cat": dados.get('motivacao_valor', ''),
         "Desempenho": dados.get('desempenho', 0),
-        "Classificacao": dados.get('classificacao', '')
+        "Classificacao": dados.get('classificacao', ''),
+        "Nota_Ajustada": dados.get('nota_ajustada'),
+        "Base_Regras": dados.get('base_regras', ''),
+        "Rastro": codificar_rastro(dados.get('rastro'))
     }
+
+def codificar_rastro(rastro):
+    """
+    Converte o rastro da inferência (SistemaCompilado.rastro) no texto gravado no histórico
+    
+    Args:
+        rastro (array_like): Cortes dos termos da saída seguidos das forças de disparo das regras
+        
+    Returns:
+        str: Valores separados por ";" (vazio quando não há rastro)
+    """
+    if rastro is None:
+        return ""
+    return ";".join("0" if valor == 0 else format(valor, ".6g") for valor in np.asarray(rastro).tolist())
+
+def decodificar_rastro(texto):
+    """
+    Converte o texto da coluna Rastro de volta em vetor
+    
+    Returns:
+        np.ndarray: Rastro gravado (None se a coluna estiver vazia ou inválida)
+    """
+    if not isinstance(texto, str) or not texto:
+        return None
+    try:
+        return np.array(texto.split(";"), dtype=np.float64)
+    except ValueError:
+        return None
+
+# Modo binário no Windows, para que os.write não converta as quebras de linha
+_MODO_BINARIO = getattr(os, "O_BINARY", 0)
+
+def _ler_bytes(descritor, quantidade, posicao):
+    """Lê bytes a partir de uma posição (os.pread não existe no Windows)"""
+    os.lseek(descritor, posicao, os.SEEK_SET)
+    return os.read(descritor, quantidade)
+
+def _ler_cabecalho(descritor):
+    """Lê a primeira linha do arquivo aberto e retorna as colunas do cabeçalho"""
+    primeira_linha = b""
+    posicao = 0
+    while b"\n" not in primeira_linha:
+        pedaco = _ler_bytes(descritor, 4096, posicao)
+        if not pedaco:
+            break
+        primeira_linha += pedaco
+        posicao += len(pedaco)
+    primeira_linha = primeira_linha.split(b"\n", 1)[0].decode("utf-8").strip()
+    return next(csv.reader([primeira_linha])) if primeira_linha else []
+
+def _gravar_tudo(descritor, dados):
+    """Grava todos os bytes (os.write pode aceitar só parte deles, p. ex. com o disco cheio)"""
+    restantes = memoryview(dados)
+    while restantes:
+        gravados = os.write(descritor, restantes)
+        if gravados <= 0:
+            raise OSError(errno.EIO, "Gravação do histórico interrompida")
+        restantes = restantes[gravados:]
+
+@contextmanager
+def _trava_historico(arquivo_csv, exclusiva=False):
+    """
+    Trava entre processos do histórico CSV, mantida no arquivo <csv>.lock
+    
+    Args:
+        arquivo_csv (str): Caminho do arquivo CSV
+        exclusiva (bool): Espera que nenhum outro processo detenha a trava
+    """
+    descritor = os.open(f"{arquivo_csv}.lock", os.O_RDWR | os.O_CREAT | _MODO_BINARIO, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(descritor, fcntl.LOCK_EX if exclusiva else fcntl.LOCK_SH)
+        else:
+            while True:
+                try:
+                    # LK_LOCK desiste após 10 tentativas; a espera continua até obter a trava
+                    msvcrt.locking(descritor, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if not fcntl:
+                os.lseek(descritor, 0, os.SEEK_SET)
+                msvcrt.locking(descritor, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(descritor)
+
+def _acrescentar_colunas(arquivo_csv):
+    """
+    Reescreve o CSV com as colunas de COLUNAS_HISTORICO ausentes do cabeçalho
     
-    # Verificar se o arquivo existe
-    if os.path.exists(arquivo_csv):
-        df = pd.read_csv(arquivo_csv)
-        df = pd.concat([df, pd.DataFrame([registro])], ignore_index=True)
+    Args:
+        arquivo_csv (str): Caminho do arquivo CSV
+        
+    Returns:
+        list: Colunas do arquivo reescrito
+    """
+    with _trava_historico(arquivo_csv, exclusiva=True):
+        descritor = os.open(arquivo_csv, os.O_RDONLY | _MODO_BINARIO)
+        try:
+            cabecalho = _ler_cabecalho(descritor)
+        finally:
+            os.close(descritor)
+        faltando = [coluna for coluna in COLUNAS_HISTORICO if coluna not in cabecalho]
+        colunas = list(cabecalho) + faltando
+        if not faltando:
+            # Outro processo já reescreveu o arquivo enquanto esta chamada esperava a trava
+            return colunas
+        sufixo = ("," * len(faltando)).encode("utf-8")
+        temporario = f"{arquivo_csv}.{os.getpid()}.tmp"
+        try:
+            with open(arquivo_csv, "rb") as entrada, open(temporario, "wb") as saida:
+                entrada.readline()
+                saida.write((",".join(colunas) + "\n").encode("utf-8"))
+                for linha in entrada:
+                    # Linha final incompleta (gravação interrompida) é copiada como está
+                    if linha.endswith(b"\n") and linha.strip():
+                        linha = linha.rstrip(b"\r\n") + sufixo + b"\n"
+                    saida.write(linha)
+                saida.flush()
+                os.fsync(saida.fileno())
+            os.replace(temporario, arquivo_csv)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+    return colunas
+
+def anexar_registros(registros, arquivo_csv=ARQUIVO_HISTORICO):
+    """
+    Acrescenta registros ao final do histórico sem reescrever o arquivo
+    
+    Args:
+        registros (list): Dicionários com as colunas do histórico
+        arquivo_csv (str): Caminho do arquivo CSV
+    """
+    if not registros:
+        return
+    
+    while True:
+        with _trava_historico(arquivo_csv):
+            try:
+                descritor = os.open(arquivo_csv,
+                                    os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_EXCL | _MODO_BINARIO, 0o644)
+                colunas = None
+            except FileExistsError:
+                descritor = os.open(arquivo_csv, os.O_RDWR | os.O_APPEND | _MODO_BINARIO)
+                colunas = _ler_cabecalho(descritor)
+            if not colunas or all(coluna in colunas for coluna in COLUNAS_HISTORICO):
+                _anexar_linhas(descritor, colunas, registros)
+                return
+            os.close(descritor)
+        # Histórico de uma versão anterior: as colunas novas são criadas (sob a trava
+        # exclusiva) antes da gravação, que recomeça com o arquivo novo
+        _acrescentar_colunas(arquivo_csv)
+
+def _anexar_linhas(descritor, colunas, registros):
+    """Grava os registros no descritor aberto por anexar_registros e o fecha"""
+    try:
+        tamanho = os.fstat(descritor).st_size
+        buffer = io.StringIO()
+        if not colunas:
+            colunas = COLUNAS_HISTORICO
+            if tamanho == 0:
+                buffer.write(",".join(colunas) + "\n")
+        elif _ler_bytes(descritor, 1, tamanho - 1) != b"\n":
+            # Linha anterior incompleta (gravação interrompida): começar em uma nova linha
+            buffer.write("\n")
+        
+        escritor = csv.writer(buffer, lineterminator="\n")
+        for registro in registros:
+            escritor.writerow([registro.get(coluna, "") for coluna in colunas])
+        
+        _gravar_tudo(descritor, buffer.getvalue().encode("utf-8"))
+        os.fsync(descritor)
+    finally:
+        os.close(descritor)
+
+def configurar_backend(backend="csv", caminho_banco=None, migrar_csv=True):
+    """
+    Escolhe onde o histórico é gravado e lido
+    
+    Args:
+        backend (str): "csv" ou "sqlite"
+        caminho_banco (str): Arquivo do banco SQLite (padrão: historico_alunos_fuzzy.db)
+        migrar_csv (bool): Importa o CSV existente no primeiro uso do banco
+    """
+    if backend not in ("csv", "sqlite"):
+        raise ValueError(f"Backend de histórico desconhecido: {backend}")
+    
+    if _configuracao["banco"] is not None:
+        _configuracao["banco"].fechar()
+        _configuracao["banco"] = None
+    _configuracao["backend"] = backend
+    if caminho_banco:
+        _configuracao["caminho_banco"] = caminho_banco
+    _configuracao["migrar_csv"] = migrar_csv
+
+def obter_banco():
+    """
+    Retorna o histórico SQLite configurado, criando-o (e migrando o CSV) no primeiro uso
+    
+    Returns:
+        HistoricoSQLite: Banco do histórico
+    """
+    if _configuracao["banco"] is None:
+        from modules.historico_sqlite import HistoricoSQLite
+        banco = HistoricoSQLite(_configuracao["caminho_banco"])
+        if _configuracao["migrar_csv"] and os.path.exists(ARQUIVO_HISTORICO):
+            banco.migrar_csv(ARQUIVO_HISTORICO)
+        _configuracao["banco"] = banco
+    return _configuracao["banco"]
+
+def usando_sqlite():
+    """Indica se o histórico está configurado para o SQLite"""
+    return _configuracao["backend"] == "sqlite"
+
+def salvar_historico_lote(lista_dados):
+    """
+    Salva várias avaliações de uma vez (uma única gravação ou transação)
+    
+    Args:
+        lista_dados (list): Dicionários com dados dos alunos e resultados das avaliações
+    """
+    registros = [montar_registro(dados) for dados in lista_dados]
+    if usando_sqlite():
+        obter_banco().inserir(registros)
     else:
-        df = pd.DataFrame([registro])
+        anexar_registros(registros)
+
+def salvar_historico(dados):
+    """
+    Salva os dados do aluno no histórico (CSV ou SQLite, conforme configurar_backend)
     
-    # Salvar o arquivo
-    df.to_csv(arquivo_csv, index=False)
+    Args:
+        dados (dict): Dicionário com dados do aluno e resultado da avaliação
+    """
+    salvar_historico_lote([dados])
 
-def carregar_historico_para_treeview():
+# Índices de início de linha dos CSVs, estendidos incrementalmente à medida que o arquivo cresce
+_indices_linhas = {}
+
+# O índice também é salvo ao lado do CSV (int64: inode seguido dos inícios de linha),
+# regravado a cada _LINHAS_POR_GRAVACAO_INDICE linhas novas
+_LINHAS_POR_GRAVACAO_INDICE = 4096
+
+def _arquivo_indice(arquivo_csv):
+    return f"{arquivo_csv}.indice"
+
+def _carregar_indice(arquivo_csv, estado):
     """
-    Carrega o histórico do arquivo CSV para exibição no treeview
+    Lê o índice salvo ao lado do CSV, se ele ainda corresponder ao arquivo
     
     Returns:
-        list: Lista com os registros formatados para o treeview
+        np.ndarray: Posições de início salvas (None se ausente ou desatualizado)
+    """
+    try:
+        dados = np.fromfile(_arquivo_indice(arquivo_csv), dtype=np.int64)
+    except (OSError, ValueError):
+        return None
+    inicios = dados[1:]
+    if (len(dados) < 2 or dados[0] != estado.st_ino or inicios[0] != 0 or inicios[-1] > estado.st_size
+            or np.any(np.diff(inicios) <= 0)):
+        return None
+    if inicios[-1] > 0:
+        # O índice termina em uma quebra de linha: se o byte anterior não for "\n", o arquivo foi trocado
+        with open(arquivo_csv, "rb") as arquivo:
+            arquivo.seek(int(inicios[-1]) - 1)
+            if arquivo.read(1) != b"\n":
+                return None
+    return inicios
+
+def _salvar_indice(arquivo_csv, inode, inicios):
+    """Grava o índice ao lado do CSV; uma falha só faz o próximo processo varrer o arquivo de novo"""
+    arquivo = _arquivo_indice(arquivo_csv)
+    temporario = f"{arquivo}.{os.getpid()}.tmp"
+    try:
+        np.concatenate([np.array([inode], dtype=np.int64), inicios]).tofile(temporario)
+        os.replace(temporario, arquivo)
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def _indice_linhas(arquivo_csv):
+    """
+    Retorna as posições (em bytes) do início de cada linha completa do CSV
+    
+    Returns:
+        np.ndarray: Posições de início; a linha i ocupa [inicios[i], inicios[i + 1])
+    """
+    estado = os.stat(arquivo_csv)
+    indice = _indices_linhas.get(arquivo_csv)
+    if indice is None or indice["inode"] != estado.st_ino or estado.st_size < indice["tamanho"]:
+        salvos = _carregar_indice(arquivo_csv, estado)
+        gravados = 0 if salvos is None else len(salvos)
+        if salvos is None:
+            salvos = np.zeros(1, dtype=np.int64)
+        indice = {"inode": estado.st_ino, "tamanho": int(salvos[-1]), "inicios": [salvos], "gravados": gravados}
+        _indices_linhas[arquivo_csv] = indice
+    
+    if estado.st_size > indice["tamanho"]:
+        with open(arquivo_csv, "rb") as arquivo:
+            arquivo.seek(indice["tamanho"])
+            posicao = indice["tamanho"]
+            while True:
+                pedaco = arquivo.read(8 * 1024 * 1024)
+                if not pedaco:
+                    break
+                quebras = np.flatnonzero(np.frombuffer(pedaco, dtype=np.uint8) == ord("\n"))
+                indice["inicios"].append(quebras.astype(np.int64) + posicao + 1)
+                posicao += len(pedaco)
+        inicios = np.concatenate(indice["inicios"])
+        indice["inicios"] = [inicios]
+        # Para após a última quebra de linha: a linha parcial é relida quando for completada
+        indice["tamanho"] = int(inicios[-1])
+        if len(inicios) - indice["gravados"] >= _LINHAS_POR_GRAVACAO_INDICE:
+            _salvar_indice(arquivo_csv, estado.st_ino, inicios)
+            indice["gravados"] = len(inicios)
+    
+    return indice["inicios"][0]
+
+def contar_registros():
+    """
+    Conta as avaliações do histórico sem carregá-las
+    
+    Returns:
+        int: Número de registros (0 se não houver histórico)
+    """
+    if usando_sqlite():
+        return obter_banco().contar()
+    if not os.path.exists(ARQUIVO_HISTORICO):
+        return 0
+    # Linhas completas menos o cabeçalho
+    return max(len(_indice_linhas(ARQUIVO_HISTORICO)) - 2, 0)
+
+# Id do último registro antes de cada início de página já visitado no banco SQLite:
+# as páginas são lidas a partir desse id (id > ?), sem OFFSET
+_cursores_paginas = {"banco": None, "ids": {}}
+
+def carregar_pagina(inicio, quantidade):
     """
-    arquivo_csv = "historico_alunos_fuzzy.csv"
+    Carrega uma janela do histórico para exibição no treeview
+    
+    Args:
+        inicio (int): Posição do primeiro registro (0 = mais antigo)
+        quantidade (int): Número máximo de registros
+        
+    Returns:
+        list: Registros (listas de texto na ordem de COLUNAS_HISTORICO)
+    """
+    if usando_sqlite():
+        banco = obter_banco()
+        if _cursores_paginas["banco"] is not banco:
+            _cursores_paginas.update(banco=banco, ids={0: 0})
+        ids = _cursores_paginas["ids"]
+        if inicio not in ids:
+            # Posição ainda não visitada: avança pelo índice a partir da mais próxima conhecida
+            partida = max(posicao for posicao in ids if posicao < inicio)
+            ids[inicio] = banco.id_na_posicao(ids[partida], inicio - partida)
+        linhas = banco.listar(quantidade, apos=ids[inicio], com_id=True)
+        if linhas:
+            ids[inicio + len(linhas)] = linhas[-1][0]
+        return [["" if valor is None else str(valor) for valor in linha[1:len(COLUNAS_HISTORICO) + 1]]
+                for linha in linhas]
+    if not os.path.exists(ARQUIVO_HISTORICO):
+        return []
+    
+    inicios = _indice_linhas(ARQUIVO_HISTORICO)
+    total = max(len(inicios) - 2, 0)
+    fim = min(inicio + quantidade, total)
+    if inicio >= fim:
+        return []
     
-    # Verificar se o arquivo existe
+    with open(ARQUIVO_HISTORICO, "rb") as arquivo:
+        cabecalho = next(csv.reader([arquivo.readline().decode("utf-8").strip()]))
+        arquivo.seek(int(inicios[inicio + 1]))
+        trecho = arquivo.read(int(inicios[fim + 1] - inicios[inicio + 1])).decode("utf-8")
+    
+    posicoes = [cabecalho.index(coluna) if coluna in cabecalho else None for coluna in COLUNAS_HISTORICO]
+    registros = []
+    for linha in csv.reader(io.StringIO(trecho)):
+        if not linha:
+            continue
+        registros.append([linha[p] if p is not None and p < len(linha) else "" for p in posicoes])
+    return registros
+
+def ler_historico_em_blocos(tamanho_bloco=50000, arquivo_csv=None):
+    """
+    Lê o histórico (CSV ou SQLite) em blocos de tamanho fixo
+    
+    Args:
+        tamanho_bloco (int): Registros por bloco
+        arquivo_csv (str): CSV a ler (padrão: ARQUIVO_HISTORICO; ignorado no backend SQLite)
+        
+    Yields:
+        pd.DataFrame: Bloco com as colunas de COLUNAS_HISTORICO nos tipos de TIPOS_HISTORICO
+    """
+    # Importado sob demanda: o pandas pesa na abertura do aplicativo
+    import pandas as pd
+    
+    if usando_sqlite() and arquivo_csv is None:
+        for linhas in obter_banco().iterar_blocos(tamanho_bloco):
+            bloco = pd.DataFrame.from_records(linhas, columns=COLUNAS_HISTORICO)
+            bloco = bloco.astype({coluna: np.float64 for coluna in COLUNAS_HISTORICO
+                                  if coluna not in COLUNAS_TEXTO_HISTORICO})
+            for coluna in COLUNAS_TEXTO_HISTORICO:
+                bloco[coluna] = bloco[coluna].fillna("").astype(str)
+            yield bloco
+        return
+    
+    arquivo_csv = arquivo_csv or ARQUIVO_HISTORICO
     if not os.path.exists(arquivo_csv):
+        return
+    
+    # Texto vazio continua vazio; apenas as colunas numéricas viram NaN
+    leitor = pd.read_csv(arquivo_csv, chunksize=tamanho_bloco, dtype=TIPOS_HISTORICO,
+                         keep_default_na=False,
+                         na_values={coluna: [""] for coluna in COLUNAS_HISTORICO
+                                    if coluna not in COLUNAS_TEXTO_HISTORICO})
+    for bloco in leitor:
+        bloco = bloco.reindex(columns=COLUNAS_HISTORICO)
+        for coluna in COLUNAS_TEXTO_HISTORICO:
+            bloco[coluna] = bloco[coluna].fillna("")
+        yield bloco
+
+def formatar_registros(bloco):
+    """
+    Converte um bloco do histórico em registros de texto para o treeview
+    
+    Args:
+        bloco (pd.DataFrame): Bloco retornado por ler_historico_em_blocos
+        
+    Returns:
+        list: Registros (listas de texto na ordem de COLUNAS_HISTORICO)
+    """
+    colunas = []
+    for coluna in COLUNAS_HISTORICO:
+        valores = bloco[coluna]
+        textos = list(map(str, valores.tolist()))
+        if valores.hasnans:
+            for posicao in np.flatnonzero(valores.isna().to_numpy()):
+                textos[posicao] = ""
+        colunas.append(textos)
+    return list(map(list, zip(*colunas)))
+
+def iterar_historico(tamanho_bloco=50000):
+    """
+    Percorre o histórico em blocos de registros de texto, sem carregá-lo inteiro
+    
+    Args:
+        tamanho_bloco (int): Registros por bloco
+        
+    Yields:
+        list: Registros formatados para o treeview
+    """
+    for bloco in ler_historico_em_blocos(tamanho_bloco):
+        yield formatar_registros(bloco)
+
+def carregar_historico_para_treeview():
+    """
+    Carrega o histórico (CSV ou SQLite) para exibição no treeview
+    
+    Returns:
+        list: Lista com os registros formatados para o treeview
+    """
+    if not usando_sqlite() and not os.path.exists(ARQUIVO_HISTORICO):
         messagebox.showinfo("Informação", "Não há histórico de avaliações disponível.")
         return []
     
-    # Carregar o arquivo
     try:
-        df = pd.read_csv(arquivo_csv)
         registros = []
-        
-        # Converter cada linha para um formato compatível com treeview
-        for i, row in df.iterrows():
-            registro = [
-                str(row.get('Matricula', '')),
-                str(row.get('Nome', '')),
-                str(row.get('Nota_Teoria1', 0)),
-                str(row.get('Nota_Teoria2', 0)),
-                str(row.get('Nota_Pratica', 0)),
-                str(row.get('Nota_Grupo', 0)),
-                str(row.get('Frequencia', 0)),
-                str(row.get('Participacao', 0)),
-                str(row.get('Socioemocional', 0)),
-                str(row.get('Contexto', 0)),
-                str(row.get('Motivacao', 0)),
-                str(row.get('Motivacao_Cat', '')),  
-                str(row.get('Desempenho', 0)),
-                str(row.get('Classificacao', ''))
-            ]
-            registros.append(registro)
-        
+        for bloco in iterar_historico():
+            registros.extend(bloco)
         return registros
     except Exception as e:
         messagebox.showerror("Erro", f"Erro ao carregar o histórico: {str(e)}")
-        return []
\ No newline at end of file
+        return []
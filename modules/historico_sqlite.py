@@ -0,0 +1,216 @@
+"""Histórico de avaliações em SQLite"""
+import os
+import sqlite3
+import threading
+
+from modules.historico import COLUNAS_HISTORICO
+
+ARQUIVO_BANCO = "historico_alunos_fuzzy.db"
+
+COLUNAS_TEXTO = {"Matricula", "Nome", "Motivacao_Cat", "Classificacao", "Base_Regras", "Rastro"}
+
+
+class HistoricoSQLite:
+    """
+    Armazena e consulta o histórico de avaliações em um banco SQLite
+
+    Args:
+        caminho (str): Arquivo do banco (criado se não existir)
+    """
+
+    def __init__(self, caminho=ARQUIVO_BANCO):
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, timeout=30)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+
+        definicoes = ", ".join(
+            f"{coluna} {'TEXT' if coluna in COLUNAS_TEXTO else 'REAL'}" for coluna in COLUNAS_HISTORICO)
+        with self._conexao:
+            self._conexao.execute(
+                f"CREATE TABLE IF NOT EXISTS avaliacoes (id INTEGER PRIMARY KEY, {definicoes}, "
+                "Data_Avaliacao TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')))")
+            # Banco de uma versão anterior: as colunas novas ficam nulas nos registros existentes
+            existentes = {linha[1] for linha in self._conexao.execute("PRAGMA table_info(avaliacoes)")}
+            for coluna in COLUNAS_HISTORICO:
+                if coluna not in existentes:
+                    self._conexao.execute(f"ALTER TABLE avaliacoes ADD COLUMN {coluna} "
+                                          f"{'TEXT' if coluna in COLUNAS_TEXTO else 'REAL'}")
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_matricula ON avaliacoes (Matricula)")
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_classificacao ON avaliacoes (Classificacao)")
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_data ON avaliacoes (Data_Avaliacao)")
+            self._conexao.execute("CREATE TABLE IF NOT EXISTS metadados (chave TEXT PRIMARY KEY, valor TEXT)")
+
+    def inserir(self, registros):
+        """
+        Insere registros em uma única transação
+
+        Args:
+            registros (list): Dicionários com as colunas de COLUNAS_HISTORICO
+        """
+        self._inserir_linhas([tuple(registro.get(coluna) for coluna in COLUNAS_HISTORICO)
+                              for registro in registros])
+
+    def _inserir_linhas(self, linhas):
+        """Insere tuplas com os valores na ordem de COLUNAS_HISTORICO"""
+        colunas = ", ".join(COLUNAS_HISTORICO)
+        marcadores = ", ".join("?" for _ in COLUNAS_HISTORICO)
+        with self._trava, self._conexao:
+            self._conexao.executemany(f"INSERT INTO avaliacoes ({colunas}) VALUES ({marcadores})", linhas)
+
+    def migrar_csv(self, arquivo_csv, tamanho_bloco=50000):
+        """
+        Importa o histórico CSV existente uma única vez (retomando uma migração interrompida)
+
+        Args:
+            arquivo_csv (str): Caminho do CSV de histórico
+            tamanho_bloco (int): Linhas lidas e inseridas por transação
+
+        Returns:
+            int: Quantidade de registros importados nesta chamada (0 se já migrado)
+        """
+        import pandas as pd
+
+        chave = f"migracao_csv:{os.path.abspath(arquivo_csv)}"
+        with self._trava:
+            # Versões anteriores registravam o caminho como informado
+            if self._conexao.execute("SELECT 1 FROM metadados WHERE chave IN (?, ?)",
+                                     (chave, f"migracao_csv:{arquivo_csv}")).fetchone():
+                return 0
+            importadas = self._linhas_migradas(chave)
+
+        total = 0
+        colunas = ", ".join(COLUNAS_HISTORICO)
+        marcadores = ", ".join("?" for _ in COLUNAS_HISTORICO)
+        for bloco in pd.read_csv(arquivo_csv, chunksize=tamanho_bloco, skiprows=range(1, importadas + 1),
+                                 dtype=dict.fromkeys(COLUNAS_TEXTO, str)):
+            bloco = bloco.reindex(columns=COLUNAS_HISTORICO)
+            bloco = bloco.astype(object).where(bloco.notna(), None)
+            with self._trava, self._conexao:
+                self._conexao.execute("BEGIN IMMEDIATE")
+                if self._linhas_migradas(chave) != importadas:
+                    # Outra instância está migrando o mesmo arquivo
+                    return total
+                self._conexao.executemany(f"INSERT INTO avaliacoes ({colunas}) VALUES ({marcadores})",
+                                          list(bloco.itertuples(index=False, name=None)))
+                importadas += len(bloco)
+                self._conexao.execute("INSERT OR REPLACE INTO metadados (chave, valor) VALUES (?, ?)",
+                                      (f"{chave}:linhas", str(importadas)))
+            total += len(bloco)
+
+        with self._trava, self._conexao:
+            self._conexao.execute("INSERT OR REPLACE INTO metadados (chave, valor) VALUES (?, ?)",
+                                  (chave, str(importadas)))
+        return total
+
+    def _linhas_migradas(self, chave):
+        """Linhas do CSV já importadas por uma migração (possivelmente interrompida)"""
+        linha = self._conexao.execute("SELECT valor FROM metadados WHERE chave = ?",
+                                      (f"{chave}:linhas",)).fetchone()
+        return int(linha[0]) if linha else 0
+
+    def _consultar(self, condicao="", parametros=(), limite=None, apos=0, com_id=False):
+        # Paginação pelo último id lido (como em iterar_blocos): sem OFFSET, cada página custa o mesmo
+        colunas = ", ".join(["id"] * com_id + COLUNAS_HISTORICO + ["Data_Avaliacao"])
+        filtro = f" AND ({condicao})" if condicao else ""
+        sql = f"SELECT {colunas} FROM avaliacoes WHERE id > ?{filtro} ORDER BY id"
+        parametros = (int(apos),) + tuple(parametros)
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros += (int(limite),)
+        with self._trava:
+            return self._conexao.execute(sql, parametros).fetchall()
+
+    def consultar_por_matricula(self, matricula):
+        """Retorna todas as avaliações de um aluno (tuplas com as colunas e a data)"""
+        return self._consultar("Matricula = ?", (str(matricula),))
+
+    def consultar_por_classificacao(self, classificacao, limite=None, apos=0, com_id=False):
+        """
+        Retorna as avaliações com uma classificação (tuplas com as colunas e a data)
+        """
+        return self._consultar("Classificacao = ?", (classificacao,), limite, apos, com_id)
+
+    def consultar_por_periodo(self, inicio, fim):
+        """Retorna as avaliações com Data_Avaliacao entre inicio e fim (texto ISO 8601)"""
+        return self._consultar("Data_Avaliacao BETWEEN ? AND ?", (inicio, fim))
+
+    def listar(self, limite=None, apos=0, com_id=False):
+        """
+        Retorna as avaliações na ordem de gravação
+
+        Args:
+            limite (int): Máximo de registros (None para todos)
+            apos (int): Retorna só registros com id maior (o último id da página anterior)
+            com_id (bool): Inclui o id do registro como primeiro valor de cada tupla
+
+        Returns:
+            list: Tuplas com as colunas de COLUNAS_HISTORICO e a data
+        """
+        return self._consultar(limite=limite, apos=apos, com_id=com_id)
+
+    def id_na_posicao(self, apos, passos):
+        """
+        Avança pelo índice da chave primária a partir de um id
+
+        Args:
+            apos (int): Id de partida (0 = antes do primeiro registro)
+            passos (int): Registros a avançar
+
+        Returns:
+            int: Id do registro alcançado (o último existente, se o histórico acabar antes)
+        """
+        if passos <= 0:
+            return int(apos)
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT MAX(id) FROM (SELECT id FROM avaliacoes WHERE id > ? ORDER BY id LIMIT ?)",
+                (int(apos), int(passos))).fetchone()
+        return int(apos) if linha[0] is None else linha[0]
+
+    def iterar_blocos(self, tamanho_bloco=50000, com_id=False):
+        """
+        Percorre as avaliações na ordem de gravação, em blocos
+
+        Args:
+            tamanho_bloco (int): Registros por bloco
+            com_id (bool): Inclui o id do registro como primeiro valor de cada tupla
+
+        Yields:
+            list: Tuplas com as colunas de COLUNAS_HISTORICO
+        """
+        colunas = ", ".join(COLUNAS_HISTORICO)
+        ultimo = 0
+        while True:
+            with self._trava:
+                linhas = self._conexao.execute(
+                    f"SELECT id, {colunas} FROM avaliacoes WHERE id > ? ORDER BY id LIMIT ?",
+                    (ultimo, int(tamanho_bloco))).fetchall()
+            if not linhas:
+                return
+            ultimo = linhas[-1][0]
+            yield linhas if com_id else [linha[1:] for linha in linhas]
+
+    def atualizar_resultados(self, resultados):
+        """
+        Regrava o resultado e o rastro de avaliações existentes em uma única transação
+
+        Args:
+            resultados (list): Tuplas (id, desempenho, classificacao, base_regras, rastro codificado)
+        """
+        with self._trava, self._conexao:
+            self._conexao.executemany("UPDATE avaliacoes SET Desempenho = ?, Classificacao = ?, Base_Regras = ?, "
+                                      "Rastro = ? WHERE id = ?",
+                                      [(desempenho, classificacao, base_regras, rastro, identificador)
+                                       for identificador, desempenho, classificacao, base_regras, rastro
+                                       in resultados])
+
+    def contar(self):
+        """Retorna o número total de avaliações"""
+        with self._trava:
+            return self._conexao.execute("SELECT COUNT(*) FROM avaliacoes").fetchone()[0]
+
+    def fechar(self):
+        with self._trava:
+            self._conexao.close()
@@ -0,0 +1,46 @@
+"""Medição do tempo de inicialização do aplicativo"""
+import time
+from contextlib import contextmanager
+
+# Referência dos marcos: importação deste módulo (a primeira linha do main.py)
+INICIO = time.perf_counter()
+
+# Etapas medidas, na ordem em que terminaram: (nome, segundos)
+_etapas = []
+
+# Marcos da partida: (nome, segundos desde INICIO)
+_marcos = []
+
+
+@contextmanager
+def medir_etapa(nome):
+    """
+    Mede a duração do bloco e a registra com o nome informado
+
+    Args:
+        nome (str): Descrição da etapa
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _etapas.append((nome, time.perf_counter() - inicio))
+
+
+def marcar(nome):
+    """Registra um marco com o tempo decorrido desde o início da aplicação"""
+    _marcos.append((nome, time.perf_counter() - INICIO))
+
+
+def relatorio_inicializacao():
+    """
+    Monta o relatório de tempos da inicialização
+
+    Returns:
+        str: Uma linha por etapa e por marco, em milissegundos
+    """
+    linhas = ["Etapas da inicialização:"]
+    linhas += [f"  {nome:<45} {segundos * 1000:9.1f} ms" for nome, segundos in _etapas]
+    linhas.append("Marcos (desde o início):")
+    linhas += [f"  {nome:<45} {segundos * 1000:9.1f} ms" for nome, segundos in _marcos]
+    return "\n".join(linhas)
@@ -0,0 +1,236 @@
+"""Medição por etapa do fluxo de avaliação (ligada com AVALIACAO_INSTRUMENTACAO=1)"""
+import bisect
+import json
+import math
+import os
+import threading
+import time
+
+# Limites superiores (em segundos) das faixas dos histogramas; a última faixa é +Inf
+LIMITES_HISTOGRAMA = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                      0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Nome da métrica no formato do Prometheus
+METRICA_PROMETHEUS = "avaliacao_etapa_segundos"
+
+_estado = {"ativo": os.environ.get("AVALIACAO_INSTRUMENTACAO", "") not in ("", "0")}
+_trava = threading.Lock()
+
+# Serializa as gravações de exportar (thread periódica, atexit e chamadas diretas)
+_trava_exportacao = threading.Lock()
+
+# Histogramas por etapa: {nome: Histograma}, na ordem em que cada etapa apareceu
+_histogramas = {}
+
+
+class Histograma:
+    """
+    Contagem de durações em faixas fixas (LIMITES_HISTOGRAMA)
+
+    Atributos:
+        faixas (list): Chamadas em cada faixa (não acumuladas), a última é +Inf
+        contagem (int): Total de chamadas
+        soma (float): Soma das durações, em segundos
+        maximo (float): Maior duração observada
+    """
+
+    def __init__(self):
+        self.faixas = [0] * (len(LIMITES_HISTOGRAMA) + 1)
+        self.contagem = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, segundos):
+        self.faixas[bisect.bisect_left(LIMITES_HISTOGRAMA, segundos)] += 1
+        self.contagem += 1
+        self.soma += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+
+    def percentil(self, fracao):
+        """
+        Estima um percentil por interpolação linear dentro da faixa que o contém
+
+        Args:
+            fracao (float): Percentil entre 0 e 1 (0.95 para o p95)
+
+        Returns:
+            float: Duração estimada em segundos (0 sem chamadas)
+        """
+        if not self.contagem:
+            return 0.0
+        alvo = fracao * self.contagem
+        acumulado = 0
+        for indice, quantidade in enumerate(self.faixas):
+            if quantidade and acumulado + quantidade >= alvo:
+                inferior = LIMITES_HISTOGRAMA[indice - 1] if indice else 0.0
+                superior = LIMITES_HISTOGRAMA[indice] if indice < len(LIMITES_HISTOGRAMA) else self.maximo
+                estimativa = inferior + (superior - inferior) * (alvo - acumulado) / quantidade
+                return min(estimativa, self.maximo)
+            acumulado += quantidade
+        return self.maximo
+
+
+class _Medicao:
+    """Contexto que mede o bloco e registra a duração na etapa"""
+    __slots__ = ("nome", "inicio")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        registrar(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+
+class _SemMedicao:
+    """Contexto vazio usado com a instrumentação desligada"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+
+_SEM_MEDICAO = _SemMedicao()
+
+
+def etapa(nome):
+    """
+    Mede um bloco do fluxo de avaliação: with etapa("inferencia"): ...
+
+    Args:
+        nome (str): Nome da etapa (rótulo do histograma)
+    """
+    if not _estado["ativo"]:
+        return _SEM_MEDICAO
+    return _Medicao(nome)
+
+
+def registrar(nome, segundos):
+    """Registra uma duração medida fora de etapa() (por exemplo, entre duas threads)"""
+    with _trava:
+        histograma = _histogramas.get(nome)
+        if histograma is None:
+            histograma = _histogramas[nome] = Histograma()
+        histograma.registrar(segundos)
+
+
+def ativa():
+    return _estado["ativo"]
+
+
+def ativar():
+    _estado["ativo"] = True
+
+
+def desativar():
+    _estado["ativo"] = False
+
+
+def zerar():
+    """Descarta todas as medições"""
+    with _trava:
+        _histogramas.clear()
+
+
+def resumo():
+    """
+    Resume os histogramas de todas as etapas
+
+    Returns:
+        dict: Etapa -> 'chamadas', 'total', 'media', 'p50', 'p95', 'p99' e 'maximo'
+            (em segundos) e 'faixas' (limite superior -> chamadas, não acumuladas)
+    """
+    with _trava:
+        resultado = {}
+        for nome, histograma in _histogramas.items():
+            resultado[nome] = {
+                'chamadas': histograma.contagem,
+                'total': histograma.soma,
+                'media': histograma.soma / histograma.contagem if histograma.contagem else 0.0,
+                'p50': histograma.percentil(0.50),
+                'p95': histograma.percentil(0.95),
+                'p99': histograma.percentil(0.99),
+                'maximo': histograma.maximo,
+                'faixas': {str(limite): quantidade for limite, quantidade
+                           in zip([*LIMITES_HISTOGRAMA, "+Inf"], histograma.faixas)}
+            }
+        return resultado
+
+
+def formatar_prometheus():
+    """
+    Monta os histogramas no formato de texto do Prometheus
+
+    Returns:
+        str: Uma série histogram (faixas acumuladas, _sum e _count) por etapa
+    """
+    linhas = [f"# HELP {METRICA_PROMETHEUS} Duração das etapas do fluxo de avaliação.",
+              f"# TYPE {METRICA_PROMETHEUS} histogram"]
+    with _trava:
+        for nome, histograma in _histogramas.items():
+            rotulo = nome.replace("\\", "\\\\").replace('"', '\\"')
+            acumulado = 0
+            for limite, quantidade in zip([*LIMITES_HISTOGRAMA, math.inf], histograma.faixas):
+                acumulado += quantidade
+                texto_limite = "+Inf" if limite == math.inf else repr(limite)
+                linhas.append(f'{METRICA_PROMETHEUS}_bucket{{etapa="{rotulo}",le="{texto_limite}"}} {acumulado}')
+            linhas.append(f'{METRICA_PROMETHEUS}_sum{{etapa="{rotulo}"}} {histograma.soma!r}')
+            linhas.append(f'{METRICA_PROMETHEUS}_count{{etapa="{rotulo}"}} {histograma.contagem}')
+    return "\n".join(linhas) + "\n"
+
+
+def exportar(arquivo):
+    """
+    Grava as medições em arquivo, substituindo o anterior de forma atômica
+
+    Args:
+        arquivo (str): Caminho de destino; .prom ou .txt usam o formato do
+            Prometheus, os demais JSON
+    """
+    if arquivo.lower().endswith((".prom", ".txt")):
+        conteudo = formatar_prometheus()
+    else:
+        conteudo = json.dumps({'gerado_em': time.time(), 'etapas': resumo()}, indent=2, ensure_ascii=False)
+
+    temporario = f"{arquivo}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with _trava_exportacao:
+        try:
+            with open(temporario, "w", encoding="utf-8") as saida:
+                saida.write(conteudo)
+            os.replace(temporario, arquivo)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+
+def iniciar_exportacao_periodica(arquivo, intervalo=60.0):
+    """
+    Grava as medições a cada intervalo, em uma thread de fundo
+
+    Args:
+        arquivo (str): Caminho de destino (ver exportar)
+        intervalo (float): Segundos entre as gravações
+
+    Returns:
+        threading.Event: Sinalize (set) para encerrar
+    """
+    parar = threading.Event()
+
+    def exportar_periodicamente():
+        while not parar.wait(intervalo):
+            try:
+                exportar(arquivo)
+            except OSError:
+                # Destino indisponível agora; tenta de novo no próximo intervalo
+                pass
+
+    threading.Thread(target=exportar_periodicamente, name="exportacao-metricas", daemon=True).start()
+    return parar
@@ -1,18 +1,57 @@
+import atexit
+import os
+import queue
+import threading
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox, ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-import skfuzzy as fuzz
 
-from modules.fuzzy_logic import configurar_sistema_fuzzy
+from modules.cache import ARQUIVO_CACHE_AVALIACOES, CacheAvaliacoes
+from modules.inicializacao import medir_etapa, marcar, relatorio_inicializacao
+from modules import instrumentacao
+from modules.instrumentacao import etapa
 from modules.compatibilidade import ajustar_nota
-from modules.historico import salvar_historico, carregar_historico_para_treeview
+from modules.historico import (COLUNAS_HISTORICO, salvar_historico, contar_registros, carregar_pagina,
+                               montar_registro, decodificar_rastro)
 from modules.analise import adicionar_analise_personalizada
+from modules.avaliacao import (VALORES_MOTIVACAO, calcular_nota_media, verificar_casos_extremos,
+                               aplicar_casos_extremos, desempenho_alternativo, classificar_desempenho)
+
+# Registros exibidos por vez no histórico (o treeview nunca recebe o arquivo inteiro)
+TAMANHO_PAGINA = 200
+
+# Colunas do histórico exibidas no treeview (as demais servem para refazer a exibição do aluno)
+COLUNAS_TREEVIEW = COLUNAS_HISTORICO[:COLUNAS_HISTORICO.index("Classificacao") + 1]
+
+# Regras listadas no resultado, em ordem de força de disparo
+REGRAS_EXIBIDAS = 3
+
+# Intervalo (ms) entre as verificações de alteração do arquivo da base de regras
+INTERVALO_VERIFICACAO_REGRAS = 2000
+
+# Intervalo (ms) de atualização do painel de depuração
+INTERVALO_PAINEL_DEPURACAO = 1000
 
 class AvaliacaoFuzzyApp:
-    def __init__(self, root):
+    def __init__(self, root, motor="compilado", inicio_rapido=True, relatar_inicializacao=False,
+                 arquivo_regras=None):
         self.root = root
+        # Motor de inferência: "compilado" (modules.motor_compilado) ou "skfuzzy"
+        self.motor = motor
+        # Definição da base de regras (JSON/TOML); alterações no arquivo são recarregadas
+        # automaticamente (None usa modules/regras_padrao.json)
+        self.arquivo_regras = arquivo_regras
+        self.versao_regras = None
+        self.recompilacao = None
+        # Com inicio_rapido, a janela aparece antes do sistema fuzzy ficar pronto
+        self.relatar_inicializacao = relatar_inicializacao
+        self.sistema_ctrl = self.desempenho = self.sistema_compilado = self.cache = None
+        # Trocado na thread do Tk; a inferência de cada avaliação lê o sistema sob a trava
+        self.trava_sistema = threading.Lock()
+        # Identifica a base de regras dos rastros gravados no histórico
+        self.base_regras = None
         self.root.title("Sistema de Avaliação Fuzzy de Alunos")
         self.root.geometry("900x700")
         self.root.configure(bg="#f0f0f0")
@@ -33,6 +72,14 @@ class AvaliacaoFuzzyApp:
         self.tab_historico = ttk.Frame(self.notebook)
         self.notebook.add(self.tab_historico, text="Histórico")
         
+        # Fila de avaliações: processadas em segundo plano, uma de cada vez e na ordem de
+        # entrada; os resultados voltam à thread do Tk por resultados_prontos + after()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="avaliacao")
+        self.resultados_prontos = queue.Queue()
+        self.avaliacoes_pendentes = []
+        self.total_lote = 0
+        self.verificando_resultados = False
+        
         # Configurar a entrada de dados
         self.configurar_entrada_dados()
         
@@ -42,8 +89,141 @@ class AvaliacaoFuzzyApp:
         # Configurar a área de histórico
         self.configurar_historico()
         
-        # Configurar o sistema fuzzy
-        self.sistema_ctrl, self.desempenho = configurar_sistema_fuzzy()
+        # Painel de depuração com os tempos de cada etapa da avaliação (F12)
+        self.painel_depuracao = None
+        self.root.bind("<F12>", lambda evento: self.abrir_painel_depuracao())
+        
+        # Configurar o sistema fuzzy: na thread de avaliação (a primeira tarefa da fila,
+        # então nenhuma avaliação roda antes dele) ou aqui mesmo, sem o início rápido
+        self.root.after_idle(marcar, "janela exibida")
+        if inicio_rapido:
+            self.construcao_sistema = self.executor.submit(self.construir_sistema)
+            self.root.after(50, self.verificar_sistema)
+        else:
+            self.instalar_sistema(self.construir_sistema())
+            self.sistema_pronto()
+    
+    def construir_sistema(self):
+        """
+        Carrega o sistema fuzzy compilado e abre o cache de resultados (não acessa widgets)
+        
+        Returns:
+            dict: Sistema a ser passado a instalar_sistema na thread do Tk
+        """
+        from modules.motor_compilado import DIRETORIO_CACHE, caminho_regras, carregar_sistema
+        
+        # Versão lida antes do arquivo: uma alteração durante a leitura é detectada na próxima verificação
+        versao = self.versao_arquivo_regras()
+        
+        # Vem do cache em disco quando a base de regras não mudou desde a última execução
+        with medir_etapa("carregamento do sistema compilado"):
+            sistema_compilado = carregar_sistema(arquivo_regras=self.arquivo_regras)
+        
+        # O sistema do scikit-fuzzy só é montado quando é o motor de inferência
+        sistema_ctrl = desempenho = None
+        if self.motor == "skfuzzy":
+            with medir_etapa("configurar_sistema_fuzzy"):
+                from modules.fuzzy_logic import configurar_sistema_fuzzy
+                sistema_ctrl, desempenho = configurar_sistema_fuzzy(definicao=caminho_regras(self.arquivo_regras))
+        
+        # Cache de resultados (entradas repetidas não passam de novo pela inferência)
+        impressao = sistema_compilado.impressao_digital()
+        with medir_etapa("abertura do cache de avaliações"):
+            cache = CacheAvaliacoes(self.inferir_desempenho, f"{self.motor}:{impressao}",
+                                    arquivo=os.path.join(DIRETORIO_CACHE, ARQUIVO_CACHE_AVALIACOES))
+        atexit.register(cache.fechar)
+        
+        # Antecipar a importação do matplotlib para o primeiro gráfico não esperar por ela
+        with medir_etapa("importação do matplotlib"):
+            import modules.grafico
+            import matplotlib.backends.backend_tkagg
+        
+        return {
+            'versao': versao,
+            'sistema_compilado': sistema_compilado,
+            'sistema_ctrl': sistema_ctrl,
+            'desempenho': desempenho,
+            'base_regras': impressao[:16],
+            'cache': cache
+        }
+    
+    def instalar_sistema(self, sistema):
+        """Passa a usar um sistema de construir_sistema e descarta o gráfico do anterior (thread do Tk)"""
+        with self.trava_sistema:
+            cache_anterior = self.cache
+            self.sistema_compilado = sistema['sistema_compilado']
+            self.sistema_ctrl, self.desempenho = sistema['sistema_ctrl'], sistema['desempenho']
+            self.base_regras = sistema['base_regras']
+            self.cache = sistema['cache']
+        self.versao_regras = sistema['versao']
+        if cache_anterior is not None:
+            atexit.unregister(cache_anterior.fechar)
+            cache_anterior.fechar()
+        
+        # Curvas e categorias da saída podem ter mudado: o gráfico é montado de novo
+        if self.grafico is not None:
+            self.grafico['canvas'].get_tk_widget().destroy()
+            self.grafico = None
+    
+    def verificar_sistema(self):
+        """Aguarda a construção do sistema fuzzy (executado periodicamente na thread do Tk)"""
+        if not self.construcao_sistema.done():
+            self.root.after(50, self.verificar_sistema)
+            return
+        
+        try:
+            sistema = self.construcao_sistema.result()
+        except Exception as e:
+            self.rotulo_progresso.config(text="Sistema fuzzy indisponível")
+            messagebox.showerror("Erro", f"Erro ao preparar o sistema fuzzy: {str(e)}")
+            return
+        self.instalar_sistema(sistema)
+        self.sistema_pronto()
+    
+    def sistema_pronto(self):
+        """Libera a avaliação depois que o sistema fuzzy foi construído"""
+        marcar("sistema fuzzy pronto")
+        self.botao_avaliar.state(["!disabled"])
+        self.atualizar_progresso()
+        if self.relatar_inicializacao:
+            print(relatorio_inicializacao())
+        self.root.after(INTERVALO_VERIFICACAO_REGRAS, self.verificar_regras)
+    
+    def versao_arquivo_regras(self):
+        """Identifica a versão atual do arquivo da base de regras (data de modificação e tamanho)"""
+        from modules.motor_compilado import caminho_regras
+        try:
+            estado = os.stat(caminho_regras(self.arquivo_regras))
+        except OSError:
+            return None
+        return estado.st_mtime_ns, estado.st_size
+    
+    def verificar_regras(self):
+        """Recompila o sistema em segundo plano quando o arquivo da base de regras muda (thread do Tk)"""
+        versao = self.versao_arquivo_regras()
+        if self.recompilacao is None and versao is not None and versao != self.versao_regras:
+            self.versao_regras = versao
+            self.recompilacao = self.executor.submit(self.construir_sistema)
+            self.root.after(50, self.verificar_recompilacao)
+        self.root.after(INTERVALO_VERIFICACAO_REGRAS, self.verificar_regras)
+    
+    def verificar_recompilacao(self):
+        """Aguarda a recompilação da base de regras e instala o novo sistema (thread do Tk)"""
+        if not self.recompilacao.done():
+            self.root.after(50, self.verificar_recompilacao)
+            return
+        
+        recompilacao, self.recompilacao = self.recompilacao, None
+        try:
+            sistema = recompilacao.result()
+        except Exception as e:
+            messagebox.showwarning("Base de regras",
+                                   f"A base de regras alterada é inválida; as regras anteriores "
+                                   f"continuam em uso.\n\n{str(e)}")
+            return
+        self.instalar_sistema(sistema)
+        if not self.avaliacoes_pendentes:
+            self.rotulo_progresso.config(text="Base de regras recarregada")
     
     def configurar_entrada_dados(self):
         # Frame para os dados do aluno
@@ -78,8 +258,21 @@ class AvaliacaoFuzzyApp:
         frame_botoes = ttk.Frame(self.tab_entrada)
         frame_botoes.pack(fill="x", padx=10, pady=10)
         
-        ttk.Button(frame_botoes, text="Avaliar Aluno", command=self.avaliar_aluno).pack(side="left", padx=5)
+        # Habilitado quando o sistema fuzzy estiver pronto (ver sistema_pronto)
+        self.botao_avaliar = ttk.Button(frame_botoes, text="Avaliar Aluno", command=self.avaliar_aluno)
+        self.botao_avaliar.pack(side="left", padx=5)
+        self.botao_avaliar.state(["disabled"])
         ttk.Button(frame_botoes, text="Limpar Campos", command=self.limpar_campos).pack(side="left", padx=5)
+        
+        # Progresso da fila de avaliações
+        self.botao_cancelar = ttk.Button(frame_botoes, text="Cancelar Fila", command=self.cancelar_fila)
+        self.botao_cancelar.pack(side="right", padx=5)
+        self.barra_progresso = ttk.Progressbar(frame_botoes, mode="determinate", length=150)
+        self.barra_progresso.pack(side="right", padx=5)
+        self.rotulo_progresso = ttk.Label(frame_botoes, text="")
+        self.rotulo_progresso.pack(side="right", padx=5)
+        self.atualizar_progresso()
+        self.rotulo_progresso.config(text="Preparando o sistema fuzzy...")
                     
         # Registrar validação para cada tipo
         validar_nota = self.root.register(lambda texto: validar_entrada(texto, "nota"))
@@ -129,6 +322,9 @@ class AvaliacaoFuzzyApp:
         # Área para gráfico
         self.frame_grafico = ttk.Frame(frame_resultados)
         self.frame_grafico.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Figura do gráfico, criada na primeira avaliação e reaproveitada nas seguintes
+        self.grafico = None
 
     def configurar_historico(self):
         # Frame para o histórico
@@ -155,6 +351,28 @@ class AvaliacaoFuzzyApp:
         self.treeview.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
+        # Registro completo (inclusive o rastro da inferência) de cada item do treeview
+        self.registros_treeview = {}
+        
+        # Navegação entre páginas do histórico
+        self.inicio_pagina = 0
+        self.total_registros = 0
+        self.pagina_carregada = False
+        frame_paginas = ttk.Frame(self.tab_historico)
+        frame_paginas.pack(pady=5)
+        self.botao_anterior = ttk.Button(frame_paginas, text="◀ Anterior", command=self.pagina_anterior)
+        self.botao_anterior.pack(side="left", padx=5)
+        self.rotulo_pagina = ttk.Label(frame_paginas, text="Nenhum registro carregado")
+        self.rotulo_pagina.pack(side="left", padx=10)
+        self.botao_proxima = ttk.Button(frame_paginas, text="Próxima ▶", command=self.proxima_pagina)
+        self.botao_proxima.pack(side="left", padx=5)
+        self.atualizar_rotulo_pagina()
+        
+        # Rolar além do fim (ou do início) da página carrega a página vizinha
+        self.treeview.bind("<MouseWheel>", self.rolar_historico)
+        self.treeview.bind("<Button-4>", self.rolar_historico)
+        self.treeview.bind("<Button-5>", self.rolar_historico)
+        
         # Botão para carregar histórico
         ttk.Button(self.tab_historico, text="Carregar Histórico", 
                 command=self.carregar_historico).pack(pady=10)
@@ -168,373 +386,597 @@ class AvaliacaoFuzzyApp:
     
     def avaliar_aluno(self):
         try:
-            # Obter dados dos campos
-            dados = {}
-            for campo, entry in self.entries.items():
-                valor = entry.get().strip()
-                if campo not in ["matrícula", "nome_do_aluno"]:
-                    if not valor:
-                        messagebox.showerror("Erro", f"O campo {campo} não pode estar vazio.")
-                        return
-                    try:
-                        valor_numerico = float(valor)
+            # Leitura e validação dos campos (etapa "leitura_entradas" da instrumentação)
+            with etapa("leitura_entradas"):
+                # Obter dados dos campos
+                dados = {}
+                for campo, entry in self.entries.items():
+                    valor = entry.get().strip()
+                    if campo not in ["matrícula", "nome_do_aluno"]:
+                        if not valor:
+                            messagebox.showerror("Erro", f"O campo {campo} não pode estar vazio.")
+                            return
+                        try:
+                            valor_numerico = float(valor)
                         
-                        # Verificar se o valor está no intervalo permitido
-                        if campo == "frequência":
-                            if valor_numerico < 0 or valor_numerico > 100:
-                                messagebox.showerror("Erro", f"O valor do campo {campo} deve estar entre 0 e 100.")
-                                return
-                        else:  # Para outros campos numéricos
-                            if valor_numerico < 0 or valor_numerico > 10:
-                                messagebox.showerror("Erro", f"O valor do campo {campo} deve estar entre 0 e 10.")
-                                return
+                            # Verificar se o valor está no intervalo permitido
+                            if campo == "frequência":
+                                if valor_numerico < 0 or valor_numerico > 100:
+                                    messagebox.showerror("Erro", f"O valor do campo {campo} deve estar entre 0 e 100.")
+                                    return
+                            else:  # Para outros campos numéricos
+                                if valor_numerico < 0 or valor_numerico > 10:
+                                    messagebox.showerror("Erro", f"O valor do campo {campo} deve estar entre 0 e 10.")
+                                    return
                                 
-                        dados[campo] = valor_numerico
-                    except ValueError:
-                        messagebox.showerror("Erro", f"O valor '{valor}' no campo {campo} não é um número válido.")
-                        return
-                else:
-                    dados[campo] = valor
+                            dados[campo] = valor_numerico
+                        except ValueError:
+                            messagebox.showerror("Erro", f"O valor '{valor}' no campo {campo} não é um número válido.")
+                            return
+                    else:
+                        dados[campo] = valor
             
-            # Validar matrícula e nome
-            if not dados.get("matrícula"):
-                messagebox.showerror("Erro", "A matrícula do aluno é obrigatória.")
-                return
+                # Validar matrícula e nome
+                if not dados.get("matrícula"):
+                    messagebox.showerror("Erro", "A matrícula do aluno é obrigatória.")
+                    return
                 
-            if not dados.get("nome_do_aluno"):
-                messagebox.showerror("Erro", "O nome do aluno é obrigatório.")
-                return
+                if not dados.get("nome_do_aluno"):
+                    messagebox.showerror("Erro", "O nome do aluno é obrigatório.")
+                    return
             
-            # Obter motivação
-            motivacao_valor = self.motivacao.get()
-            if not motivacao_valor:
-                messagebox.showerror("Erro", "O campo Motivação não pode estar vazio.")
-                return
+                # Obter motivação
+                motivacao_valor = self.motivacao.get()
+                if not motivacao_valor:
+                    messagebox.showerror("Erro", "O campo Motivação não pode estar vazio.")
+                    return
                 
-            # Converter motivação para valor numérico para o sistema fuzzy baseado na categoria selecionada
-            if motivacao_valor == "Alta":
-                dados['motivacao'] = 9.0
-            elif motivacao_valor == "Média":
-                dados['motivacao'] = 5.0
-            elif motivacao_valor == "Baixa":
-                dados['motivacao'] = 2.0
+                # Converter motivação para valor numérico para o sistema fuzzy baseado na categoria selecionada
+                if motivacao_valor in VALORES_MOTIVACAO:
+                    dados['motivacao'] = VALORES_MOTIVACAO[motivacao_valor]
             
-            # Guardar a versão texto da motivação
-            dados['motivacao_valor'] = motivacao_valor
+                # Guardar a versão texto da motivação
+                dados['motivacao_valor'] = motivacao_valor
             
-            # Obter perfil e método de ensino
-            perfil_aluno = self.perfil_aluno.get()
-            metodo_ensino = self.metodo_ensino.get()
+                # Obter perfil e método de ensino
+                perfil_aluno = self.perfil_aluno.get()
+                metodo_ensino = self.metodo_ensino.get()
             
-            # Verificar se perfil e método foram selecionados
-            if not perfil_aluno or not metodo_ensino:
-                messagebox.showerror("Erro", "Perfil do aluno e método de ensino são obrigatórios.")
-                return
+                # Verificar se perfil e método foram selecionados
+                if not perfil_aluno or not metodo_ensino:
+                    messagebox.showerror("Erro", "Perfil do aluno e método de ensino são obrigatórios.")
+                    return
             
-            # Armazenar perfil e método nos dados para análise personalizada
-            dados['perfil_aluno'] = perfil_aluno
-            dados['metodo_ensino'] = metodo_ensino
+                # Armazenar perfil e método nos dados para análise personalizada
+                dados['perfil_aluno'] = perfil_aluno
+                dados['metodo_ensino'] = metodo_ensino
             
-            # Calcular média das notas para usar no sistema fuzzy
-            nota_media = (dados.get('nota_da_primeira_avaliação_teórica', 0) + 
-                        dados.get('nota_da_segunda_avaliação_teórica', 0) + 
-                        dados.get('nota_da_avaliação_prática', 0) + 
-                        dados.get('nota_da_avaliação_em_grupo', 0)) / 4
-            dados['nota'] = nota_media
-            
-            # Ajustar nota baseado na compatibilidade
-            nota_ajustada = ajustar_nota(nota_media, perfil_aluno, metodo_ensino)
+            # Avaliar em segundo plano; os campos ficam livres para o próximo aluno
+            self.enfileirar_avaliacao(dados)
             
-            # Instanciar o sistema de controle fuzzy
-            from skfuzzy import control as ctrl
-            sistema = ctrl.ControlSystemSimulation(self.sistema_ctrl)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Ocorreu um erro durante a avaliação: {str(e)}")
+    
+    def enfileirar_avaliacao(self, dados):
+        """
+        Envia os dados validados de um aluno para a fila de avaliação
+        
+        Args:
+            dados (dict): Dados do aluno lidos dos campos da interface
+        """
+        if not self.avaliacoes_pendentes:
+            self.total_lote = 0
+        futuro = self.executor.submit(self.processar_avaliacao, dados, time.perf_counter())
+        self.avaliacoes_pendentes.append(futuro)
+        self.total_lote += 1
+        # Chamado na thread de avaliação (ou aqui mesmo, se cancelado): apenas enfileira
+        futuro.add_done_callback(self.resultados_prontos.put)
+        
+        self.atualizar_progresso()
+        if not self.verificando_resultados:
+            self.verificando_resultados = True
+            self.root.after(50, self.verificar_resultados)
+    
+    def processar_avaliacao(self, dados, enfileirado_em=None):
+        """
+        Calcula o desempenho e grava o histórico (executado fora da thread do Tk)
+        
+        Args:
+            dados (dict): Dados do aluno lidos dos campos da interface
+            enfileirado_em (float): time.perf_counter() no envio à fila (mede a espera)
             
-            # Definir entradas do sistema com a nota ajustada
-            sistema.input['nota'] = nota_ajustada
-            sistema.input['frequencia'] = dados.get('frequência', 0)
-            sistema.input['participacao'] = dados.get('participação', 0)
-            sistema.input['socioemocional'] = dados.get('habilidades_socioemocionais', 0)
-            sistema.input['contexto'] = dados.get('contexto_socioeconômico', 0)
-            sistema.input['motivacao'] = dados.get('motivacao', 0)  # Já convertido para o valor numérico correspondente
+        Returns:
+            dict: Dados da avaliação para exibição
+        """
+        if enfileirado_em is not None and instrumentacao.ativa():
+            instrumentacao.registrar("espera_na_fila", time.perf_counter() - enfileirado_em)
+        motivacao_valor = dados['motivacao_valor']
+        perfil_aluno = dados['perfil_aluno']
+        metodo_ensino = dados['metodo_ensino']
+        avisos = []
+        
+        # Calcular média das notas para usar no sistema fuzzy
+        nota_media = calcular_nota_media(dados.get('nota_da_primeira_avaliação_teórica', 0),
+                                         dados.get('nota_da_segunda_avaliação_teórica', 0),
+                                         dados.get('nota_da_avaliação_prática', 0),
+                                         dados.get('nota_da_avaliação_em_grupo', 0))
+        dados['nota'] = nota_media
+        
+        # Ajustar nota baseado na compatibilidade
+        with etapa("ajuste_nota"):
+            nota_ajustada = ajustar_nota(nota_media, perfil_aluno, metodo_ensino)
+        
+        # Definir entradas do sistema com a nota ajustada
+        entradas = {
+            'nota': nota_ajustada,
+            'frequencia': dados.get('frequência', 0),
+            'participacao': dados.get('participação', 0),
+            'socioemocional': dados.get('habilidades_socioemocionais', 0),
+            'contexto': dados.get('contexto_socioeconômico', 0),
+            'motivacao': dados.get('motivacao', 0)  # Já convertido para o valor numérico correspondente
+        }
 
-            # Verificação para notas mínimas
-            todas_minimas = (
-                nota_ajustada <= 1.0 and
-                dados.get('frequência', 0) <= 20 and
-                dados.get('participação', 0) <= 1.0 and
-                dados.get('habilidades_socioemocionais', 0) <= 1.0 and
-                dados.get('contexto_socioeconômico', 0) <= 1.0 and
-                motivacao_valor == "Baixa"  # Usar o texto em vez do valor numérico
-            )
-            
-            # Verificação para notas máximas
-            todas_maximas = (
-                nota_ajustada >= 9.7 and
-                dados.get('frequência', 0) >= 97 and
-                dados.get('participação', 0) >= 9.7 and
-                dados.get('habilidades_socioemocionais', 0) >= 9.7 and
-                dados.get('contexto_socioeconômico', 0) >= 9.7 and
-                motivacao_valor == "Alta"  # Usar o texto em vez do valor numérico
-            )
+        # Verificação para notas mínimas e máximas
+        todas_maximas, todas_minimas = verificar_casos_extremos(
+            nota_ajustada,
+            dados.get('frequência', 0),
+            dados.get('participação', 0),
+            dados.get('habilidades_socioemocionais', 0),
+            dados.get('contexto_socioeconômico', 0),
+            motivacao_valor
+        )
 
-            # Calcular resultado
+        # Calcular resultado (resultado, rastro e base de regras vêm do mesmo sistema,
+        # mesmo que a base seja recarregada durante a avaliação)
+        with self.trava_sistema:
             try:
-                sistema.compute()
-                # Obter o resultado
-                resultado = sistema.output['desempenho']
-                
-                # Forçar valores para casos extremos
-                if todas_maximas:
-                    resultado = 100.0  # Forçar resultado 100 quando todas as notas são máximas
-                elif todas_minimas:
-                    resultado = 0.0    # Forçar resultado 0 quando todas as notas são mínimas
-                
+                with etapa("inferencia"):
+                    resultado = self.calcular_desempenho(entradas)
             except Exception as e:
                 # Se houver erro na computação, usar um valor padrão baseado nas notas
-                messagebox.showwarning("Aviso", "Ocorreu um erro no cálculo fuzzy. Usando método alternativo.")
-                # Método alternativo simples baseado em média ponderada
-                # Converter motivação para valor ponderado baseado no texto
-                peso_motivacao = {"Alta": 0.9, "Média": 0.5, "Baixa": 0.2}.get(motivacao_valor, 0.5)
-                
-                resultado = (nota_ajustada * 0.4 + 
-                            dados.get('frequência', 0) * 0.15 / 10 + 
-                            dados.get('participação', 0) * 0.15 + 
-                            dados.get('habilidades_socioemocionais', 0) * 0.1 + 
-                            dados.get('contexto_socioeconômico', 0) * 0.1 + 
-                            (10 * peso_motivacao) * 0.1) * 10  # Usando a ponderação de motivação
-                
-                # Aplicar os valores forçados mesmo no método alternativo
-                if todas_maximas:
-                    resultado = 100.0
-                elif todas_minimas:
-                    resultado = 0.0
-            
-            # Certificar-se de que o resultado está dentro dos limites
-            resultado = max(0, min(100, resultado))
-            
-            # Classificar o resultado com categorias atualizadas
-            if resultado < 30:
-                classificacao = "Insuficiente"
-            elif resultado < 45:
-                classificacao = "Regular com dificuldades"
-            elif resultado < 60:
-                classificacao = "Regular com potencial"
-            elif resultado < 75:
-                classificacao = "Bom com superação"
-            else:
-                classificacao = "Excelente com equilíbrio"
-            
-            # Exibir resultado
-            self.resultado_texto.delete(1.0, tk.END)
-            self.resultado_texto.insert(tk.END, f"Aluno: {dados.get('nome_do_aluno')}\n")
-            self.resultado_texto.insert(tk.END, f"Matrícula: {dados.get('matrícula')}\n\n")
-            
-            # Mostrar ajuste de compatibilidade
-            self.resultado_texto.insert(tk.END, 
-            f"Compatibilidade: {perfil_aluno} (aluno) × {metodo_ensino} (método)\n"
-            f"Nota média das avaliações: {nota_media:.1f} → Nota ajustada: {nota_ajustada:.1f}\n\n")
+                avisos.append("Ocorreu um erro no cálculo fuzzy. Usando método alternativo.")
+                resultado = desempenho_alternativo(
+                    nota_ajustada,
+                    dados.get('frequência', 0),
+                    dados.get('participação', 0),
+                    dados.get('habilidades_socioemocionais', 0),
+                    dados.get('contexto_socioeconômico', 0),
+                    motivacao_valor
+                )
             
-            self.resultado_texto.insert(tk.END, f"Resultado da avaliação fuzzy: {resultado:.2f}/100\n")
-            self.resultado_texto.insert(tk.END, f"Classificação: {classificacao}\n\n")
-            
-            # Adicionar análise personalizada
-            adicionar_analise_personalizada(self.resultado_texto, dados, resultado, classificacao)
-            
-            # Exibir gráfico
+            # Cortes da saída e forças das regras: gravados no histórico, permitem exibir
+            # a avaliação de novo sem passar pela inferência
+            with etapa("rastro"):
+                rastro = self.sistema_compilado.rastro(**entradas)[0]
+            base_regras = self.base_regras
+        
+        # Forçar valores para casos extremos e manter o resultado dentro dos limites
+        resultado = aplicar_casos_extremos(resultado, todas_maximas, todas_minimas)
+        
+        # Classificar o resultado com categorias atualizadas
+        classificacao = classificar_desempenho(resultado)
+        
+        # Salvar no histórico (incluindo perfil e método)
+        dados_historico = {
+            **dados,
+            'perfil_aluno': perfil_aluno,
+            'metodo_ensino': metodo_ensino,
+            'nota_ajustada': nota_ajustada,
+            'desempenho': resultado,
+            'classificacao': classificacao,
+            'base_regras': base_regras,
+            'rastro': rastro
+        }
+        
+        salvo = True
+        try:
+            with etapa("historico"):
+                salvar_historico(dados_historico)
+        except Exception as e:
+            salvo = False
+            avisos.append(f"Erro ao salvar histórico: {str(e)}")
+        
+        return {
+            'dados': dados,
+            'dados_historico': dados_historico,
+            'nota_media': nota_media,
+            'nota_ajustada': nota_ajustada,
+            'resultado': resultado,
+            'classificacao': classificacao,
+            'base_regras': base_regras,
+            'rastro': rastro,
+            'salvo': salvo,
+            'avisos': avisos,
+            'enfileirado_em': enfileirado_em
+        }
+    
+    def verificar_resultados(self):
+        """Exibe as avaliações concluídas (executado periodicamente na thread do Tk)"""
+        while True:
             try:
-                self.exibir_grafico(sistema)
-            except Exception as e:
-                messagebox.showwarning("Aviso", f"Erro ao exibir o gráfico: {str(e)}")
-            
-            # Salvar no histórico (incluindo perfil e método)
-            dados_historico = {
-                **dados,
-                'perfil_aluno': perfil_aluno,
-                'metodo_ensino': metodo_ensino,
-                'nota_ajustada': nota_ajustada,
-                'desempenho': resultado,
-                'classificacao': classificacao
-            }
+                futuro = self.resultados_prontos.get_nowait()
+            except queue.Empty:
+                break
             
-            # Salvar histórico e adicionar ao treeview
+            self.avaliacoes_pendentes.remove(futuro)
+            if futuro.cancelled():
+                continue
             try:
-                salvar_historico(dados_historico)
-                self.adicionar_ao_treeview(dados_historico)
+                self.exibir_avaliacao(futuro.result())
             except Exception as e:
-                messagebox.showwarning("Aviso", f"Erro ao salvar histórico: {str(e)}")
-            
-            # Alternar para a aba de resultados
-            self.notebook.select(self.tab_resultados)
-            
+                messagebox.showerror("Erro", f"Ocorreu um erro durante a avaliação: {str(e)}")
+        
+        self.atualizar_progresso()
+        if self.avaliacoes_pendentes:
+            self.root.after(50, self.verificar_resultados)
+        else:
+            self.verificando_resultados = False
+    
+    def exibir_avaliacao(self, avaliacao):
+        """
+        Exibe o resultado de uma avaliação concluída
+        
+        Args:
+            avaliacao (dict): Resultado de processar_avaliacao
+        """
+        dados = avaliacao['dados']
+        resultado = avaliacao['resultado']
+        classificacao = avaliacao['classificacao']
+        
+        for aviso in avaliacao['avisos']:
+            messagebox.showwarning("Aviso", aviso)
+        
+        # Exibir resultado
+        self.resultado_texto.delete(1.0, tk.END)
+        self.resultado_texto.insert(tk.END, f"Aluno: {dados.get('nome_do_aluno')}\n")
+        self.resultado_texto.insert(tk.END, f"Matrícula: {dados.get('matrícula')}\n\n")
+        
+        # Mostrar ajuste de compatibilidade
+        self.resultado_texto.insert(tk.END, 
+        f"Compatibilidade: {dados['perfil_aluno']} (aluno) × {dados['metodo_ensino']} (método)\n"
+        f"Nota média das avaliações: {avaliacao['nota_media']:.1f} → "
+        f"Nota ajustada: {avaliacao['nota_ajustada']:.1f}\n\n")
+        
+        self.resultado_texto.insert(tk.END, f"Resultado da avaliação fuzzy: {resultado:.2f}/100\n")
+        self.resultado_texto.insert(tk.END, f"Classificação: {classificacao}\n\n")
+        
+        # A base de regras pode ter sido recarregada desde a avaliação
+        rastro = self.rastro_exibivel(avaliacao['base_regras'], avaliacao['rastro'])
+        self.inserir_regras_ativadas(rastro)
+        
+        # Adicionar análise personalizada
+        with etapa("analise_personalizada"):
+            adicionar_analise_personalizada(self.resultado_texto, dados, resultado, classificacao)
+        
+        # Exibir gráfico
+        try:
+            with etapa("grafico"):
+                self.exibir_grafico(resultado, rastro)
         except Exception as e:
-            messagebox.showerror("Erro", f"Ocorreu um erro durante a avaliação: {str(e)}")
-            # Registrar detalhes do erro para debugging
-            print(f"Erro detalhado: {str(e)}")
-    
-    def exibir_grafico(self, sistema):
-        """Exibe o gráfico do desempenho fuzzy com as funções de pertinência otimizadas"""
-        # Limpar o frame de gráfico
-        for widget in self.frame_grafico.winfo_children():
-            widget.destroy()
-        
-        # Criar a figura para o gráfico
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 8))
-        
-        # === GRÁFICO 1: FUNÇÕES DE PERTINÊNCIA DA SAÍDA ===
-        # Plotar as funções de pertinência para o desempenho
-        x_desempenho = np.arange(0, 100.1, 0.1)
-        
-        # Utilizar as novas funções de pertinência
-        y_insuficiente = fuzz.interp_membership(self.desempenho.universe, 
-                                        self.desempenho['insuficiente'].mf, 
-                                        x_desempenho)
-        y_regular_dif = fuzz.interp_membership(self.desempenho.universe, 
-                                        self.desempenho['regular_com_dificuldades'].mf, 
-                                        x_desempenho)
-        y_regular_pot = fuzz.interp_membership(self.desempenho.universe, 
-                                        self.desempenho['regular_com_potencial'].mf, 
-                                        x_desempenho)
-        y_bom = fuzz.interp_membership(self.desempenho.universe, 
-                                    self.desempenho['bom_com_superacao'].mf, 
-                                    x_desempenho)
-        y_excelente = fuzz.interp_membership(self.desempenho.universe, 
-                                        self.desempenho['excelente_com_equilibrio'].mf, 
-                                        x_desempenho)
-        
-        # Plotar as curvas com cores diferentes
-        ax1.plot(x_desempenho, y_insuficiente, 'r', linewidth=2, label='Insuficiente')
-        ax1.plot(x_desempenho, y_regular_dif, 'orange', linewidth=2, label='Regular com dificuldades')
-        ax1.plot(x_desempenho, y_regular_pot, 'y', linewidth=2, label='Regular com potencial')
-        ax1.plot(x_desempenho, y_bom, 'g', linewidth=2, label='Bom com superação')
-        ax1.plot(x_desempenho, y_excelente, 'b', linewidth=2, label='Excelente com equilíbrio')
-        
-        # Marcar o resultado
-        resultado = sistema.output['desempenho']
-        ax1.axvline(x=resultado, color='k', linestyle='--', alpha=0.7, label=f'Resultado: {resultado:.1f}')
-        
-        # Configurar o gráfico
-        ax1.set_title('Avaliação de Desempenho Fuzzy')
-        ax1.set_xlabel('Nível de Desempenho')
-        ax1.set_ylabel('Grau de Pertinência')
-        ax1.grid(True, linestyle='--', alpha=0.7)
-        
-        # AQUI A GRANDE MODIFICAÇÃO: Mover a legenda para o lado direito do gráfico
-        ax1.legend(loc='center left', bbox_to_anchor=(1.02, 0.5), ncol=1)
-        
-        # === GRÁFICO 2: VISUALIZAÇÃO DO RESULTADO ===
-        # Criar um gráfico de barras para mostrar o grau de pertinência do resultado em cada categoria
-        categorias = ['Insuficiente', 'Regular com\ndificuldades', 'Regular com\npotencial', 'Bom com\nsuperação', 'Excelente com\nequilíbrio']
-        
-        # Calcular o grau de pertinência do resultado em cada categoria
-        graus = [
-            fuzz.interp_membership(self.desempenho.universe, self.desempenho['insuficiente'].mf, resultado),
-            fuzz.interp_membership(self.desempenho.universe, self.desempenho['regular_com_dificuldades'].mf, resultado),
-            fuzz.interp_membership(self.desempenho.universe, self.desempenho['regular_com_potencial'].mf, resultado),
-            fuzz.interp_membership(self.desempenho.universe, self.desempenho['bom_com_superacao'].mf, resultado),
-            fuzz.interp_membership(self.desempenho.universe, self.desempenho['excelente_com_equilibrio'].mf, resultado)
-        ]
+            messagebox.showwarning("Aviso", f"Erro ao exibir o gráfico: {str(e)}")
         
-        cores = ['red', 'orange', 'yellow', 'green', 'blue']
+        # Adicionar ao treeview o que foi gravado no histórico
+        if avaliacao['salvo']:
+            self.adicionar_ao_treeview(avaliacao['dados_historico'])
         
-        # Criar o gráfico de barras
-        barras = ax2.bar(categorias, graus, color=cores, alpha=0.7)
+        # Alternar para a aba de resultados
+        self.notebook.select(self.tab_resultados)
+        
+        # Do envio à fila até o resultado na tela
+        if avaliacao.get('enfileirado_em') is not None and instrumentacao.ativa():
+            instrumentacao.registrar("avaliacao_completa", time.perf_counter() - avaliacao['enfileirado_em'])
+    
+    def atualizar_progresso(self):
+        """Atualiza a barra e o texto de progresso da fila de avaliações"""
+        pendentes = len(self.avaliacoes_pendentes)
+        self.barra_progresso.configure(maximum=max(self.total_lote, 1), value=self.total_lote - pendentes)
+        if pendentes:
+            self.rotulo_progresso.config(
+                text=f"Avaliando {self.total_lote - pendentes + 1} de {self.total_lote}...")
+            self.botao_cancelar.state(["!disabled"])
+        else:
+            self.rotulo_progresso.config(text="")
+            self.botao_cancelar.state(["disabled"])
+    
+    def cancelar_fila(self):
+        """Cancela as avaliações que ainda não começaram (a que está em andamento termina)"""
+        for futuro in list(self.avaliacoes_pendentes):
+            futuro.cancel()
+        self.atualizar_progresso()
+    
+    def abrir_painel_depuracao(self):
+        """Abre (ou traz para frente) a janela com os tempos por etapa da instrumentação"""
+        if self.painel_depuracao is not None and self.painel_depuracao.winfo_exists():
+            self.painel_depuracao.lift()
+            return
         
-        # Adicionar valores nas barras
-        for i, barra in enumerate(barras):
-            altura = barra.get_height()
-            ax2.text(barra.get_x() + barra.get_width()/2., 
-                    altura + 0.02, 
-                    f'{graus[i]:.2f}', 
-                    ha='center', va='bottom', 
-                    fontweight='bold')
+        janela = tk.Toplevel(self.root)
+        janela.title("Depuração - tempos por etapa")
+        janela.geometry("760x320")
+        self.painel_depuracao = janela
         
-        # Configurar o gráfico
-        ax2.set_title(f'Grau de Pertinência do Resultado ({resultado:.1f}) em Cada Categoria')
-        ax2.set_ylabel('Grau de Pertinência')
-        ax2.set_ylim(0, 1.1)  # Para dar espaço para os textos
-        ax2.grid(True, linestyle='--', alpha=0.3, axis='y')
+        frame_controles = ttk.Frame(janela)
+        frame_controles.pack(fill="x", padx=10, pady=5)
+        self.instrumentacao_ativa = tk.BooleanVar(value=instrumentacao.ativa())
+        ttk.Checkbutton(frame_controles, text="Instrumentação ativa", variable=self.instrumentacao_ativa,
+                        command=self.alternar_instrumentacao).pack(side="left")
+        ttk.Button(frame_controles, text="Exportar...", command=self.exportar_metricas).pack(side="right", padx=5)
+        ttk.Button(frame_controles, text="Zerar", command=instrumentacao.zerar).pack(side="right", padx=5)
         
-        # Ajuste de layout para dar espaço à legenda no lado direito
-        plt.subplots_adjust(right=0.8)
-        fig.tight_layout(pad=3.0, rect=[0, 0, 0.85, 1])
+        colunas = ("Etapa", "Chamadas", "Média (ms)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Máximo (ms)")
+        self.tabela_depuracao = ttk.Treeview(janela, columns=colunas, show="headings")
+        for coluna in colunas:
+            self.tabela_depuracao.heading(coluna, text=coluna)
+            self.tabela_depuracao.column(coluna, width=160 if coluna == "Etapa" else 90,
+                                         anchor="w" if coluna == "Etapa" else "e")
+        self.tabela_depuracao.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        self.atualizar_painel_depuracao()
+    
+    def atualizar_painel_depuracao(self):
+        """Preenche a tabela do painel de depuração (periodicamente, enquanto a janela existir)"""
+        if self.painel_depuracao is None or not self.painel_depuracao.winfo_exists():
+            self.painel_depuracao = None
+            return
+        
+        self.tabela_depuracao.delete(*self.tabela_depuracao.get_children())
+        for nome, medidas in instrumentacao.resumo().items():
+            self.tabela_depuracao.insert("", "end", values=(
+                nome, medidas['chamadas'],
+                *(f"{medidas[chave] * 1000:.3f}" for chave in ('media', 'p50', 'p95', 'p99', 'maximo'))))
+        self.root.after(INTERVALO_PAINEL_DEPURACAO, self.atualizar_painel_depuracao)
+    
+    def alternar_instrumentacao(self):
+        if self.instrumentacao_ativa.get():
+            instrumentacao.ativar()
+        else:
+            instrumentacao.desativar()
+    
+    def exportar_metricas(self):
+        """Grava as medições atuais em JSON ou no formato de texto do Prometheus"""
+        from tkinter import filedialog
+        arquivo = filedialog.asksaveasfilename(
+            parent=self.painel_depuracao, defaultextension=".json", initialfile="metricas_avaliacao.json",
+            filetypes=[("JSON", "*.json"), ("Prometheus", "*.prom")])
+        if not arquivo:
+            return
+        try:
+            instrumentacao.exportar(arquivo)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Erro ao exportar as métricas: {str(e)}", parent=self.painel_depuracao)
+    
+    def calcular_desempenho(self, entradas):
+        """
+        Calcula o desempenho fuzzy, reaproveitando resultados em cache
+        
+        Args:
+            entradas (dict): Valor de cada antecedente do sistema fuzzy
+            
+        Returns:
+            float: Desempenho defuzzificado (0-100)
+        """
+        return self.cache.avaliar(**entradas)
+    
+    def inferir_desempenho(self, **entradas):
+        """Executa a inferência fuzzy com o motor configurado (sem cache)"""
+        if self.motor == "compilado":
+            # Mesmo cálculo de SistemaCompilado.avaliar, em duas etapas medidas separadamente
+            with etapa("fuzzificacao_e_regras"):
+                cortes = self.sistema_compilado.ativacoes(**entradas)
+            with etapa("defuzzificacao"):
+                resultado = float(self.sistema_compilado.defuzzificar(cortes)[0])
+            if np.isnan(resultado):
+                raise ValueError("Nenhuma regra fuzzy foi ativada.")
+            return resultado
+        
+        # Instanciar o sistema de controle fuzzy (compute() faz regras e defuzzificação juntas)
+        from skfuzzy import control as ctrl
+        sistema = ctrl.ControlSystemSimulation(self.sistema_ctrl)
+        sistema.inputs(entradas)
+        with etapa("compute_skfuzzy"):
+            sistema.compute()
+        return sistema.output['desempenho']
+    
+    def exibir_grafico(self, resultado, rastro=None):
+        """
+        Exibe o gráfico do desempenho fuzzy com as funções de pertinência otimizadas
+        
+        Args:
+            resultado (float): Desempenho (0-100)
+            rastro (np.ndarray): Rastro da inferência (SistemaCompilado.rastro) para desenhar
+                a saída agregada; None a omite
+        """
+        from modules.grafico import atualizar_grafico, redesenhar_dinamicos
+        
+        if self.grafico is None:
+            self.criar_grafico()
+        
+        # Grau de pertinência do resultado em cada categoria
+        graus = self.sistema_compilado.graus_categorias(resultado)
+        agregada = None
+        if rastro is not None:
+            agregada = self.sistema_compilado.saida_agregada(rastro[:len(self.sistema_compilado.termos_saida)])
+        atualizar_grafico(self.grafico, resultado, graus, agregada)
+        redesenhar_dinamicos(self.grafico, self.grafico['canvas'])
+    
+    def rastro_exibivel(self, base_regras, rastro):
+        """
+        Confere se um rastro da inferência corresponde à base de regras atual
+        
+        Args:
+            base_regras (str): Base de regras que gerou o rastro
+            rastro (np.ndarray): Rastro gravado (None se não houver)
+            
+        Returns:
+            np.ndarray: O rastro, ou None se ele vier de outra base de regras
+        """
+        sistema = self.sistema_compilado
+        if rastro is None or sistema is None or base_regras != self.base_regras:
+            return None
+        if len(rastro) != len(sistema.termos_saida) + len(sistema.regras):
+            return None
+        return rastro
+    
+    def inserir_regras_ativadas(self, rastro):
+        """Lista no resultado as regras de maior força de disparo registradas no rastro"""
+        if rastro is None:
+            return
+        forcas = rastro[len(self.sistema_compilado.termos_saida):]
+        ordem = [indice for indice in np.argsort(-forcas, kind="stable")[:REGRAS_EXIBIDAS] if forcas[indice] > 0]
+        if not ordem:
+            return
+        self.resultado_texto.insert(tk.END, "Regras mais ativadas:\n")
+        for indice in ordem:
+            self.resultado_texto.insert(tk.END, f"• {self.sistema_compilado.regras[indice]} ({forcas[indice]:.2f})\n")
+        self.resultado_texto.insert(tk.END, "\n")
+    
+    def criar_grafico(self):
+        """Monta a figura do gráfico de desempenho (modules.grafico) e o canvas da interface"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from modules.grafico import capturar_fundo, montar_grafico
+        
+        grafico = montar_grafico(self.sistema_compilado)
         
         # Adicionar o gráfico à interface
-        canvas = FigureCanvasTkAgg(fig, master=self.frame_grafico)
-        canvas.draw()
+        canvas = FigureCanvasTkAgg(grafico['figura'], master=self.frame_grafico)
         canvas.get_tk_widget().pack(fill='both', expand=True)
+        grafico['canvas'] = canvas
+        self.grafico = grafico
+        
+        # Cada desenho completo (primeira exibição, redimensionamento) renova o fundo
+        canvas.mpl_connect('draw_event', lambda evento: capturar_fundo(grafico, canvas))
     
     def adicionar_ao_treeview(self, dados):
-        """Adiciona um registro ao treeview"""
-        # Usando apenas campos que existem nos dados
-        valores = [
-            dados.get('matrícula', ''),
-            dados.get('nome_do_aluno', ''),
-            str(dados.get('nota_da_primeira_avaliação_teórica', 0)),
-            str(dados.get('nota_da_segunda_avaliação_teórica', 0)),
-            str(dados.get('nota_da_avaliação_prática', 0)),
-            str(dados.get('nota_da_avaliação_em_grupo', 0)),
-            str(dados.get('frequência', 0)),
-            str(dados.get('participação', 0)),
-            str(dados.get('habilidades_socioemocionais', 0)),
-            str(dados.get('contexto_socioeconômico', 0)),
-            str(dados.get('motivação', 0)),
-            dados.get('motivacao_valor', ''),
-            str(dados.get('desempenho', 0)),
-            dados.get('classificacao', '')
-        ]
-        self.treeview.insert('', 'end', values=valores)
+        """Adiciona ao treeview um registro que acabou de ser gravado no histórico"""
+        # A contagem vem do histórico (que já inclui o novo registro), não de um contador local
+        self.total_registros = contar_registros()
+        posicao = self.total_registros - 1
+        if not self.pagina_carregada:
+            # Nenhuma página exibida ainda: carrega do histórico a página do novo registro
+            self.exibir_pagina(posicao)
+            return
+        # Só entra no treeview se a nova última linha cair na página exibida
+        if self.inicio_pagina <= posicao < self.inicio_pagina + TAMANHO_PAGINA:
+            self.inserir_no_treeview(montar_registro(dados))
+        self.atualizar_rotulo_pagina()
     
-    def carregar_historico(self):
-        """Carrega o histórico do arquivo CSV para o treeview"""
-        # Limpar o treeview
-        for item in self.treeview.get_children():
-            self.treeview.delete(item)
+    def inserir_no_treeview(self, registro):
+        """
+        Insere um registro do histórico no treeview, guardando as colunas não exibidas
         
-        # Carregar e exibir histórico
+        Args:
+            registro (dict): Valores indexados pelos nomes de COLUNAS_HISTORICO
+        """
+        valores = ["" if registro[coluna] is None else str(registro[coluna]) for coluna in COLUNAS_TREEVIEW]
+        item = self.treeview.insert('', 'end', values=valores)
+        self.registros_treeview[item] = registro
+    
+    def carregar_historico(self):
+        """Carrega a primeira página do histórico para o treeview"""
         try:
-            registros = carregar_historico_para_treeview()
-            for registro in registros:
-                self.treeview.insert('', 'end', values=registro)
+            self.total_registros = contar_registros()
+            if self.total_registros == 0:
+                self.exibir_pagina(0)
+                messagebox.showwarning("Aviso", "Nenhum histórico encontrado.")
+                return
             
-            messagebox.showinfo("Sucesso", f"Histórico carregado com {len(registros)} registros.")
+            self.exibir_pagina(0)
+            messagebox.showinfo("Sucesso", f"Histórico carregado com {self.total_registros} registros.")
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar o histórico: {str(e)}")
-
+    
+    def exibir_pagina(self, inicio):
+        """
+        Substitui o conteúdo do treeview por uma página do histórico
+        
+        Args:
+            inicio (int): Posição do primeiro registro da página
+        """
+        ultima = max(self.total_registros - 1, 0) // TAMANHO_PAGINA * TAMANHO_PAGINA
+        self.inicio_pagina = min(max(inicio, 0), ultima)
+        
+        self.treeview.delete(*self.treeview.get_children())
+        self.registros_treeview.clear()
+        for registro in carregar_pagina(self.inicio_pagina, TAMANHO_PAGINA):
+            self.inserir_no_treeview(dict(zip(COLUNAS_HISTORICO, registro)))
+        self.pagina_carregada = True
+        self.atualizar_rotulo_pagina()
+    
+    def atualizar_rotulo_pagina(self):
+        """Atualiza o intervalo exibido e habilita os botões de navegação"""
+        if self.total_registros == 0:
+            self.rotulo_pagina.config(text="Nenhum registro carregado")
+        else:
+            fim = min(self.inicio_pagina + TAMANHO_PAGINA, self.total_registros)
+            self.rotulo_pagina.config(
+                text=f"Registros {self.inicio_pagina + 1}–{fim} de {self.total_registros}")
+        
+        tem_anterior = self.inicio_pagina > 0
+        tem_proxima = self.inicio_pagina + TAMANHO_PAGINA < self.total_registros
+        self.botao_anterior.state(["!disabled"] if tem_anterior else ["disabled"])
+        self.botao_proxima.state(["!disabled"] if tem_proxima else ["disabled"])
+    
+    def pagina_anterior(self):
+        self.exibir_pagina(self.inicio_pagina - TAMANHO_PAGINA)
+    
+    def proxima_pagina(self):
+        self.exibir_pagina(self.inicio_pagina + TAMANHO_PAGINA)
+    
+    def rolar_historico(self, event):
+        """Passa para a página vizinha quando a rolagem chega ao fim ou ao início da página"""
+        para_baixo = event.num == 5 or getattr(event, "delta", 0) < 0
+        topo, fundo = self.treeview.yview()
+        
+        if para_baixo and fundo >= 1.0 and self.inicio_pagina + TAMANHO_PAGINA < self.total_registros:
+            self.proxima_pagina()
+            self.treeview.yview_moveto(0)
+            return "break"
+        if not para_baixo and topo <= 0.0 and self.inicio_pagina > 0:
+            self.pagina_anterior()
+            self.treeview.yview_moveto(1)
+            return "break"
+    
     def mostrar_aluno_selecionado(self, event=None):
-        """Exibe os resultados do aluno selecionado no histórico"""
+        """
+        Exibe os resultados do aluno selecionado no histórico, sem recalculá-los
+        """
         # Obter item selecionado
         item_selecionado = self.treeview.selection()
         if not item_selecionado:
             return  # Nada selecionado
         
-        # Obter dados do item selecionado
-        item = self.treeview.item(item_selecionado[0])
-        valores = item['values']
+        # Obter o registro completo do item selecionado
+        registro = self.registros_treeview.get(item_selecionado[0])
         
-        if not valores or len(valores) < 14:
+        if registro is None:
             messagebox.showerror("Erro", "Dados do aluno incompletos.")
             return
         
         # Extrair os dados
         try:
             # Dados do aluno
-            matricula = valores[0]
-            nome_aluno = valores[1]
-            nota_teoria1 = float(valores[2])
-            nota_teoria2 = float(valores[3])
-            nota_pratica = float(valores[4])
-            nota_grupo = float(valores[5])
-            frequencia = float(valores[6])
-            participacao = float(valores[7])
-            socioemocional = float(valores[8])
-            contexto = float(valores[9])
-            motivacao = float(valores[10])
-            motivacao_cat = valores[11]
-            desempenho = float(valores[12])
-            classificacao = valores[13]
+            matricula = registro["Matricula"]
+            nome_aluno = registro["Nome"]
+            nota_teoria1 = float(registro["Nota_Teoria1"])
+            nota_teoria2 = float(registro["Nota_Teoria2"])
+            nota_pratica = float(registro["Nota_Pratica"])
+            nota_grupo = float(registro["Nota_Grupo"])
+            frequencia = float(registro["Frequencia"])
+            participacao = float(registro["Participacao"])
+            socioemocional = float(registro["Socioemocional"])
+            contexto = float(registro["Contexto"])
+            motivacao = float(registro["Motivacao"])
+            motivacao_cat = registro["Motivacao_Cat"]
+            desempenho = float(registro["Desempenho"])
+            classificacao = registro["Classificacao"]
             
             # Calcular nota média
-            nota_media = (nota_teoria1 + nota_teoria2 + nota_pratica + nota_grupo) / 4
+            nota_media = calcular_nota_media(nota_teoria1, nota_teoria2, nota_pratica, nota_grupo)
+            # Registros de versões anteriores não têm a nota ajustada
+            try:
+                nota_ajustada = float(registro.get("Nota_Ajustada"))
+            except (TypeError, ValueError):
+                nota_ajustada = np.nan
             
             # Exibir resultado no texto
             self.resultado_texto.delete(1.0, tk.END)
@@ -542,10 +984,18 @@ class AvaliacaoFuzzyApp:
             self.resultado_texto.insert(tk.END, f"Matrícula: {matricula}\n\n")
             
             # Mostrar principais dados (como na função avaliar_aluno)
-            self.resultado_texto.insert(tk.END, f"Nota média das avaliações: {nota_media:.1f}\n\n")
+            if np.isnan(nota_ajustada):
+                self.resultado_texto.insert(tk.END, f"Nota média das avaliações: {nota_media:.1f}\n\n")
+            else:
+                self.resultado_texto.insert(tk.END, f"Nota média das avaliações: {nota_media:.1f} → "
+                                                    f"Nota ajustada: {nota_ajustada:.1f}\n\n")
             self.resultado_texto.insert(tk.END, f"Resultado da avaliação fuzzy: {desempenho:.2f}/100\n")
             self.resultado_texto.insert(tk.END, f"Classificação: {classificacao}\n\n")
             
+            # Inferência gravada com o registro (ignorada se veio de outra base de regras)
+            rastro = self.rastro_exibivel(registro.get("Base_Regras"), decodificar_rastro(registro.get("Rastro")))
+            self.inserir_regras_ativadas(rastro)
+            
             # Reconstruir dados para análise personalizada
             dados = {
                 'matrícula': matricula,
@@ -558,7 +1008,8 @@ class AvaliacaoFuzzyApp:
                 'participação': participacao,
                 'habilidades_socioemocionais': socioemocional,
                 'contexto_socioeconômico': contexto,
-                'motivação': motivacao
+                'motivacao': motivacao,
+                'motivacao_valor': motivacao_cat
             }
             
             # Adicionar análise personalizada
@@ -567,22 +1018,9 @@ class AvaliacaoFuzzyApp:
             # Mudar para a aba de resultados
             self.notebook.select(self.tab_resultados)
             
-            # Exibir gráfico
-            # Como não temos o sistema.compute() aqui, vamos simular o resultado
-            from skfuzzy import control as ctrl
-            sistema = ctrl.ControlSystemSimulation(self.sistema_ctrl)
-            sistema.input['nota'] = nota_media
-            sistema.input['frequencia'] = frequencia
-            sistema.input['participacao'] = participacao
-            sistema.input['socioemocional'] = socioemocional
-            sistema.input['contexto'] = contexto
-            sistema.input['motivacao'] = motivacao
-            sistema.compute()
-            # Substituir pelo valor real do histórico
-            sistema.output['desempenho'] = desempenho
-            
-            # Exibir o gráfico
-            self.exibir_grafico(sistema)
+            # Exibir o gráfico com o valor real do histórico (se o sistema fuzzy já estiver pronto)
+            if self.sistema_compilado is not None:
+                self.exibir_grafico(desempenho, rastro)
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao processar dados do aluno: {str(e)}")
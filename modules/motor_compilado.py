@@ -0,0 +1,631 @@
+import hashlib
+import itertools
+import json
+import os
+import stat
+import zipfile
+from importlib import metadata
+
+import numpy as np
+
+from modules.defuzzificacao import METODOS_ANALITICOS, defuzzificar_analitico, pontos_criticos_estaticos
+
+# O scikit-fuzzy (e modules.fuzzy_logic) só é importado para compilar; carregar um
+# sistema do cache em disco e avaliá-lo não depende dele.
+
+# Diretório de cache do usuário (%LOCALAPPDATA%, $XDG_CACHE_HOME ou ~/.cache)
+DIRETORIO_CACHE = os.path.join(os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+                               or os.path.join(os.path.expanduser("~"), ".cache"), "avaliacao_fuzzy")
+
+# Cache em disco dos sistemas compilados (ver carregar_sistema): tabelas NumPy e um
+# índice JSON em um .npz, lido sem pickle
+ARQUIVO_CACHE_SISTEMA = os.path.join(DIRETORIO_CACHE, "sistema_compilado.npz")
+
+# Tabelas NumPy de SistemaCompilado gravadas no cache (os demais atributos vão no índice JSON)
+_TABELAS_CACHE = ("limites", "termo_variavel", "pontos", "clausulas", "clausula_regra", "clausula_saida",
+                  "clausula_peso", "pontos_saida", "universo_saida", "mfs_saida")
+
+# Bases de regras diferentes mantidas no cache (as usadas há mais tempo são descartadas)
+MAXIMO_BASES_CACHE = 4
+
+# Definição padrão da base de regras (variáveis, pertinências, regras e pesos), neste diretório;
+# também é o padrão de modules.fuzzy_logic
+ARQUIVO_REGRAS_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regras_padrao.json")
+
+# Fontes que interpretam a definição e definem o formato compilado
+_FONTES_SISTEMA = ("fuzzy_logic.py", "motor_compilado.py", "defuzzificacao.py")
+
+
+class SistemaCompilado:
+    """
+    Versão "achatada" de um ctrl.ControlSystem para avaliação rápida
+
+    Atributos:
+        variaveis (tuple): Rótulos dos antecedentes, na ordem das colunas
+        limites (np.ndarray): Matriz (n_variaveis, 2) com mínimo e máximo de cada universo
+        termos (tuple): Pares (variável, termo) de todos os termos dos antecedentes
+        termo_variavel (np.ndarray): Índice da variável de cada termo
+        pontos (np.ndarray): Matriz (n_termos, 4) com os pontos [a, b, c, d] de cada termo
+        clausulas (np.ndarray): Matriz (n_clausulas, n_literais) de índices de literais
+        clausula_regra (np.ndarray): Regra de origem de cada cláusula
+        clausula_saida (np.ndarray): Termo da saída ativado por cada cláusula
+        clausula_peso (np.ndarray): Peso aplicado à ativação de cada cláusula
+        regras (tuple): Descrição textual de cada regra
+        saida (str): Rótulo da variável de saída
+        termos_saida (tuple): Rótulos dos termos da saída
+        pontos_saida (np.ndarray): Matriz (n_termos_saida, 4) com os pontos de cada termo da saída
+        universo_saida (np.ndarray): Universo amostrado da saída (somente leitura)
+        mfs_saida (np.ndarray): Curvas dos termos da saída sobre universo_saida, uma por
+            linha, calculadas uma única vez na compilação (somente leitura)
+        metodo_defuzzificacao (str): Método de defuzzificação da saída
+        defuzzificacao_analitica (bool): Usa modules.defuzzificacao em vez do universo amostrado
+    """
+
+    def __init__(self, variaveis, limites, termos, termo_variavel, pontos, clausulas,
+                 clausula_regra, clausula_saida, clausula_peso, regras, saida,
+                 termos_saida, pontos_saida, universo_saida, mfs_saida,
+                 metodo_defuzzificacao, defuzzificacao_analitica=True):
+        self.variaveis = variaveis
+        self.limites = limites
+        self.termos = termos
+        self.termo_variavel = termo_variavel
+        self.pontos = pontos
+        self.clausulas = clausulas
+        self.clausula_regra = clausula_regra
+        self.clausula_saida = clausula_saida
+        self.clausula_peso = clausula_peso
+        self.regras = regras
+        self.saida = saida
+        self.termos_saida = termos_saida
+        self.pontos_saida = pontos_saida
+        self.universo_saida = universo_saida
+        self.mfs_saida = mfs_saida
+        self.metodo_defuzzificacao = metodo_defuzzificacao
+        self.defuzzificacao_analitica = defuzzificacao_analitica
+        self.limites_saida = (float(universo_saida.min()), float(universo_saida.max()))
+        self._pontos_estaticos = pontos_criticos_estaticos(pontos_saida, self.limites_saida)
+        self._proteger_tabelas()
+
+    def __setstate__(self, estado):
+        # Arrays desserializados (processos trabalhadores, cache em disco) voltam graváveis
+        self.__dict__.update(estado)
+        self._proteger_tabelas()
+
+    def _proteger_tabelas(self):
+        """Marca as tabelas da saída como somente leitura (são compartilhadas entre consumidores)"""
+        for tabela in (self.pontos_saida, self.universo_saida, self.mfs_saida):
+            tabela.flags.writeable = False
+
+    def impressao_digital(self):
+        """
+        Calcula um hash das tabelas do sistema (pertinências, regras, pesos e defuzzificação)
+
+        Returns:
+            str: Hash SHA-256 em hexadecimal; muda sempre que a base de regras muda
+        """
+        resumo = hashlib.sha256()
+        for tabela in (self.limites, self.pontos, self.clausulas, self.clausula_regra,
+                       self.clausula_saida, self.clausula_peso, self.pontos_saida, self.universo_saida):
+            resumo.update(np.ascontiguousarray(tabela).tobytes())
+        resumo.update(repr((self.variaveis, self.termos, self.termos_saida, self.saida,
+                            self.metodo_defuzzificacao, self.defuzzificacao_analitica)).encode())
+        return resumo.hexdigest()
+
+    def graus_categorias(self, desempenho):
+        """
+        Calcula o grau de pertinência de valores de desempenho em cada termo da saída
+
+        Args:
+            desempenho (float ou array_like): Valores de desempenho (0-100)
+
+        Returns:
+            np.ndarray: Matriz (..., n_termos_saida), colunas na ordem de self.termos_saida
+        """
+        x = np.asarray(desempenho, dtype=np.float64)
+        return _pertinencia_trapezio(x[..., np.newaxis], self.pontos_saida)
+
+    def _valores_entradas(self, entradas):
+        """Valores de cada variável, na ordem de self.variaveis, já no formato comum (sem cópia)"""
+        faltando = [nome for nome in self.variaveis if nome not in entradas]
+        if faltando:
+            raise ValueError(f"Entradas ausentes: {', '.join(faltando)}.")
+
+        valores = [np.asarray(entradas[nome], dtype=np.float64) for nome in self.variaveis]
+        forma = np.broadcast_shapes(*(valor.shape for valor in valores))
+        return [np.broadcast_to(valor, forma) for valor in valores], forma
+
+    def forma_entradas(self, **entradas):
+        """
+        Formato comum (broadcast) das entradas, o mesmo do resultado de avaliar
+
+        Returns:
+            tuple: Formato; ativacoes e rastro retornam uma linha por elemento, na ordem de ravel()
+        """
+        return self._valores_entradas(entradas)[1]
+
+    def _matriz_entradas(self, valores, inicio=0, fim=None):
+        """Matriz (n_alunos, n_variaveis) dos alunos [inicio, fim), limitada aos universos"""
+        matriz = np.column_stack([np.atleast_1d(valor.flat[inicio:fim]) for valor in valores])
+        return np.clip(matriz, self.limites[:, 0], self.limites[:, 1])
+
+    def _preparar_entradas(self, entradas):
+        """Converte as entradas em uma matriz (n_alunos, n_variaveis) limitada aos universos"""
+        valores, forma = self._valores_entradas(entradas)
+        return self._matriz_entradas(valores), forma
+
+    def _em_blocos(self, entradas, tamanho_bloco, funcao, largura=None):
+        """Aplica funcao(matriz) a blocos de até tamanho_bloco alunos, retornando (resultado, forma)"""
+        valores, forma = self._valores_entradas(entradas)
+        total = int(np.prod(forma))
+        resultado = np.empty((total,) if largura is None else (total, largura))
+        for inicio in range(0, total, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, total)
+            resultado[inicio:fim] = funcao(self._matriz_entradas(valores, inicio, fim))
+        return resultado, forma
+
+    def pertinencias(self, **entradas):
+        """
+        Calcula o grau de pertinência de cada termo dos antecedentes
+
+        Returns:
+            np.ndarray: Matriz (n_alunos, n_termos), colunas na ordem de self.termos
+        """
+        matriz, _ = self._preparar_entradas(entradas)
+        return _pertinencia_trapezio(matriz[:, self.termo_variavel], self.pontos)
+
+    def _disparos_clausulas(self, matriz):
+        """Grau de ativação (mínimo dos literais) de cada cláusula"""
+        mu = _pertinencia_trapezio(matriz[:, self.termo_variavel], self.pontos)
+        # Literais: termos, seus complementos (NOT) e uma coluna neutra para preenchimento
+        literais = np.concatenate([mu, 1. - mu, np.ones((mu.shape[0], 1))], axis=1)
+        return literais[:, self.clausulas].min(axis=2)
+
+    def forcas_disparo(self, tamanho_bloco=1024, **entradas):
+        """
+        Calcula a força de disparo de cada regra (sem aplicar o peso)
+
+        Returns:
+            np.ndarray: Matriz (n_alunos, n_regras), colunas na ordem de self.regras
+        """
+        return self._em_blocos(entradas, tamanho_bloco, lambda matriz: _maximo_por_grupo(
+            self._disparos_clausulas(matriz), self.clausula_regra, len(self.regras)), len(self.regras))[0]
+
+    def disparo_possivel(self, clausulas, **entradas):
+        """
+        Indica em que entradas alguma das cláusulas dispara com força maior que zero
+
+        Args:
+            clausulas (array_like): Índices de cláusulas (linhas de self.clausulas)
+            **entradas: Valores de cada antecedente (escalares ou arrays)
+
+        Returns:
+            np.ndarray: Máscara booleana no formato das entradas
+        """
+        matriz, forma = self._preparar_entradas(entradas)
+        n_termos = len(self.termos)
+        possivel = np.zeros(matriz.shape[0], dtype=bool)
+        for clausula in np.unique(np.asarray(clausulas, dtype=np.intp)):
+            if self.clausula_peso[clausula] <= 0:
+                continue
+            dispara = np.ones(matriz.shape[0], dtype=bool)
+            for literal in self.clausulas[clausula]:
+                if literal == 2 * n_termos:
+                    continue
+                termo = literal % n_termos
+                x = matriz[:, self.termo_variavel[termo]]
+                a, b, c, d = self.pontos[termo]
+                if literal < n_termos:
+                    dispara &= ((x > a) | (x >= b)) & ((x < d) | (x <= c))
+                else:
+                    dispara &= (x < b) | (x > c)
+            possivel |= dispara
+        return possivel.reshape(forma)
+
+    def _ativacoes(self, matriz):
+        """Corte (ativação acumulada pelo máximo) de cada termo da saída"""
+        return self._cortes(self._disparos_clausulas(matriz) * self.clausula_peso)
+
+    def _cortes(self, disparos):
+        """Acumula pelo máximo os disparos (já ponderados) das cláusulas de cada termo da saída"""
+        ativacoes = np.zeros((disparos.shape[0], len(self.termos_saida)))
+        for indice in range(len(self.termos_saida)):
+            selecao = self.clausula_saida == indice
+            if selecao.any():
+                ativacoes[:, indice] = disparos[:, selecao].max(axis=1)
+        return ativacoes
+
+    def rastro(self, tamanho_bloco=1024, **entradas):
+        """
+        Resume a inferência de cada aluno em um vetor de tamanho fixo
+
+        Returns:
+            np.ndarray: Matriz (n_alunos, n_termos_saida + n_regras): o corte de cada termo
+                da saída (ordem de self.termos_saida) seguido da força de disparo de cada
+                regra (ordem de self.regras, sem aplicar o peso)
+        """
+        def rastro_bloco(matriz):
+            disparos = self._disparos_clausulas(matriz)
+            return np.concatenate([
+                self._cortes(disparos * self.clausula_peso),
+                _maximo_por_grupo(disparos, self.clausula_regra, len(self.regras))], axis=1)
+
+        return self._em_blocos(entradas, tamanho_bloco, rastro_bloco,
+                               len(self.termos_saida) + len(self.regras))[0]
+
+    def saida_agregada(self, cortes):
+        """
+        Curva da saída agregada (máximo dos termos limitados pelos cortes) sobre universo_saida
+
+        Args:
+            cortes (array_like): Ativação de cada termo da saída
+
+        Returns:
+            np.ndarray: Grau de pertinência agregado em cada ponto do universo
+        """
+        cortes = np.asarray(cortes, dtype=np.float64)
+        return np.minimum(self.mfs_saida, cortes[:, np.newaxis]).max(axis=0)
+
+    def ativacoes(self, tamanho_bloco=1024, **entradas):
+        """
+        Calcula a ativação de cada termo da saída
+
+        Returns:
+            np.ndarray: Matriz (n_alunos, n_termos_saida), colunas na ordem de self.termos_saida
+        """
+        return self._em_blocos(entradas, tamanho_bloco, self._ativacoes, len(self.termos_saida))[0]
+
+    def avaliar(self, tamanho_bloco=1024, **entradas):
+        """
+        Avalia o sistema fuzzy para as entradas informadas
+
+        Args:
+            tamanho_bloco (int): Alunos processados por vez (fuzzificação, regras e defuzzificação)
+            **entradas: Valores de cada antecedente (escalares ou arrays)
+
+        Returns:
+            np.ndarray: Desempenho no formato das entradas (NaN quando nenhuma regra dispara)
+        """
+        resultado, forma = self._em_blocos(
+            entradas, tamanho_bloco, lambda matriz: self.defuzzificar(self._ativacoes(matriz)))
+        return resultado.reshape(forma)
+
+    def defuzzificar(self, cortes):
+        """
+        Defuzzifica as ativações dos termos da saída com o método do sistema
+
+        Args:
+            cortes (np.ndarray): Matriz (n_alunos, n_termos_saida) com a ativação de cada termo
+
+        Returns:
+            np.ndarray: Valor defuzzificado de cada aluno
+        """
+        metodo = self.metodo_defuzzificacao.lower()
+        if self.defuzzificacao_analitica and metodo in METODOS_ANALITICOS:
+            return defuzzificar_analitico(self.pontos_saida, cortes, metodo,
+                                          self.limites_saida, self._pontos_estaticos)
+        from modules.fuzzy_logic import defuzzificar_lote
+        return defuzzificar_lote(self.universo_saida, self.mfs_saida, cortes, metodo)
+
+
+def _maximo_por_grupo(valores, grupos, n_grupos):
+    """
+    Máximo das colunas de valores agrupadas por índice (uma única redução para todos os grupos)
+
+    Args:
+        valores (np.ndarray): Matriz (n_alunos, n_colunas), sem valores negativos
+        grupos (np.ndarray): Grupo de cada coluna
+        n_grupos (int): Número de grupos (os sem colunas ficam com 0)
+
+    Returns:
+        np.ndarray: Matriz (n_alunos, n_grupos)
+    """
+    resultado = np.zeros((valores.shape[0], n_grupos))
+    if not len(grupos):
+        return resultado
+    ordem = np.argsort(grupos, kind='stable')
+    ordenados = grupos[ordem]
+    inicios = np.flatnonzero(np.r_[True, ordenados[1:] != ordenados[:-1]])
+    resultado[:, ordenados[inicios]] = np.maximum.reduceat(valores[:, ordem], inicios, axis=1)
+    return resultado
+
+
+def _pertinencia_trapezio(x, pontos):
+    """
+    Pertinência trapezoidal exata a partir dos pontos [a, b, c, d]
+
+    Args:
+        x (np.ndarray): Valores avaliados (broadcast com as linhas de pontos)
+        pontos (np.ndarray): Matriz (..., 4) com os pontos de quebra
+
+    Returns:
+        np.ndarray: Graus de pertinência entre 0 e 1
+    """
+    a, b, c, d = pontos[..., 0], pontos[..., 1], pontos[..., 2], pontos[..., 3]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        subida = np.where(x >= b, 1.0, (x - a) / (b - a))
+        descida = np.where(x <= c, 1.0, (d - x) / (d - c))
+    return np.clip(np.minimum(subida, descida), 0.0, 1.0)
+
+
+def _pontos_trapezio(tipo, pontos):
+    """Converte os parâmetros de trimf/trapmf para a forma [a, b, c, d]"""
+    if tipo == 'trimf':
+        a, b, c = pontos
+        return [a, b, b, c]
+    if tipo == 'trapmf':
+        return list(pontos)
+    raise ValueError(f"Função de pertinência '{tipo}' não suportada pelo sistema compilado.")
+
+
+def _forma_normal_disjuntiva(no, indices, n_termos, negado=False):
+    """
+    Reescreve o antecedente de uma regra como lista de cláusulas conjuntivas
+    """
+    from skfuzzy.control.term import Term
+
+    if isinstance(no, Term):
+        indice = indices[(no.parent.label, no.label)]
+        return [[indice + n_termos if negado else indice]]
+
+    if no.kind == 'not':
+        return _forma_normal_disjuntiva(no.term1, indices, n_termos, not negado)
+
+    esquerda = _forma_normal_disjuntiva(no.term1, indices, n_termos, negado)
+    direita = _forma_normal_disjuntiva(no.term2, indices, n_termos, negado)
+    if (no.kind == 'and') != negado:
+        return [c1 + c2 for c1, c2 in itertools.product(esquerda, direita)]
+    return esquerda + direita
+
+
+def compilar_sistema(sistema_ctrl, pertinencias=None, metodo_defuzzificacao=None,
+                     defuzzificacao_analitica=True):
+    """
+    Compila um ctrl.ControlSystem em tabelas NumPy para avaliação rápida
+
+    Args:
+        sistema_ctrl (ctrl.ControlSystem): Sistema retornado por configurar_sistema_fuzzy
+        pertinencias (dict): Parâmetros das funções de pertinência por variável e termo
+            (padrão: modules.fuzzy_logic.PERTINENCIAS)
+        metodo_defuzzificacao (str): 'centroid', 'bisector' ou 'mom' (padrão: o da variável de saída)
+        defuzzificacao_analitica (bool): Defuzzifica de forma exata em vez de usar o universo amostrado
+
+    Returns:
+        SistemaCompilado: Sistema pronto para avaliação vetorizada
+    """
+    if pertinencias is None:
+        from modules.fuzzy_logic import PERTINENCIAS
+        pertinencias = PERTINENCIAS
+
+    antecedentes = sorted(sistema_ctrl.antecedents, key=lambda variavel: variavel.label)
+    consequentes = list(sistema_ctrl.consequents)
+    if len(consequentes) != 1:
+        raise ValueError("O sistema compilado suporta exatamente uma variável de saída.")
+    saida = consequentes[0]
+
+    # === Termos dos antecedentes e seus pontos de quebra ===
+    variaveis = tuple(variavel.label for variavel in antecedentes)
+    limites = np.array([[variavel.universe.min(), variavel.universe.max()] for variavel in antecedentes])
+    termos, termo_variavel, pontos = [], [], []
+    for indice_variavel, variavel in enumerate(antecedentes):
+        for termo in variavel.terms:
+            try:
+                tipo, parametros = pertinencias[variavel.label][termo]
+            except KeyError:
+                raise ValueError(f"Parâmetros ausentes para {variavel.label}['{termo}'].")
+            termos.append((variavel.label, termo))
+            termo_variavel.append(indice_variavel)
+            pontos.append(_pontos_trapezio(tipo, parametros))
+    indices = {termo: indice for indice, termo in enumerate(termos)}
+
+    termos_saida = tuple(saida.terms)
+    indices_saida = {termo: indice for indice, termo in enumerate(termos_saida)}
+    pontos_saida = [_pontos_trapezio(*pertinencias[saida.label][termo]) for termo in termos_saida]
+
+    # === Regras reduzidas a cláusulas conjuntivas ===
+    clausulas, clausula_regra, clausula_saida, clausula_peso, regras = [], [], [], [], []
+    for indice_regra, regra in enumerate(sistema_ctrl.rules):
+        if regra.and_func is not np.fmin or regra.or_func is not np.fmax:
+            raise ValueError("O sistema compilado suporta apenas E = mínimo e OU = máximo.")
+
+        conjuncoes = _forma_normal_disjuntiva(regra.antecedent, indices, len(termos))
+        for consequente in regra.consequent:
+            if consequente.term.parent is not saida:
+                raise ValueError("Todas as regras devem ter a mesma variável de saída.")
+            for conjuncao in conjuncoes:
+                clausulas.append(conjuncao)
+                clausula_regra.append(indice_regra)
+                clausula_saida.append(indices_saida[consequente.term.label])
+                clausula_peso.append(consequente.weight)
+
+        destino = ', '.join(str(consequente) for consequente in regra.consequent)
+        regras.append(f"SE {regra.antecedent} ENTÃO {destino}")
+
+    # Preenche as cláusulas curtas com o literal neutro (pertinência 1)
+    neutro = 2 * len(termos)
+    largura = max(len(clausula) for clausula in clausulas)
+    tabela = np.full((len(clausulas), largura), neutro, dtype=np.intp)
+    for linha, clausula in enumerate(clausulas):
+        tabela[linha, :len(clausula)] = clausula
+
+    return SistemaCompilado(
+        variaveis=variaveis,
+        limites=limites,
+        termos=tuple(termos),
+        termo_variavel=np.array(termo_variavel, dtype=np.intp),
+        pontos=np.array(pontos, dtype=np.float64),
+        clausulas=tabela,
+        clausula_regra=np.array(clausula_regra, dtype=np.intp),
+        clausula_saida=np.array(clausula_saida, dtype=np.intp),
+        clausula_peso=np.array(clausula_peso, dtype=np.float64),
+        regras=tuple(regras),
+        saida=saida.label,
+        termos_saida=termos_saida,
+        pontos_saida=np.array(pontos_saida, dtype=np.float64),
+        universo_saida=saida.universe.copy(),
+        mfs_saida=np.array([saida[termo].mf for termo in termos_saida]),
+        metodo_defuzzificacao=metodo_defuzzificacao or saida.defuzzify_method,
+        defuzzificacao_analitica=defuzzificacao_analitica
+    )
+
+
+def caminho_regras(arquivo_regras=None):
+    """Caminho da definição da base de regras (padrão: regras_padrao.json, ao lado deste módulo)"""
+    return arquivo_regras or ARQUIVO_REGRAS_PADRAO
+
+
+def _ler_regras(arquivo_regras=None):
+    """Lê a definição da base de regras, retornando (caminho, conteúdo)"""
+    caminho = caminho_regras(arquivo_regras)
+    with open(caminho, "rb") as entrada:
+        return caminho, entrada.read()
+
+
+def impressao_digital_base(arquivo_regras=None, conteudo_regras=None):
+    """
+    Identifica a base de regras (e o código que a compila) sem construí-la
+
+    Args:
+        arquivo_regras (str): Definição da base de regras (padrão: regras_padrao.json)
+        conteudo_regras (bytes): Conteúdo já lido da definição
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    if conteudo_regras is None:
+        _, conteudo_regras = _ler_regras(arquivo_regras)
+    resumo = hashlib.sha256()
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    for nome in _FONTES_SISTEMA:
+        with open(os.path.join(diretorio, nome), "rb") as fonte:
+            resumo.update(nome.encode() + b"\0" + fonte.read())
+    resumo.update(b"regras\0" + conteudo_regras)
+    try:
+        versao_skfuzzy = metadata.version("scikit-fuzzy")
+    except metadata.PackageNotFoundError:
+        versao_skfuzzy = "?"
+    resumo.update(f"numpy={np.__version__};scikit-fuzzy={versao_skfuzzy}".encode())
+    return resumo.hexdigest()
+
+
+def _cache_confiavel(arquivo):
+    """O cache só é lido se for do usuário e nem ele nem o diretório puderem ser alterados por outros"""
+    if not hasattr(os, "getuid"):
+        # Windows: o diretório de cache padrão (%LOCALAPPDATA%) já é restrito ao usuário
+        return True
+    info = os.stat(arquivo)
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return False
+    diretorio = os.stat(os.path.dirname(os.path.abspath(arquivo)))
+    # Diretório gravável por outros só é aceito com o sticky bit (ninguém substitui o arquivo alheio)
+    return not (diretorio.st_mode & (stat.S_IWGRP | stat.S_IWOTH)) or bool(diretorio.st_mode & stat.S_ISVTX)
+
+
+def _ler_cache_sistemas(arquivo):
+    """Lê as bases guardadas no cache ({impressão: {opções: sistema}}; vazio se ausente ou inválido)"""
+    bases = {}
+    try:
+        if not _cache_confiavel(arquivo):
+            return {}
+        with np.load(arquivo, allow_pickle=False) as tabelas:
+            for numero, item in enumerate(json.loads(tabelas["indice"].tobytes().decode("utf-8"))):
+                sistema = SistemaCompilado(
+                    variaveis=tuple(item["variaveis"]),
+                    termos=tuple(tuple(termo) for termo in item["termos"]),
+                    regras=tuple(item["regras"]),
+                    saida=item["saida"],
+                    termos_saida=tuple(item["termos_saida"]),
+                    metodo_defuzzificacao=item["metodo_defuzzificacao"],
+                    defuzzificacao_analitica=bool(item["defuzzificacao_analitica"]),
+                    **{nome: tabelas[f"{numero}_{nome}"] for nome in _TABELAS_CACHE})
+                bases.setdefault(item["impressao"], {})[tuple(item["opcoes"])] = sistema
+    except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile):
+        return {}
+    return bases
+
+
+def _gravar_cache_sistemas(arquivo, bases):
+    """Grava as bases no cache de forma atômica (arquivo temporário substituído no final)"""
+    tabelas, indice = {}, []
+    for impressao, sistemas in bases.items():
+        for opcoes, sistema in sistemas.items():
+            for nome in _TABELAS_CACHE:
+                tabelas[f"{len(indice)}_{nome}"] = getattr(sistema, nome)
+            indice.append({
+                "impressao": impressao,
+                "opcoes": list(opcoes),
+                "variaveis": list(sistema.variaveis),
+                "termos": [list(termo) for termo in sistema.termos],
+                "regras": list(sistema.regras),
+                "saida": sistema.saida,
+                "termos_saida": list(sistema.termos_saida),
+                "metodo_defuzzificacao": sistema.metodo_defuzzificacao,
+                "defuzzificacao_analitica": sistema.defuzzificacao_analitica
+            })
+    tabelas["indice"] = np.frombuffer(json.dumps(indice, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+
+    diretorio = os.path.dirname(os.path.abspath(arquivo))
+    os.makedirs(diretorio, mode=0o700, exist_ok=True)
+    temporario = f"{arquivo}.{os.getpid()}.tmp"
+    try:
+        # Grava em um arquivo temporário e substitui: leitores nunca veem um cache pela metade
+        with os.fdopen(os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+                               0o600), "wb") as saida:
+            np.savez(saida, **tabelas)
+        os.replace(temporario, arquivo)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def carregar_sistema(arquivo=ARQUIVO_CACHE_SISTEMA, metodo_defuzzificacao=None, defuzzificacao_analitica=True,
+                     resolucao=None, arquivo_regras=None):
+    """
+    Retorna o sistema compilado do cache em disco, construindo-o na primeira vez
+
+    Args:
+        arquivo (str): Arquivo do cache (padrão: no diretório de cache do usuário;
+            None apenas constrói, sem ler nem gravar)
+        metodo_defuzzificacao (str): Repassado a compilar_sistema
+        defuzzificacao_analitica (bool): Repassado a compilar_sistema
+        resolucao (float, str ou dict): Amostragem dos universos, repassada a
+            configurar_sistema_fuzzy (padrão: RESOLUCAO_PADRAO)
+        arquivo_regras (str): Definição da base de regras em JSON ou TOML
+            (padrão: modules/regras_padrao.json)
+
+    Returns:
+        SistemaCompilado: Sistema pronto para avaliação vetorizada
+
+    Raises:
+        ValueError: Se a definição da base de regras for inválida
+    """
+    # A definição é lida uma única vez: a impressão e a compilação usam o mesmo conteúdo
+    caminho_regras, conteudo_regras = _ler_regras(arquivo_regras)
+    opcoes = (metodo_defuzzificacao, defuzzificacao_analitica, repr(resolucao))
+    impressao = impressao_digital_base(conteudo_regras=conteudo_regras)
+    bases = _ler_cache_sistemas(arquivo) if arquivo else {}
+    sistemas = bases.pop(impressao, {})
+    if opcoes in sistemas:
+        return sistemas[opcoes]
+
+    from modules.fuzzy_logic import carregar_definicao, configurar_sistema_fuzzy, pertinencias_da_definicao
+    definicao = carregar_definicao(caminho_regras, conteudo_regras)
+    if resolucao is None:
+        sistema_ctrl, _ = configurar_sistema_fuzzy(definicao=definicao)
+    else:
+        sistema_ctrl, _ = configurar_sistema_fuzzy(resolucao, definicao)
+    sistema = compilar_sistema(sistema_ctrl, pertinencias_da_definicao(definicao),
+                               metodo_defuzzificacao=metodo_defuzzificacao,
+                               defuzzificacao_analitica=defuzzificacao_analitica)
+
+    if arquivo:
+        # A base usada por último fica no fim; as mais antigas saem primeiro
+        sistemas[opcoes] = sistema
+        bases[impressao] = sistemas
+        while len(bases) > MAXIMO_BASES_CACHE:
+            del bases[next(iter(bases))]
+        try:
+            _gravar_cache_sistemas(arquivo, bases)
+        except OSError:
+            # O cache é apenas uma otimização; sem permissão de escrita, segue sem ele
+            pass
+    return sistema
@@ -0,0 +1,95 @@
+"""Execução paralela da avaliação em lote"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Sistema compilado do processo trabalhador (definido pelo inicializador)
+_sistema_trabalhador = None
+
+
+def _inicializar_trabalhador(sistema):
+    global _sistema_trabalhador
+    _sistema_trabalhador = sistema
+
+
+def _executar_tarefa(funcao, bloco):
+    return funcao(_sistema_trabalhador, bloco)
+
+
+def numero_trabalhadores(trabalhadores=None):
+    """Resolve o número de processos (None ou 0 usa todos os núcleos disponíveis)"""
+    if not trabalhadores:
+        return os.cpu_count() or 1
+    return max(1, int(trabalhadores))
+
+
+def mapear_blocos(funcao, blocos, sistema, trabalhadores=None, pendentes_por_trabalhador=2):
+    """
+    Aplica funcao(sistema, bloco) a cada bloco, em paralelo, preservando a ordem
+
+    Args:
+        funcao (callable): Função de nível de módulo (precisa ser serializável)
+        blocos (iterable): Blocos de dados, consumidos sob demanda
+        sistema (SistemaCompilado): Sistema enviado uma vez a cada trabalhador
+        trabalhadores (int): Número de processos (1 executa em série, None usa todos os núcleos)
+        pendentes_por_trabalhador (int): Blocos em andamento por processo
+
+    Yields:
+        Resultado de cada bloco, na ordem de entrada
+    """
+    trabalhadores = numero_trabalhadores(trabalhadores)
+    if trabalhadores == 1:
+        for bloco in blocos:
+            yield funcao(sistema, bloco)
+        return
+
+    try:
+        executor = ProcessPoolExecutor(max_workers=trabalhadores,
+                                       initializer=_inicializar_trabalhador,
+                                       initargs=(sistema,))
+    except (OSError, NotImplementedError, ValueError):
+        # Plataformas sem suporte a multiprocessamento: executar em série
+        for bloco in blocos:
+            yield funcao(sistema, bloco)
+        return
+
+    with executor:
+        pendentes = deque()
+        limite = trabalhadores * pendentes_por_trabalhador
+        for bloco in blocos:
+            pendentes.append(executor.submit(_executar_tarefa, funcao, bloco))
+            if len(pendentes) >= limite:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+def _avaliar_entradas(sistema, entradas):
+    return sistema.avaliar(**entradas)
+
+
+def avaliar_em_paralelo(sistema, trabalhadores=None, tamanho_bloco=50000, **entradas):
+    """
+    Avalia arrays de entradas dividindo-os em blocos entre vários processos
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        trabalhadores (int): Número de processos (1 executa em série)
+        tamanho_bloco (int): Alunos por tarefa
+        **entradas: Arrays de cada antecedente (com broadcast entre si)
+
+    Returns:
+        np.ndarray: Desempenho no formato das entradas
+    """
+    valores = {nome: np.asarray(valor, dtype=np.float64) for nome, valor in entradas.items()}
+    forma = np.broadcast_shapes(*(valor.shape for valor in valores.values()))
+    valores = {nome: np.broadcast_to(valor, forma).ravel() for nome, valor in valores.items()}
+    total = int(np.prod(forma))
+
+    blocos = ({nome: valor[inicio:inicio + tamanho_bloco] for nome, valor in valores.items()}
+              for inicio in range(0, total, tamanho_bloco))
+    partes = list(mapear_blocos(_avaliar_entradas, blocos, sistema, trabalhadores))
+    resultado = np.concatenate(partes) if partes else np.empty(0)
+    return resultado.reshape(forma)
@@ -0,0 +1,382 @@
+"""
+Reavaliação incremental do histórico após mudanças na base de regras
+
+Uso:
+    python -m modules.reavaliacao [--regras novas.json] [--regras-anteriores antigas.json]
+                                  [--historico historico.csv | --sqlite historico.db] [--simular]
+"""
+import argparse
+import csv
+import io
+import itertools
+import os
+import shutil
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from modules.avaliacao import calcular_nota_media, pontuar_alunos, valores_motivacao
+from modules.compatibilidade import ajustar_notas_lote
+from modules.motor_compilado import caminho_regras, carregar_sistema
+
+# Colunas de entrada exigidas para reavaliar um registro
+COLUNAS_ENTRADA = ["Nota_Teoria1", "Nota_Teoria2", "Nota_Pratica", "Nota_Grupo", "Frequencia",
+                   "Participacao", "Socioemocional", "Contexto"]
+
+# Diferença de desempenho abaixo da qual o registro é considerado inalterado
+TOLERANCIA_DESEMPENHO = 1e-9
+
+
+def _assinaturas_clausulas(sistema):
+    """Descreve cada cláusula pelo que determina sua contribuição: literais, termo da saída e peso"""
+    n_termos = len(sistema.termos)
+    assinaturas = []
+    for indice, literais in enumerate(sistema.clausulas):
+        descricao = frozenset(
+            (*sistema.termos[literal % n_termos], bool(literal >= n_termos),
+             tuple(sistema.pontos[literal % n_termos].tolist()))
+            for literal in literais if literal != 2 * n_termos)
+        saida = sistema.clausula_saida[indice]
+        assinaturas.append((descricao, sistema.termos_saida[saida], tuple(sistema.pontos_saida[saida].tolist()),
+                            float(sistema.clausula_peso[indice])))
+    return assinaturas
+
+
+def _configuracao_global(sistema):
+    """Partes do sistema que influenciam todas as entradas"""
+    universo = None if sistema.defuzzificacao_analitica else sistema.universo_saida.tobytes()
+    return (sistema.variaveis, sistema.limites.tolist(), sistema.saida, sistema.limites_saida,
+            sistema.metodo_defuzzificacao.lower(), sistema.defuzzificacao_analitica, universo)
+
+
+def comparar_sistemas(antigo, novo):
+    """
+    Identifica as cláusulas que mudaram entre duas bases de regras compiladas
+
+    Args:
+        antigo (SistemaCompilado): Sistema usado na pontuação do histórico
+        novo (SistemaCompilado): Sistema com as regras alteradas
+
+    Returns:
+        dict: 'removidas' (índices de cláusulas do antigo), 'adicionadas' (índices do
+            novo), 'regras' (descrição das regras envolvidas, com - e +) e 'completa'
+            (True se a mudança afeta todas as entradas)
+    """
+    completa = _configuracao_global(antigo) != _configuracao_global(novo)
+
+    assinaturas_antigas = _assinaturas_clausulas(antigo)
+    assinaturas_novas = _assinaturas_clausulas(novo)
+    sobras_antigas = Counter(assinaturas_antigas) - Counter(assinaturas_novas)
+    sobras_novas = Counter(assinaturas_novas) - Counter(assinaturas_antigas)
+
+    def indices(assinaturas, sobras):
+        selecionados = []
+        for indice, assinatura in enumerate(assinaturas):
+            if sobras[assinatura] > 0:
+                sobras[assinatura] -= 1
+                selecionados.append(indice)
+        return np.array(selecionados, dtype=np.intp)
+
+    removidas = indices(assinaturas_antigas, sobras_antigas)
+    adicionadas = indices(assinaturas_novas, sobras_novas)
+    regras = [f"- {antigo.regras[indice]}" for indice in dict.fromkeys(antigo.clausula_regra[removidas])]
+    regras += [f"+ {novo.regras[indice]}" for indice in dict.fromkeys(novo.clausula_regra[adicionadas])]
+    return {'removidas': removidas, 'adicionadas': adicionadas, 'regras': regras, 'completa': completa}
+
+
+def entradas_fuzzy(bloco):
+    """
+    Monta as entradas do sistema fuzzy a partir de um bloco do histórico
+
+    Returns:
+        tuple: (dicionário de arrays por antecedente, máscara das linhas com todas as entradas)
+    """
+    numero = lambda coluna: pd.to_numeric(bloco[coluna], errors="coerce").to_numpy(dtype=np.float64) \
+        if coluna in bloco.columns else np.full(len(bloco), np.nan)
+    texto = lambda coluna: bloco[coluna].fillna("").astype(str).to_numpy(dtype=object) \
+        if coluna in bloco.columns else np.full(len(bloco), "", dtype=object)
+
+    nota = calcular_nota_media(*(numero(coluna) for coluna in COLUNAS_ENTRADA[:4]))
+    nota = ajustar_notas_lote(nota, texto("Perfil_Aluno"), texto("Metodo_Ensino"))
+    nota_ajustada = numero("Nota_Ajustada")
+    nota = np.where(np.isnan(nota_ajustada), nota, nota_ajustada)
+
+    motivacao = valores_motivacao(texto("Motivacao_Cat"), np.nan_to_num(numero("Motivacao")))
+    entradas = {
+        'nota': nota,
+        'frequencia': numero("Frequencia"),
+        'participacao': numero("Participacao"),
+        'socioemocional': numero("Socioemocional"),
+        'contexto': numero("Contexto"),
+        'motivacao': motivacao
+    }
+    validas = ~np.any(np.isnan(np.column_stack(list(entradas.values()))), axis=1)
+    return entradas, validas, texto("Motivacao_Cat")
+
+
+def reavaliar_bloco(bloco, antigo, novo, mudancas):
+    """
+    Reavalia as linhas de um bloco do histórico afetadas pelas mudanças
+
+    Args:
+        bloco (pd.DataFrame): Registros com as colunas do histórico (texto ou números)
+        antigo, novo (SistemaCompilado): Sistemas antes e depois da mudança
+        mudancas (dict): Resultado de comparar_sistemas
+
+    Returns:
+        dict: 'reavaliadas' (posições no bloco), 'desempenho', 'classificacao' e 'rastro'
+            (SistemaCompilado.rastro) dessas linhas, 'alteradas' (máscara sobre reavaliadas)
+            e 'invalidas' (quantidade)
+    """
+    entradas, validas, motivacao_cat = entradas_fuzzy(bloco)
+    if mudancas['completa']:
+        candidatas = validas.copy()
+    else:
+        candidatas = np.zeros(len(bloco), dtype=bool)
+        if validas.any():
+            selecao = {nome: valores[validas] for nome, valores in entradas.items()}
+            possivel = np.zeros(int(validas.sum()), dtype=bool)
+            if len(mudancas['removidas']):
+                possivel |= antigo.disparo_possivel(mudancas['removidas'], **selecao)
+            if len(mudancas['adicionadas']):
+                possivel |= novo.disparo_possivel(mudancas['adicionadas'], **selecao)
+            candidatas[validas] = possivel
+
+    reavaliadas = np.flatnonzero(candidatas)
+    vazio = np.full(len(reavaliadas), "", dtype=object)
+    resultado = pontuar_alunos(
+        novo,
+        entradas['nota'][reavaliadas],
+        vazio, vazio,
+        entradas['frequencia'][reavaliadas],
+        entradas['participacao'][reavaliadas],
+        entradas['socioemocional'][reavaliadas],
+        entradas['contexto'][reavaliadas],
+        motivacao_cat[reavaliadas],
+        entradas['motivacao'][reavaliadas]
+    )
+
+    anterior = pd.to_numeric(bloco["Desempenho"], errors="coerce").to_numpy(dtype=np.float64)[reavaliadas]
+    classificacao_anterior = bloco["Classificacao"].fillna("").astype(str).to_numpy(dtype=object)[reavaliadas]
+    alteradas = ~(np.abs(resultado['desempenho'] - anterior) <= TOLERANCIA_DESEMPENHO)
+    alteradas |= resultado['classificacao'] != classificacao_anterior
+    return {
+        'reavaliadas': reavaliadas,
+        'desempenho': resultado['desempenho'],
+        'classificacao': resultado['classificacao'],
+        'rastro': novo.rastro(**{nome: valores[reavaliadas] for nome, valores in entradas.items()}),
+        'alteradas': alteradas,
+        'invalidas': int(len(bloco) - validas.sum())
+    }
+
+
+def _somar(relatorio, bloco, resultado):
+    relatorio['registros'] += len(bloco)
+    relatorio['invalidos'] += resultado['invalidas']
+    relatorio['reavaliados'] += len(resultado['reavaliadas'])
+    relatorio['alterados'] += int(resultado['alteradas'].sum())
+
+
+def _reavaliar_csv(arquivo_csv, antigo, novo, mudancas, relatorio, tamanho_bloco, simular):
+    """Regrava o CSV substituindo apenas as linhas alteradas (as demais são copiadas sem mudança)"""
+    from modules.historico import _trava_historico, codificar_rastro
+
+    base_regras = novo.impressao_digital()[:16]
+    temporario = f"{arquivo_csv}.{os.getpid()}.tmp"
+    tamanho_inicial = os.path.getsize(arquivo_csv)
+    destino = open(os.devnull if simular else temporario, "w", newline="", encoding="utf-8")
+    try:
+        with open(arquivo_csv, newline="", encoding="utf-8") as entrada, destino:
+            linha_cabecalho = entrada.readline()
+            destino.write(linha_cabecalho)
+            cabecalho = next(csv.reader([linha_cabecalho]))
+            faltando = [coluna for coluna in COLUNAS_ENTRADA + ["Desempenho", "Classificacao"]
+                        if coluna not in cabecalho]
+            if faltando:
+                raise ValueError(f"Colunas ausentes no histórico: {', '.join(faltando)}.")
+            posicao_desempenho = cabecalho.index("Desempenho")
+            posicao_classificacao = cabecalho.index("Classificacao")
+            # Históricos antigos podem não ter as colunas do rastro
+            posicao_base = cabecalho.index("Base_Regras") if "Base_Regras" in cabecalho else None
+            posicao_rastro = cabecalho.index("Rastro") if "Rastro" in cabecalho else None
+
+            while True:
+                linhas = list(itertools.islice(entrada, tamanho_bloco))
+                if not linhas:
+                    break
+                # Linhas vazias ou incompletas (gravação interrompida) são copiadas como estão
+                campos = [next(csv.reader([linha]), []) for linha in linhas]
+                completas = [indice for indice, valores in enumerate(campos) if len(valores) == len(cabecalho)]
+                bloco = pd.DataFrame([campos[indice] for indice in completas], columns=cabecalho, dtype=object)
+
+                resultado = reavaliar_bloco(bloco, antigo, novo, mudancas)
+                resultado['invalidas'] += len(linhas) - len(completas)
+                _somar(relatorio, linhas, resultado)
+
+                alteradas = resultado['reavaliadas'][resultado['alteradas']]
+                for posicao, desempenho, classificacao, rastro in zip(
+                        alteradas, resultado['desempenho'][resultado['alteradas']],
+                        resultado['classificacao'][resultado['alteradas']],
+                        resultado['rastro'][resultado['alteradas']]):
+                    indice = completas[posicao]
+                    valores = campos[indice]
+                    valores[posicao_desempenho] = float(desempenho)
+                    valores[posicao_classificacao] = classificacao
+                    if posicao_base is not None:
+                        valores[posicao_base] = base_regras
+                    if posicao_rastro is not None:
+                        valores[posicao_rastro] = codificar_rastro(rastro)
+                    buffer = io.StringIO()
+                    csv.writer(buffer, lineterminator="\n").writerow(valores)
+                    linhas[indice] = buffer.getvalue()
+                destino.writelines(linhas)
+
+        if simular:
+            return
+        # Registros acrescentados durante a reavaliação entram sem mudança no fim do arquivo; a trava
+        # exclusiva impede novas gravações entre a cópia do fim e a substituição
+        with _trava_historico(arquivo_csv, exclusiva=True):
+            with open(arquivo_csv, "rb") as entrada, open(temporario, "ab") as destino:
+                entrada.seek(tamanho_inicial)
+                shutil.copyfileobj(entrada, destino)
+                destino.flush()
+                os.fsync(destino.fileno())
+            os.replace(temporario, arquivo_csv)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def _reavaliar_sqlite(banco, antigo, novo, mudancas, relatorio, tamanho_bloco, simular):
+    """Atualiza o resultado e o rastro dos registros alterados no banco, bloco a bloco"""
+    from modules.historico import COLUNAS_HISTORICO, codificar_rastro
+
+    base_regras = novo.impressao_digital()[:16]
+    for linhas in banco.iterar_blocos(tamanho_bloco, com_id=True):
+        bloco = pd.DataFrame.from_records(linhas, columns=["id"] + COLUNAS_HISTORICO)
+        resultado = reavaliar_bloco(bloco, antigo, novo, mudancas)
+        _somar(relatorio, linhas, resultado)
+        alteradas = resultado['reavaliadas'][resultado['alteradas']]
+        if len(alteradas) and not simular:
+            banco.atualizar_resultados(list(zip(
+                bloco["id"].to_numpy()[alteradas].tolist(),
+                resultado['desempenho'][resultado['alteradas']].tolist(),
+                resultado['classificacao'][resultado['alteradas']].tolist(),
+                itertools.repeat(base_regras),
+                [codificar_rastro(rastro) for rastro in resultado['rastro'][resultado['alteradas']]])))
+
+
+def arquivo_regras_pontuacao(historico):
+    """Cópia da base de regras usada na última pontuação do histórico (None se não houver)"""
+    for extensao in (".json", ".toml"):
+        if os.path.exists(f"{historico}.regras{extensao}"):
+            return f"{historico}.regras{extensao}"
+    return None
+
+
+def reavaliar_historico(regras_anteriores, regras_novas=None, arquivo_csv=None, banco=None,
+                        tamanho_bloco=50000, simular=False, completa=False):
+    """
+    Reavalia o histórico apenas onde as regras alteradas podem disparar
+
+    Args:
+        regras_anteriores (str): Definição usada na pontuação atual do histórico
+        regras_novas (str): Nova definição (padrão: modules/regras_padrao.json)
+        arquivo_csv (str): Histórico CSV (ignorado se banco for informado)
+        banco (HistoricoSQLite): Histórico SQLite
+        tamanho_bloco (int): Registros processados por vez
+        simular (bool): Apenas conta, sem gravar
+        completa (bool): Reavalia todos os registros, sem o filtro por regiões
+
+    Returns:
+        dict: 'registros', 'ignorados' (nenhuma regra alterada pode disparar),
+            'reavaliados', 'alterados', 'invalidos' (sem as entradas necessárias),
+            'regras' (regras alteradas), 'completa' e 'segundos'
+    """
+    inicio = time.perf_counter()
+    antigo = carregar_sistema(arquivo_regras=regras_anteriores)
+    novo = carregar_sistema(arquivo_regras=regras_novas)
+    mudancas = comparar_sistemas(antigo, novo)
+    mudancas['completa'] = mudancas['completa'] or completa
+
+    relatorio = {'registros': 0, 'reavaliados': 0, 'alterados': 0, 'invalidos': 0,
+                 'regras': mudancas['regras'], 'completa': mudancas['completa']}
+    nada_mudou = not (mudancas['completa'] or len(mudancas['removidas']) or len(mudancas['adicionadas']))
+    if banco is not None:
+        if nada_mudou:
+            relatorio['registros'] = banco.contar()
+        else:
+            _reavaliar_sqlite(banco, antigo, novo, mudancas, relatorio, tamanho_bloco, simular)
+    elif os.path.exists(arquivo_csv):
+        if nada_mudou:
+            from modules.historico import _indice_linhas
+            relatorio['registros'] = max(len(_indice_linhas(arquivo_csv)) - 2, 0)
+        else:
+            _reavaliar_csv(arquivo_csv, antigo, novo, mudancas, relatorio, tamanho_bloco, simular)
+
+    relatorio['ignorados'] = relatorio['registros'] - relatorio['reavaliados'] - relatorio['invalidos']
+    relatorio['segundos'] = time.perf_counter() - inicio
+    return relatorio
+
+
+def main(argumentos=None):
+    from modules.historico import ARQUIVO_HISTORICO
+
+    parser = argparse.ArgumentParser(description="Reavalia o histórico após mudanças na base de regras")
+    parser.add_argument("--regras", default=None,
+                        help="Nova definição da base de regras (padrão: modules/regras_padrao.json)")
+    parser.add_argument("--regras-anteriores", default=None,
+                        help="Definição usada na pontuação atual do histórico "
+                             "(padrão: a cópia gravada na última reavaliação)")
+    parser.add_argument("--historico", default=ARQUIVO_HISTORICO, help="Histórico CSV (padrão: %(default)s)")
+    parser.add_argument("--sqlite", default=None, help="Histórico SQLite (em vez do CSV)")
+    parser.add_argument("--tamanho-bloco", type=int, default=50000, help="Registros processados por vez")
+    parser.add_argument("--completa", action="store_true", help="Reavalia todos os registros")
+    parser.add_argument("--simular", action="store_true", help="Apenas informa o que seria alterado")
+    args = parser.parse_args(argumentos)
+
+    historico = args.sqlite or args.historico
+    regras_anteriores = args.regras_anteriores or arquivo_regras_pontuacao(historico)
+    if regras_anteriores is None:
+        parser.error(f"informe --regras-anteriores (não há cópia das regras de pontuação de {historico})")
+
+    banco = None
+    if args.sqlite:
+        from modules.historico_sqlite import HistoricoSQLite
+        banco = HistoricoSQLite(args.sqlite)
+    try:
+        relatorio = reavaliar_historico(regras_anteriores, args.regras, args.historico, banco,
+                                        args.tamanho_bloco, args.simular, args.completa)
+    finally:
+        if banco is not None:
+            banco.fechar()
+
+    if relatorio['completa']:
+        print("Mudança global (universos ou defuzzificação): todos os registros foram reavaliados.")
+    elif relatorio['regras']:
+        print("Regras alteradas:")
+        for regra in relatorio['regras']:
+            print(f"  {regra}")
+    else:
+        print("Nenhuma regra mudou.")
+    print(f"{relatorio['registros']} registros: {relatorio['ignorados']} ignorados, "
+          f"{relatorio['reavaliados']} reavaliados, {relatorio['alterados']} alterados"
+          + (f", {relatorio['invalidos']} sem dados suficientes" if relatorio['invalidos'] else "")
+          + f" ({relatorio['segundos']:.2f} s)" + (" [simulação]" if args.simular else ""))
+
+    # A nova base passa a ser a referência da próxima reavaliação
+    if not args.simular:
+        origem = caminho_regras(args.regras)
+        extensao = ".toml" if origem.lower().endswith(".toml") else ".json"
+        for antiga in (".json", ".toml"):
+            if os.path.exists(f"{historico}.regras{antiga}") and antiga != extensao:
+                os.remove(f"{historico}.regras{antiga}")
+        shutil.copyfile(origem, f"{historico}.regras{extensao}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
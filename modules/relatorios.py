@@ -0,0 +1,551 @@
+"""
+Exportação de relatórios individuais de uma turma (HTML ou PDF)
+
+Uso:
+    python -m modules.relatorios turma.csv pasta_relatorios [--formato html|pdf] [--trabalhadores 8]
+                                 [--regras minhas_regras.json] [--recomecar]
+"""
+import argparse
+import base64
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import sys
+import textwrap
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.analise import gerar_analises
+from modules.avaliacao import pontuar_alunos
+from modules.batch import COLUNAS_NUMERICAS, TIPOS_COLUNAS
+from modules.grafico import NOMES_DESEMPENHO, atualizar_grafico, capturar_fundo, montar_grafico, redesenhar_dinamicos
+from modules.motor_compilado import carregar_sistema
+from modules.paralelo import mapear_blocos
+from modules.reavaliacao import entradas_fuzzy
+
+ARQUIVO_PROGRESSO = "progresso.jsonl"
+ARQUIVO_INDICE = "index.html"
+
+# Regras listadas em cada relatório (as de maior força de disparo)
+REGRAS_EXIBIDAS = 3
+
+# Alunos enviados a um processo por vez
+ALUNOS_POR_TAREFA = 25
+
+# Tamanho dos gráficos nos relatórios, em polegadas (a 100 dpi), mais largo que na interface
+TAMANHO_FIGURA = (10, 8)
+
+# Cores da imagem PNG (os gráficos têm poucas cores; a paleta reduz o arquivo a um terço)
+CORES_PNG = 256
+
+# Dados do aluno exibidos no relatório: coluna -> rótulo
+CAMPOS_RELATORIO = {
+    'Nota_Teoria1': 'Avaliação teórica 1',
+    'Nota_Teoria2': 'Avaliação teórica 2',
+    'Nota_Pratica': 'Avaliação prática',
+    'Nota_Grupo': 'Avaliação em grupo',
+    'Nota_Ajustada': 'Nota ajustada',
+    'Frequencia': 'Frequência',
+    'Participacao': 'Participação',
+    'Socioemocional': 'Habilidades socioemocionais',
+    'Contexto': 'Contexto socioeconômico',
+    'Motivacao': 'Motivação',
+    'Perfil_Aluno': 'Perfil do aluno',
+    'Metodo_Ensino': 'Método de ensino'
+}
+
+ESTILO_HTML = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 60em; color: #222; }
+h1 { margin-bottom: 0.2em; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #ccc; padding: 0.3em 0.7em; text-align: left; }
+th { background: #f2f2f2; }
+td.numero { text-align: right; }
+.resultado { font-size: 1.3em; font-weight: bold; }
+.analise { white-space: pre-wrap; background: #fafafa; border: 1px solid #ddd; padding: 1em; }
+img { max-width: 100%; }
+"""
+
+# Figura do processo trabalhador, montada no primeiro aluno e reaproveitada
+_grafico_trabalhador = {}
+
+
+# === PREPARAÇÃO DA TURMA ===
+
+def ler_turma(entrada):
+    """
+    Lê a planilha da turma (colunas do histórico)
+
+    Args:
+        entrada (str): Caminho do CSV
+
+    Returns:
+        pd.DataFrame: Alunos, com as colunas numéricas convertidas
+    """
+    numericas = COLUNAS_NUMERICAS + ["Nota_Ajustada"]
+    turma = pd.read_csv(entrada, dtype={**TIPOS_COLUNAS, "Nota_Ajustada": np.float64}, keep_default_na=False,
+                        na_values={coluna: [""] for coluna in numericas})
+    faltando = [coluna for coluna in COLUNAS_NUMERICAS[:-1] if coluna not in turma.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes no arquivo de entrada: {', '.join(faltando)}.")
+    return turma
+
+
+def preparar_turma(sistema, turma):
+    """
+    Pontua a turma com o sistema atual e calcula rastros e análises
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        turma (pd.DataFrame): Alunos (ler_turma)
+
+    Returns:
+        pd.DataFrame: A turma com Nota_Ajustada, Desempenho, Classificacao e Analise
+            preenchidos; as linhas sem todas as entradas ficam sem resultado
+        np.ndarray: Rastro da inferência de cada aluno (linhas de NaN nas inválidas)
+    """
+    entradas, validas, motivacao_cat = entradas_fuzzy(turma)
+    selecao = np.flatnonzero(validas)
+    vazio = np.full(len(selecao), "", dtype=object)
+
+    # As notas já chegam ajustadas (entradas_fuzzy); o perfil e o método não são reaplicados
+    resultado = pontuar_alunos(
+        sistema,
+        entradas['nota'][selecao],
+        vazio, vazio,
+        entradas['frequencia'][selecao],
+        entradas['participacao'][selecao],
+        entradas['socioemocional'][selecao],
+        entradas['contexto'][selecao],
+        motivacao_cat[selecao],
+        entradas['motivacao'][selecao]
+    )
+
+    turma = turma.copy()
+    turma["Nota_Ajustada"] = entradas['nota']
+    desempenho = np.full(len(turma), np.nan)
+    desempenho[selecao] = resultado['desempenho']
+    classificacao = np.full(len(turma), "", dtype=object)
+    classificacao[selecao] = resultado['classificacao']
+    turma["Desempenho"] = desempenho
+    turma["Classificacao"] = classificacao
+
+    analises = np.full(len(turma), "", dtype=object)
+    if len(selecao):
+        analises[selecao] = gerar_analises(turma.iloc[selecao])
+    turma["Analise"] = analises
+
+    rastros = np.full((len(turma), len(sistema.termos_saida) + len(sistema.regras)), np.nan)
+    if len(selecao):
+        rastros[selecao] = sistema.rastro(**{nome: valores[selecao] for nome, valores in entradas.items()})
+    return turma, rastros
+
+
+def nome_arquivo(posicao, matricula, formato, digitos=5):
+    """Nome do relatório de um aluno: posição na planilha (garante unicidade) e matrícula"""
+    matricula = re.sub(r"[^\w.-]+", "_", str(matricula or "")).strip("._")[:40]
+    return f"{posicao + 1:0{digitos}d}{'_' + matricula if matricula else ''}.{formato}"
+
+
+# === DESENHO E GRAVAÇÃO (PROCESSOS TRABALHADORES) ===
+
+def _grafico_do_sistema(sistema):
+    """Figura e canvas Agg do processo, montados uma vez por sistema"""
+    if _grafico_trabalhador.get('sistema') is not sistema:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        grafico = montar_grafico(sistema)
+        grafico['figura'].set_size_inches(*TAMANHO_FIGURA)
+        grafico['figura'].tight_layout(pad=2.0, rect=[0, 0, 0.8, 1])
+        canvas = FigureCanvasAgg(grafico['figura'])
+        canvas.mpl_connect('draw_event', lambda evento: capturar_fundo(grafico, canvas))
+        _grafico_trabalhador.update(sistema=sistema, grafico=grafico, canvas=canvas)
+    return _grafico_trabalhador['grafico'], _grafico_trabalhador['canvas']
+
+
+def desenhar_grafico(sistema, desempenho, rastro):
+    """
+    Desenha os gráficos de desempenho de um aluno no backend Agg
+
+    Args:
+        sistema (SistemaCompilado): Sistema que gerou o rastro
+        desempenho (float): Resultado do aluno
+        rastro (np.ndarray): Rastro da inferência do aluno (SistemaCompilado.rastro)
+
+    Returns:
+        np.ndarray: Imagem RGBA (altura, largura, 4) da figura
+    """
+    grafico, canvas = _grafico_do_sistema(sistema)
+    cortes = rastro[:len(sistema.termos_saida)]
+    atualizar_grafico(grafico, desempenho, sistema.graus_categorias(desempenho), sistema.saida_agregada(cortes))
+    # Sobre o fundo salvo; o primeiro aluno faz o desenho completo que o captura
+    redesenhar_dinamicos(grafico, canvas)
+    return np.array(canvas.buffer_rgba())
+
+
+def imagem_png(imagem):
+    """Codifica uma imagem RGBA (opaca) em PNG com paleta"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(imagem[..., :3]).quantize(CORES_PNG, method=Image.Quantize.FASTOCTREE).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def regras_mais_ativadas(sistema, rastro, quantidade=REGRAS_EXIBIDAS):
+    """Lista (regra, força) das regras de maior força de disparo registradas no rastro"""
+    forcas = rastro[len(sistema.termos_saida):]
+    ordem = np.argsort(-forcas, kind="stable")[:quantidade]
+    return [(sistema.regras[indice], float(forcas[indice])) for indice in ordem if forcas[indice] > 0]
+
+
+def _formatar_valor(valor):
+    if isinstance(valor, (float, np.floating)):
+        return "" if np.isnan(valor) else f"{valor:.1f}"
+    return str(valor)
+
+
+def montar_html(aluno, regras, png):
+    """
+    Monta o relatório HTML autocontido de um aluno (o gráfico vai embutido em base64)
+
+    Args:
+        aluno (dict): Linha da turma preparada (preparar_turma)
+        regras (list): Regras mais ativadas, como (texto, força)
+        png (bytes): Imagem dos gráficos
+
+    Returns:
+        str: Documento HTML
+    """
+    e = html.escape
+    nome = aluno.get('Nome') or aluno.get('Matricula') or "Aluno"
+    linhas = "\n".join(
+        f"<tr><th>{e(rotulo)}</th><td>{e(_formatar_valor(aluno[coluna]))}</td></tr>"
+        for coluna, rotulo in CAMPOS_RELATORIO.items() if coluna in aluno and _formatar_valor(aluno[coluna]) != "")
+    itens = "\n".join(f"<li>{e(regra)} ({forca:.2f})</li>" for regra, forca in regras)
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Relatório de desempenho - {e(str(nome))}</title>
+<style>{ESTILO_HTML}</style>
+</head>
+<body>
+<h1>{e(str(nome))}</h1>
+<p>Matrícula: {e(str(aluno.get('Matricula', '')))}</p>
+<p class="resultado">Desempenho: {aluno['Desempenho']:.1f} - {e(aluno['Classificacao'])}</p>
+<table>
+{linhas}
+</table>
+<h2>Regras mais ativadas</h2>
+<ul>
+{itens}
+</ul>
+<h2>Gráficos de desempenho</h2>
+<img alt="Gráficos de desempenho" src="data:image/png;base64,{base64.b64encode(png).decode('ascii')}">
+<div class="analise">{e(aluno['Analise'].strip())}</div>
+</body>
+</html>
+"""
+
+
+def gravar_pdf(caminho, aluno, regras, imagem):
+    """
+    Grava o relatório de um aluno em PDF (backend PDF do matplotlib)
+
+    Args:
+        caminho (str): Arquivo de destino
+        aluno (dict): Linha da turma preparada (preparar_turma)
+        regras (list): Regras mais ativadas, como (texto, força)
+        imagem (np.ndarray): Imagem RGBA dos gráficos
+    """
+    import matplotlib
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    # Página A4 em polegadas e linhas de texto da análise na primeira página e nas demais
+    largura, altura = 8.27, 11.69
+    linhas_primeira, linhas_pagina = 17, 62
+
+    def pagina():
+        return Figure(figsize=(largura, altura))
+
+    nome = aluno.get('Nome') or aluno.get('Matricula') or "Aluno"
+    dados = [f"{rotulo}: {_formatar_valor(aluno[coluna])}" for coluna, rotulo in CAMPOS_RELATORIO.items()
+             if coluna in aluno and _formatar_valor(aluno[coluna]) != ""]
+    cabecalho = [f"Matrícula: {aluno.get('Matricula', '')}",
+                 f"Desempenho: {aluno['Desempenho']:.1f} - {aluno['Classificacao']}", ""]
+    cabecalho += ["   ".join(dados[indice:indice + 3]) for indice in range(0, len(dados), 3)]
+    if regras:
+        cabecalho += ["", "Regras mais ativadas:"]
+        cabecalho += [textwrap.shorten(f"• {regra} ({forca:.2f})", 110) for regra, forca in regras]
+
+    texto = []
+    for linha in aluno['Analise'].strip().splitlines():
+        texto += textwrap.wrap(linha, 100) or [""]
+
+    # Peso "medium": é o nome do peso normal nas métricas (AFM) da Helvetica
+    with matplotlib.rc_context({'pdf.use14corefonts': True}), \
+            PdfPages(caminho, metadata={'Title': f"Relatório de desempenho - {nome}"}) as pdf:
+        figura = pagina()
+        figura.text(0.08, 0.96, str(nome), fontsize=16, fontweight='bold', va='top')
+        figura.text(0.08, 0.93, "\n".join(cabecalho), fontsize=8.5, fontweight='medium', va='top',
+                    linespacing=1.4)
+        altura_imagem = 0.84 * largura / altura * imagem.shape[0] / imagem.shape[1]
+        eixo = figura.add_axes([0.08, 0.75 - altura_imagem, 0.84, altura_imagem])
+        eixo.imshow(imagem, interpolation='none')
+        eixo.set_axis_off()
+        figura.text(0.08, 0.73 - altura_imagem, "\n".join(texto[:linhas_primeira]), fontsize=9,
+                    fontweight='medium', va='top', linespacing=1.35)
+        pdf.savefig(figura)
+
+        for inicio in range(linhas_primeira, len(texto), linhas_pagina):
+            figura = pagina()
+            figura.text(0.08, 0.96, "\n".join(texto[inicio:inicio + linhas_pagina]), fontsize=9,
+                        fontweight='medium', va='top', linespacing=1.35)
+            pdf.savefig(figura)
+
+
+def _gravar_atomico(caminho, conteudo):
+    """Grava em um arquivo temporário e o renomeia, para nunca deixar um relatório pela metade"""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    if callable(conteudo):
+        conteudo(temporario)
+    else:
+        with open(temporario, "w", encoding="utf-8") as saida:
+            saida.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+def exportar_bloco(sistema, tarefa):
+    """
+    Desenha e grava os relatórios de um bloco de alunos (executado nos trabalhadores)
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        tarefa (dict): 'destino', 'formato' e 'alunos' (lista de (posição, arquivo,
+            linha da turma, rastro))
+
+    Returns:
+        list: (posição, arquivo) de cada relatório gravado
+    """
+    gravados = []
+    for posicao, arquivo, aluno, rastro in tarefa['alunos']:
+        imagem = desenhar_grafico(sistema, aluno['Desempenho'], rastro)
+        regras = regras_mais_ativadas(sistema, rastro)
+        caminho = os.path.join(tarefa['destino'], arquivo)
+        if tarefa['formato'] == "pdf":
+            _gravar_atomico(caminho, lambda temporario: gravar_pdf(temporario, aluno, regras, imagem))
+        else:
+            _gravar_atomico(caminho, montar_html(aluno, regras, imagem_png(imagem)))
+        gravados.append((posicao, arquivo))
+    return gravados
+
+
+# === PROGRESSO E ÍNDICE ===
+
+def assinatura_exportacao(entrada, sistema, formato):
+    """Identifica uma exportação: conteúdo da planilha, base de regras e formato"""
+    resumo = hashlib.sha256()
+    with open(entrada, "rb") as arquivo:
+        for parte in iter(lambda: arquivo.read(1 << 20), b""):
+            resumo.update(parte)
+    resumo.update(sistema.impressao_digital().encode())
+    resumo.update(formato.encode())
+    return resumo.hexdigest()
+
+
+def ler_progresso(destino, assinatura):
+    """
+    Lê os relatórios já concluídos de uma exportação anterior com a mesma assinatura
+
+    Returns:
+        dict: Posição -> arquivo (vazio se não houver progresso compatível)
+    """
+    caminho = os.path.join(destino, ARQUIVO_PROGRESSO)
+    if not os.path.exists(caminho):
+        return {}
+    concluidos = {}
+    with open(caminho, encoding="utf-8") as arquivo:
+        for numero, linha in enumerate(arquivo):
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                # Última linha cortada por uma interrupção
+                continue
+            if numero == 0:
+                if registro.get('assinatura') != assinatura:
+                    return {}
+            elif os.path.exists(os.path.join(destino, registro['arquivo'])):
+                concluidos[registro['posicao']] = registro['arquivo']
+    return concluidos
+
+
+def montar_indice(turma, arquivos):
+    """
+    Monta o índice HTML da turma, com a distribuição das classificações
+
+    Args:
+        turma (pd.DataFrame): Turma preparada (preparar_turma)
+        arquivos (dict): Posição -> arquivo do relatório
+
+    Returns:
+        str: Documento HTML
+    """
+    e = html.escape
+    contagem = turma.loc[turma["Classificacao"] != "", "Classificacao"].value_counts()
+    ordem = [nome for nome in NOMES_DESEMPENHO.values() if nome in contagem.index]
+    ordem += [nome for nome in contagem.index if nome not in ordem]
+    resumo = "\n".join(f"<tr><td>{e(nome)}</td><td class=\"numero\">{contagem[nome]}</td></tr>" for nome in ordem)
+
+    def coluna(nome):
+        if nome in turma.columns:
+            return turma[nome].fillna("").astype(str).to_numpy()
+        return np.full(len(turma), "", dtype=object)
+
+    linhas = []
+    for posicao, (matricula, nome, desempenho, classificacao) in enumerate(
+            zip(coluna("Matricula"), coluna("Nome"), turma["Desempenho"], turma["Classificacao"])):
+        arquivo = arquivos.get(posicao)
+        relatorio = f'<a href="{e(arquivo)}">relatório</a>' if arquivo else "dados incompletos"
+        linhas.append(f"<tr><td>{e(matricula)}</td><td>{e(nome)}</td>"
+                      f"<td class=\"numero\">{_formatar_valor(desempenho)}</td>"
+                      f"<td>{e(classificacao)}</td><td>{relatorio}</td></tr>")
+
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Relatórios da turma</title>
+<style>{ESTILO_HTML}</style>
+</head>
+<body>
+<h1>Relatórios da turma</h1>
+<p>{len(turma)} alunos, {len(arquivos)} relatórios.</p>
+<table>
+<tr><th>Classificação</th><th>Alunos</th></tr>
+{resumo}
+</table>
+<table>
+<tr><th>Matrícula</th><th>Nome</th><th>Desempenho</th><th>Classificação</th><th></th></tr>
+{chr(10).join(linhas)}
+</table>
+</body>
+</html>
+"""
+
+
+# === EXPORTAÇÃO ===
+
+def exportar_turma(entrada, destino, sistema, formato="html", trabalhadores=None, recomecar=False, relatar=None):
+    """
+    Exporta os relatórios de uma turma, retomando uma exportação interrompida
+
+    Args:
+        entrada (str): CSV da turma com as colunas do histórico
+        destino (str): Pasta dos relatórios (criada se necessário)
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        formato (str): "html" ou "pdf"
+        trabalhadores (int): Processos de desenho (1 executa em série, None ou 0 usa todos os núcleos)
+        recomecar (bool): Ignora o progresso gravado e refaz todos os relatórios
+        relatar (callable): Chamado como relatar(concluídos, total, segundos) após cada bloco
+
+    Returns:
+        dict: 'alunos', 'relatorios', 'retomados' (já prontos de uma execução anterior),
+            'incompletos' (sem todas as entradas) e 'segundos'
+    """
+    if formato not in ("html", "pdf"):
+        raise ValueError(f"Formato de relatório desconhecido: {formato}.")
+    inicio = time.perf_counter()
+    os.makedirs(destino, exist_ok=True)
+
+    turma, rastros = preparar_turma(sistema, ler_turma(entrada))
+    validas = np.flatnonzero(~np.isnan(turma["Desempenho"].to_numpy()))
+    digitos = max(5, len(str(len(turma))))
+    matriculas = turma["Matricula"] if "Matricula" in turma.columns else pd.Series([""] * len(turma))
+    arquivos = {int(posicao): nome_arquivo(posicao, matriculas.iloc[posicao], formato, digitos)
+                for posicao in validas}
+
+    assinatura = assinatura_exportacao(entrada, sistema, formato)
+    concluidos = {} if recomecar else ler_progresso(destino, assinatura)
+    concluidos = {posicao: arquivo for posicao, arquivo in concluidos.items() if arquivos.get(posicao) == arquivo}
+    retomados = len(concluidos)
+
+    # Temporários de relatórios que estavam sendo gravados quando a execução anterior parou
+    for arquivo in os.listdir(destino):
+        if re.fullmatch(r"\d+(_[\w.-]+)?\.(html|pdf)\.\d+\.tmp", arquivo):
+            os.remove(os.path.join(destino, arquivo))
+
+    caminho_progresso = os.path.join(destino, ARQUIVO_PROGRESSO)
+    if not concluidos:
+        with open(caminho_progresso, "w", encoding="utf-8") as progresso:
+            progresso.write(json.dumps({'assinatura': assinatura, 'entrada': os.path.abspath(entrada),
+                                        'formato': formato, 'alunos': len(turma)}) + "\n")
+
+    pendentes = [posicao for posicao in arquivos if posicao not in concluidos]
+    colunas = list(turma.columns)
+    registros = turma.to_numpy(dtype=object)
+
+    def tarefas():
+        for indice in range(0, len(pendentes), ALUNOS_POR_TAREFA):
+            yield {
+                'destino': destino,
+                'formato': formato,
+                'alunos': [(posicao, arquivos[posicao], dict(zip(colunas, registros[posicao])), rastros[posicao])
+                           for posicao in pendentes[indice:indice + ALUNOS_POR_TAREFA]]
+            }
+
+    with open(caminho_progresso, "a", encoding="utf-8") as progresso:
+        for gravados in mapear_blocos(exportar_bloco, tarefas(), sistema, trabalhadores):
+            for posicao, arquivo in gravados:
+                progresso.write(json.dumps({'posicao': posicao, 'arquivo': arquivo}) + "\n")
+                concluidos[posicao] = arquivo
+            progresso.flush()
+            if relatar:
+                relatar(len(concluidos), len(arquivos), time.perf_counter() - inicio)
+
+    _gravar_atomico(os.path.join(destino, ARQUIVO_INDICE), montar_indice(turma, concluidos))
+    return {
+        'alunos': len(turma),
+        'relatorios': len(concluidos),
+        'retomados': retomados,
+        'incompletos': len(turma) - len(arquivos),
+        'segundos': time.perf_counter() - inicio
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Exporta um relatório de desempenho por aluno (HTML ou PDF)")
+    parser.add_argument("entrada", help="CSV da turma com as colunas do histórico")
+    parser.add_argument("destino", help="Pasta onde os relatórios e o índice serão gravados")
+    parser.add_argument("--formato", choices=["html", "pdf"], default="html", help="Formato dos relatórios")
+    parser.add_argument("--trabalhadores", type=int, default=0,
+                        help="Processos de desenho (0 usa todos os núcleos, 1 executa em série)")
+    parser.add_argument("--regras", default=None,
+                        help="Definição da base de regras em JSON ou TOML (padrão: modules/regras_padrao.json)")
+    parser.add_argument("--recomecar", action="store_true", help="Ignora o progresso gravado e refaz tudo")
+    parser.add_argument("--silencioso", action="store_true", help="Não exibir o progresso")
+    args = parser.parse_args(argumentos)
+
+    sistema = carregar_sistema(arquivo_regras=args.regras)
+
+    def relatar(concluidos, total, segundos):
+        if not args.silencioso:
+            print(f"\r{concluidos}/{total} relatórios ({segundos:.0f} s)", end="", file=sys.stderr, flush=True)
+
+    relatorio = exportar_turma(args.entrada, args.destino, sistema, args.formato, args.trabalhadores,
+                               args.recomecar, relatar)
+    if not args.silencioso:
+        print(file=sys.stderr)
+    print(f"{relatorio['relatorios']} relatórios em {args.destino} ({relatorio['retomados']} já prontos, "
+          f"{relatorio['incompletos']} alunos com dados incompletos) em {relatorio['segundos']:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
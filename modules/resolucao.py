@@ -0,0 +1,119 @@
+"""
+Comparação da resolução dos universos com a amostragem de referência
+
+Uso:
+    python -m modules.resolucao 0.5 0.25 adaptativa [--saida 0.1] [--referencia 0.1] [--amostras 20000]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from modules.fuzzy_logic import LIMITES_UNIVERSO, RESOLUCAO_PADRAO, avaliar_lote, configurar_sistema_fuzzy
+
+
+def _memoria_universos(sistema_ctrl):
+    """Bytes ocupados pelos universos e pelas pertinências amostradas"""
+    total = 0
+    for variavel in [*sistema_ctrl.antecedents, *sistema_ctrl.consequents]:
+        total += variavel.universe.nbytes
+        total += sum(termo.mf.nbytes for termo in variavel.terms.values())
+    return total
+
+
+def _pontos_universos(sistema_ctrl):
+    return {variavel.label: len(variavel.universe)
+            for variavel in [*sistema_ctrl.antecedents, *sistema_ctrl.consequents]}
+
+
+def sortear_entradas(amostras=20000, semente=0):
+    """
+    Sorteia entradas uniformes dentro dos universos dos antecedentes
+
+    Returns:
+        dict: Array de cada antecedente
+    """
+    gerador = np.random.default_rng(semente)
+    return {variavel: gerador.uniform(minimo, maximo, amostras)
+            for variavel, (minimo, maximo) in LIMITES_UNIVERSO.items() if variavel != 'desempenho'}
+
+
+def comparar_resolucao(resolucao, referencia=RESOLUCAO_PADRAO, amostras=20000, semente=0):
+    """
+    Mede o erro de saída de uma resolução em relação à de referência
+
+    Args:
+        resolucao (float, str ou dict): Resolução avaliada (ver fuzzy_logic.criar_universo)
+        referencia (float, str ou dict): Resolução de referência (a amostragem fina)
+        amostras (int): Quantidade de entradas sorteadas
+        semente (int): Semente do sorteio
+
+    Returns:
+        dict: 'pontos' por variável, 'bytes', 'segundos', 'bytes_referencia',
+            'segundos_referencia', 'erro_maximo', 'erro_medio', 'divergencias'
+            (entradas em que só um dos sistemas não ativou regras) e 'pior_entrada'
+    """
+    entradas = sortear_entradas(amostras, semente)
+
+    medidas = []
+    for opcao in (referencia, resolucao):
+        sistema_ctrl, _ = configurar_sistema_fuzzy(opcao)
+        inicio = time.perf_counter()
+        saida = avaliar_lote(sistema_ctrl, **entradas)
+        medidas.append((sistema_ctrl, saida, time.perf_counter() - inicio))
+    (ctrl_referencia, saida_referencia, segundos_referencia), (sistema_ctrl, saida, segundos) = medidas
+
+    validos = ~np.isnan(saida) & ~np.isnan(saida_referencia)
+    erros = np.abs(saida - saida_referencia)[validos]
+    pior = int(np.flatnonzero(validos)[np.argmax(erros)]) if erros.size else None
+
+    return {
+        'pontos': _pontos_universos(sistema_ctrl),
+        'bytes': _memoria_universos(sistema_ctrl),
+        'segundos': segundos,
+        'bytes_referencia': _memoria_universos(ctrl_referencia),
+        'segundos_referencia': segundos_referencia,
+        'erro_maximo': float(erros.max()) if erros.size else 0.0,
+        'erro_medio': float(erros.mean()) if erros.size else 0.0,
+        'divergencias': int(np.count_nonzero(np.isnan(saida) != np.isnan(saida_referencia))),
+        'pior_entrada': {nome: float(valores[pior]) for nome, valores in entradas.items()} if pior is not None else None
+    }
+
+
+def _interpretar_resolucao(texto):
+    return texto if texto == 'adaptativa' else float(texto)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Erro de saída por resolução dos universos fuzzy")
+    parser.add_argument("resolucoes", nargs="+", type=_interpretar_resolucao,
+                        help="Passos a comparar (ex.: 0.5 0.25) ou 'adaptativa'")
+    parser.add_argument("--referencia", type=_interpretar_resolucao, default=RESOLUCAO_PADRAO,
+                        help="Resolução de referência (padrão: %(default)s)")
+    parser.add_argument("--saida", type=_interpretar_resolucao, default=None,
+                        help="Resolução fixa para a variável de saída")
+    parser.add_argument("--amostras", type=int, default=20000, help="Entradas sorteadas")
+    parser.add_argument("--semente", type=int, default=0, help="Semente do sorteio")
+    args = parser.parse_args(argumentos)
+
+    print(f"Referência: {args.referencia} | {args.amostras} entradas sorteadas")
+    print(f"{'resolução':>12} {'pontos (entrada/saída)':>24} {'memória':>10} {'tempo':>9} "
+          f"{'erro máx.':>10} {'erro médio':>11}")
+    for resolucao in args.resolucoes:
+        opcao = resolucao
+        if args.saida is not None:
+            opcao = {variavel: resolucao for variavel in LIMITES_UNIVERSO}
+            opcao['desempenho'] = args.saida
+        r = comparar_resolucao(opcao, args.referencia, args.amostras, args.semente)
+        pontos_entrada = sum(quantidade for nome, quantidade in r['pontos'].items() if nome != 'desempenho')
+        pontos = f"{pontos_entrada}/{r['pontos']['desempenho']}"
+        print(f"{str(resolucao):>12} {pontos:>24} "
+              f"{r['bytes'] / 1024:8.1f}KB {r['segundos']:8.3f}s {r['erro_maximo']:10.4f} {r['erro_medio']:11.5f}")
+        if r['divergencias']:
+            print(f"{'':>12} {r['divergencias']} entradas ativaram regras em apenas um dos sistemas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Análise de sensibilidade do sistema fuzzy
+
+Uso:
+    python -m modules.sensibilidade --variar nota frequencia [--fixar participacao=5 ...]
+                                    [--pontos 200] [--saida mapa.png] [--csv grade.csv]
+    python -m modules.sensibilidade --amostrar 100000 [--fixar nota=5]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from modules.avaliacao import CLASSIFICACOES, classificar_desempenho
+from modules.motor_compilado import carregar_sistema
+
+# Pontos por eixo quando a grade não é informada
+PONTOS_PADRAO = 200
+
+# Limites entre as classificações (30, 45, 60 e 75)
+LIMITES_CLASSIFICACAO = np.array([limite for limite, _ in CLASSIFICACOES[:-1]], dtype=np.float64)
+
+
+def avaliar_grade(sistema, **entradas):
+    """
+    Avalia o sistema defuzzificando cada combinação distinta de ativações uma única vez
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        **entradas: Valores de cada antecedente (escalares ou arrays, com broadcast)
+
+    Returns:
+        np.ndarray: Desempenho no formato das entradas (NaN quando nenhuma regra dispara)
+    """
+    forma = sistema.forma_entradas(**entradas)
+    cortes = np.ascontiguousarray(sistema.ativacoes(**entradas))
+    # Cada linha de cortes vista como um único valor binário: np.unique sem axis=0, bem mais rápido
+    linhas = cortes.view(np.dtype((np.void, cortes.dtype.itemsize * cortes.shape[1]))).ravel()
+    _, primeiras, inverso = np.unique(linhas, return_index=True, return_inverse=True)
+    return sistema.defuzzificar(cortes[primeiras])[inverso.ravel()].reshape(forma)
+
+
+def valores_fixos(sistema, fixas=None):
+    """
+    Completa os valores das entradas mantidas fixas
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        fixas (dict): Valores informados por entrada
+
+    Returns:
+        dict: Valor de cada antecedente (o centro do universo quando não informado)
+    """
+    fixas = dict(fixas or {})
+    desconhecidas = [nome for nome in fixas if nome not in sistema.variaveis]
+    if desconhecidas:
+        raise ValueError(f"Entradas desconhecidas: {', '.join(desconhecidas)}. "
+                         f"Use: {', '.join(sistema.variaveis)}.")
+    return {nome: float(fixas.get(nome, limites.mean()))
+            for nome, limites in zip(sistema.variaveis, sistema.limites)}
+
+
+def _eixo(sistema, nome, valores, pontos):
+    """Valores de um eixo da grade (o universo inteiro em pontos passos quando não informados)"""
+    if nome not in sistema.variaveis:
+        raise ValueError(f"Entrada desconhecida: {nome}. Use: {', '.join(sistema.variaveis)}.")
+    if valores is None:
+        minimo, maximo = sistema.limites[sistema.variaveis.index(nome)]
+        return np.linspace(minimo, maximo, pontos)
+    return np.asarray(valores, dtype=np.float64).ravel()
+
+
+def _nivel_classificacao(desempenho):
+    """Índice da classificação de cada valor (0 = Insuficiente), -1 para NaN"""
+    nivel = np.searchsorted(LIMITES_CLASSIFICACAO, desempenho, side='right')
+    return np.where(np.isnan(desempenho), -1, nivel)
+
+
+def varrer(sistema, eixos, fixas=None, pontos=PONTOS_PADRAO):
+    """
+    Varia uma ou duas entradas em uma grade, mantendo as demais fixas
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        eixos (str, list ou dict): Entradas variadas (uma ou duas); em um dict, os
+            valores de cada eixo (None para o universo inteiro)
+        fixas (dict): Valores das demais entradas (padrão: centro de cada universo)
+        pontos (int): Pontos por eixo quando os valores não são informados
+
+    Returns:
+        dict: 'eixos' (nome -> valores, na ordem das dimensões), 'fixas',
+            'desempenho' (array com uma dimensão por eixo), 'classificacao' e
+            'fronteiras' (células cuja classificação difere da vizinha seguinte
+            em algum eixo)
+    """
+    if isinstance(eixos, str):
+        eixos = [eixos]
+    if not isinstance(eixos, dict):
+        eixos = dict.fromkeys(eixos)
+    if not 1 <= len(eixos) <= 2:
+        raise ValueError("Informe uma ou duas entradas para variar.")
+
+    valores_eixos = {nome: _eixo(sistema, nome, valores, pontos) for nome, valores in eixos.items()}
+    fixas = {nome: valor for nome, valor in valores_fixos(sistema, fixas).items() if nome not in valores_eixos}
+    grades = np.meshgrid(*valores_eixos.values(), indexing='ij', sparse=True)
+
+    desempenho = avaliar_grade(sistema, **fixas, **dict(zip(valores_eixos, grades)))
+
+    nivel = _nivel_classificacao(desempenho)
+    fronteiras = np.zeros(nivel.shape, dtype=bool)
+    for eixo in range(nivel.ndim):
+        anterior = [slice(None)] * nivel.ndim
+        anterior[eixo] = slice(None, -1)
+        seguinte = [slice(None)] * nivel.ndim
+        seguinte[eixo] = slice(1, None)
+        fronteiras[tuple(anterior)] |= nivel[tuple(anterior)] != nivel[tuple(seguinte)]
+
+    return {
+        'eixos': valores_eixos,
+        'fixas': fixas,
+        'desempenho': desempenho,
+        'classificacao': classificar_desempenho(desempenho),
+        'fronteiras': fronteiras
+    }
+
+
+def amostrar(sistema, quantidade=10000, fixas=None, semente=None):
+    """
+    Amostra o espaço das entradas por hipercubo latino e avalia as amostras
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        quantidade (int): Número de amostras
+        fixas (dict): Entradas mantidas fixas (as demais variam no universo inteiro)
+        semente (int): Semente do gerador aleatório
+
+    Returns:
+        dict: 'entradas' (nome -> array das amostras), 'desempenho' e 'classificacao'
+    """
+    gerador = np.random.default_rng(semente)
+    fixas = dict(fixas or {})
+    valores_fixos(sistema, fixas)  # valida os nomes
+
+    entradas = {}
+    for nome, (minimo, maximo) in zip(sistema.variaveis, sistema.limites):
+        if nome in fixas:
+            entradas[nome] = np.full(quantidade, float(fixas[nome]))
+            continue
+        faixas = (gerador.permutation(quantidade) + gerador.random(quantidade)) / quantidade
+        entradas[nome] = minimo + faixas * (maximo - minimo)
+
+    desempenho = sistema.avaliar(**entradas)
+    return {'entradas': entradas, 'desempenho': desempenho, 'classificacao': classificar_desempenho(desempenho)}
+
+
+def indices_sensibilidade(amostra, faixas=20):
+    """
+    Estima quanto da variação do desempenho cada entrada explica sozinha
+
+    Args:
+        amostra (dict): Resultado de amostrar
+        faixas (int): Faixas de cada entrada
+
+    Returns:
+        dict: Entrada -> índice entre 0 e 1, em ordem decrescente
+    """
+    desempenho = amostra['desempenho']
+    validos = ~np.isnan(desempenho)
+    desempenho = desempenho[validos]
+    variancia = desempenho.var()
+
+    indices = {}
+    for nome, valores in amostra['entradas'].items():
+        valores = valores[validos]
+        if variancia <= 0 or np.ptp(valores) == 0:
+            indices[nome] = 0.0
+            continue
+        limites = np.linspace(valores.min(), valores.max(), faixas + 1)[1:-1]
+        faixa = np.searchsorted(limites, valores, side='right')
+        contagem = np.bincount(faixa, minlength=faixas)
+        medias = np.bincount(faixa, weights=desempenho, minlength=faixas) / np.maximum(contagem, 1)
+        entre_faixas = np.sum(contagem * (medias - desempenho.mean()) ** 2) / len(desempenho)
+        indices[nome] = float(entre_faixas / variancia)
+    return dict(sorted(indices.items(), key=lambda item: item[1], reverse=True))
+
+
+def grafico_sensibilidade(resultado):
+    """
+    Desenha o resultado de varrer: curva (um eixo) ou mapa de calor (dois eixos)
+
+    Args:
+        resultado (dict): Resultado de varrer
+
+    Returns:
+        matplotlib.figure.Figure: Figura fora do registro global do pyplot
+    """
+    from matplotlib.figure import Figure
+
+    nomes = list(resultado['eixos'])
+    desempenho = resultado['desempenho']
+    fixas = ", ".join(f"{nome}={valor:g}" for nome, valor in resultado['fixas'].items())
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    if len(nomes) == 1:
+        x = resultado['eixos'][nomes[0]]
+        ax.plot(x, desempenho, color='b', linewidth=2)
+        # Faixas de cada classificação ao fundo
+        cores = ['red', 'orange', 'yellow', 'green', 'blue']
+        inferior = 0.0
+        for (limite, nome), cor in zip(CLASSIFICACOES, cores):
+            ax.axhspan(inferior, min(limite, 100.0), color=cor, alpha=0.12, label=nome)
+            inferior = limite
+        ax.set_xlabel(nomes[0])
+        ax.set_ylabel('Desempenho')
+        ax.set_ylim(0, 100)
+        ax.legend(loc='best', fontsize=8)
+    else:
+        x, y = (resultado['eixos'][nome] for nome in nomes)
+        # Primeira dimensão (primeiro eixo) nas linhas: transposta para que ele fique na horizontal
+        imagem = ax.pcolormesh(x, y, desempenho.T, cmap='RdYlGn', vmin=0, vmax=100, shading='auto')
+        fig.colorbar(imagem, ax=ax, label='Desempenho')
+        if np.isfinite(desempenho).any():
+            contornos = ax.contour(x, y, desempenho.T, levels=LIMITES_CLASSIFICACAO,
+                                   colors='k', linewidths=1, linestyles='--')
+            ax.clabel(contornos, fmt='%g', fontsize=8)
+        ax.set_xlabel(nomes[0])
+        ax.set_ylabel(nomes[1])
+    ax.set_title(f"Sensibilidade do desempenho ({fixas})" if fixas else "Sensibilidade do desempenho",
+                 fontsize=10)
+    fig.tight_layout()
+    return fig
+
+
+def salvar_grafico(resultado, arquivo):
+    """Grava o gráfico de varrer em arquivo (formato pela extensão), no backend Agg"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figura = grafico_sensibilidade(resultado)
+    FigureCanvasAgg(figura)
+    figura.savefig(arquivo, dpi=120)
+
+
+def salvar_csv(resultado, arquivo):
+    """Grava a grade de varrer em CSV: uma linha por célula, com as entradas variadas"""
+    import pandas as pd
+
+    grades = np.meshgrid(*resultado['eixos'].values(), indexing='ij')
+    tabela = pd.DataFrame({nome: grade.ravel() for nome, grade in zip(resultado['eixos'], grades)})
+    tabela["Desempenho"] = resultado['desempenho'].ravel()
+    tabela["Classificacao"] = resultado['classificacao'].ravel()
+    tabela.to_csv(arquivo, index=False)
+
+
+def _interpretar_fixas(textos):
+    fixas = {}
+    for texto in textos:
+        nome, separador, valor = texto.partition("=")
+        try:
+            fixas[nome.strip()] = float(valor)
+        except ValueError:
+            separador = ""
+        if not separador:
+            raise argparse.ArgumentTypeError(f"Valor fixo inválido: '{texto}' (use entrada=valor).")
+    return fixas
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Sensibilidade do desempenho às entradas do sistema fuzzy")
+    parser.add_argument("--variar", nargs="+", metavar="ENTRADA", help="Uma ou duas entradas variadas em grade")
+    parser.add_argument("--amostrar", type=int, metavar="N",
+                        help="Amostra N pontos do espaço das entradas e estima a influência de cada uma")
+    parser.add_argument("--fixar", nargs="*", default=[], metavar="ENTRADA=VALOR",
+                        help="Valores das entradas mantidas fixas (padrão: centro do universo)")
+    parser.add_argument("--pontos", type=int, default=PONTOS_PADRAO, help="Pontos por eixo (padrão: %(default)s)")
+    parser.add_argument("--semente", type=int, default=None, help="Semente da amostragem")
+    parser.add_argument("--saida", default=None, help="Arquivo do gráfico (png, svg, pdf)")
+    parser.add_argument("--csv", default=None, help="Arquivo CSV com a grade ou as amostras")
+    parser.add_argument("--regras", default=None,
+                        help="Definição da base de regras (padrão: modules/regras_padrao.json)")
+    args = parser.parse_args(argumentos)
+    if bool(args.variar) == bool(args.amostrar):
+        parser.error("use --variar ou --amostrar")
+
+    try:
+        fixas = _interpretar_fixas(args.fixar)
+        sistema = carregar_sistema(arquivo_regras=args.regras)
+        inicio = time.perf_counter()
+        if args.variar:
+            resultado = varrer(sistema, args.variar, fixas, args.pontos)
+        else:
+            resultado = amostrar(sistema, args.amostrar, fixas, args.semente)
+        segundos = time.perf_counter() - inicio
+    except (ValueError, argparse.ArgumentTypeError) as erro:
+        parser.error(str(erro))
+
+    desempenho = resultado['desempenho']
+    print(f"{desempenho.size} avaliações em {segundos:.3f} s; desempenho entre "
+          f"{np.nanmin(desempenho):.1f} e {np.nanmax(desempenho):.1f}")
+    classificacoes, contagens = np.unique(resultado['classificacao'].astype(str), return_counts=True)
+    for classificacao, contagem in zip(classificacoes, contagens):
+        print(f"  {classificacao}: {100 * contagem / desempenho.size:.1f}%")
+
+    if args.variar:
+        print(f"  células na fronteira entre classificações: {int(resultado['fronteiras'].sum())}")
+        if args.saida:
+            salvar_grafico(resultado, args.saida)
+        if args.csv:
+            salvar_csv(resultado, args.csv)
+    else:
+        print("Influência de cada entrada (índice de primeira ordem):")
+        for nome, indice in indices_sensibilidade(resultado).items():
+            print(f"  {nome}: {indice:.3f}")
+        if args.csv:
+            import pandas as pd
+            tabela = pd.DataFrame(resultado['entradas'])
+            tabela["Desempenho"] = desempenho
+            tabela["Classificacao"] = resultado['classificacao']
+            tabela.to_csv(args.csv, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
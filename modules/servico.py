@@ -0,0 +1,554 @@
+"""
+Serviço HTTP local de avaliação (POST /avaliar, GET /saude, GET /metricas)
+
+Uso:
+    python -m modules.servico [--porta 8765] [--janela-ms 2] [--lote-maximo 1024]
+                              [--maximo-conexoes 256] [--maximo-pendentes 20000]
+                              [--regras minhas_regras.json]
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from modules.avaliacao import VALORES_MOTIVACAO, calcular_nota_media, pontuar_alunos
+from modules.instrumentacao import Histograma
+from modules.motor_compilado import carregar_sistema
+
+PORTA_PADRAO = 8765
+
+# Campos numéricos obrigatórios de cada aluno e o valor máximo aceito (o mínimo é 0)
+CAMPOS_NUMERICOS = {
+    'Nota_Teoria1': 10,
+    'Nota_Teoria2': 10,
+    'Nota_Pratica': 10,
+    'Nota_Grupo': 10,
+    'Frequencia': 100,
+    'Participacao': 10,
+    'Socioemocional': 10,
+    'Contexto': 10
+}
+
+# Limites de cabeçalho e de espera por uma nova requisição na mesma conexão
+TAMANHO_MAXIMO_CABECALHO = 16 * 1024
+TEMPO_OCIOSO = 30.0
+
+
+class RequisicaoInvalida(Exception):
+    """Erro de protocolo ou de dados; vira a resposta HTTP com o status indicado"""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+# === DADOS DOS ALUNOS ===
+
+def _numero(aluno, campo, maximo):
+    valor = aluno.get(campo)
+    if valor is None or valor == "":
+        raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, f"O campo {campo} não pode estar vazio.")
+    try:
+        if isinstance(valor, bool):
+            raise ValueError
+        valor = float(valor)
+    except (TypeError, ValueError):
+        raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST,
+                                 f"O valor '{valor}' no campo {campo} não é um número válido.") from None
+    if not 0 <= valor <= maximo:
+        raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST,
+                                 f"O valor do campo {campo} deve estar entre 0 e {maximo}.")
+    return valor
+
+
+def montar_colunas(alunos):
+    """
+    Valida os alunos de uma requisição e monta as colunas de entrada de pontuar_alunos
+
+    Args:
+        alunos (list): Dicionários com os campos de cada aluno
+
+    Returns:
+        dict: Arrays 'notas', 'perfis', 'metodos', 'frequencia', 'participacao',
+            'socioemocional', 'contexto', 'motivacao_cat' e 'motivacao'
+
+    Raises:
+        RequisicaoInvalida: Campo ausente, não numérico ou fora do intervalo
+    """
+    valores = np.empty((len(alunos), len(CAMPOS_NUMERICOS)))
+    motivacao = np.zeros(len(alunos))
+    textos = np.full((len(alunos), 3), "", dtype=object)
+
+    for indice, aluno in enumerate(alunos):
+        try:
+            if not isinstance(aluno, dict):
+                raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Cada aluno deve ser um objeto JSON.")
+            for coluna, (campo, maximo) in enumerate(CAMPOS_NUMERICOS.items()):
+                valores[indice, coluna] = _numero(aluno, campo, maximo)
+
+            categoria = aluno.get('Motivacao_Cat') or ""
+            if not isinstance(categoria, str):
+                raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "O campo Motivacao_Cat deve ser um texto.")
+            if categoria not in VALORES_MOTIVACAO:
+                if categoria or aluno.get('Motivacao') in (None, ""):
+                    raise RequisicaoInvalida(
+                        HTTPStatus.BAD_REQUEST,
+                        f"O campo Motivacao_Cat deve ser {', '.join(VALORES_MOTIVACAO)} "
+                        f"(ou informe a Motivacao numérica).")
+                motivacao[indice] = _numero(aluno, 'Motivacao', 10)
+            textos[indice] = (categoria, str(aluno.get('Perfil_Aluno') or ""), str(aluno.get('Metodo_Ensino') or ""))
+        except RequisicaoInvalida as erro:
+            if len(alunos) > 1:
+                erro.args = (f"Aluno {indice}: {erro.args[0]}",)
+            raise
+
+    return {
+        'notas': calcular_nota_media(*valores[:, :4].T),
+        'perfis': textos[:, 1],
+        'metodos': textos[:, 2],
+        'frequencia': valores[:, 4],
+        'participacao': valores[:, 5],
+        'socioemocional': valores[:, 6],
+        'contexto': valores[:, 7],
+        'motivacao_cat': textos[:, 0],
+        'motivacao': motivacao
+    }
+
+
+# === AGRUPAMENTO EM LOTES ===
+
+class AgrupadorLotes:
+    """
+    Reúne os alunos de requisições concorrentes em lotes para pontuar_alunos
+
+    Atributos:
+        janela (float): Segundos de espera por mais alunos depois da primeira chegada
+        tamanho_maximo (int): Alunos a partir dos quais o lote é despachado sem esperar a janela
+        na_fila (int): Alunos aguardando um lote
+        lotes, alunos (int): Lotes avaliados e alunos pontuados
+        espera, inferencia (Histograma): Duração da espera pelo lote e da inferência
+    """
+
+    def __init__(self, sistema, janela=0.002, tamanho_maximo=1024):
+        self.sistema = sistema
+        self.janela = janela
+        self.tamanho_maximo = tamanho_maximo
+        self.na_fila = 0
+        self.lotes = 0
+        self.alunos = 0
+        self.espera = Histograma()
+        self.inferencia = Histograma()
+        self._fila = []
+        self._chegada = asyncio.Event()
+        self._cheio = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inferencia")
+        self._tarefa = None
+
+    def iniciar(self):
+        self._tarefa = asyncio.get_running_loop().create_task(self._despachar())
+
+    async def encerrar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    async def avaliar(self, colunas):
+        """
+        Pontua os alunos de uma requisição no próximo lote
+
+        Args:
+            colunas (dict): Entradas montadas por montar_colunas
+
+        Returns:
+            dict: Arrays 'nota_ajustada', 'desempenho' e 'classificacao' (resultado de pontuar_alunos)
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        self._fila.append((colunas, futuro, time.perf_counter()))
+        self.na_fila += len(colunas['notas'])
+        self._chegada.set()
+        if self.na_fila >= self.tamanho_maximo:
+            self._cheio.set()
+        return await futuro
+
+    def _retirar(self):
+        """Retira da fila as requisições do próximo lote (sempre ao menos uma)"""
+        quantidade = 0
+        for posicao, (colunas, _, _) in enumerate(self._fila):
+            if posicao and quantidade + len(colunas['notas']) > self.tamanho_maximo:
+                break
+            quantidade += len(colunas['notas'])
+        else:
+            posicao = len(self._fila)
+        lote, self._fila = self._fila[:posicao], self._fila[posicao:]
+        self.na_fila -= quantidade
+        if not self._fila:
+            self._chegada.clear()
+        if self.na_fila < self.tamanho_maximo:
+            self._cheio.clear()
+        return lote
+
+    def _pontuar(self, colunas):
+        inicio = time.perf_counter()
+        resultado = pontuar_alunos(self.sistema, **colunas)
+        return resultado, time.perf_counter() - inicio
+
+    async def _despachar(self):
+        laco = asyncio.get_running_loop()
+        while True:
+            await self._chegada.wait()
+            if not self._cheio.is_set():
+                try:
+                    await asyncio.wait_for(self._cheio.wait(), self.janela)
+                except asyncio.TimeoutError:
+                    pass
+
+            lote = self._retirar()
+            # Requisições canceladas (cliente desconectado) não entram no lote
+            lote = [item for item in lote if not item[1].done()]
+            if not lote:
+                continue
+            agora = time.perf_counter()
+            for _, _, chegada in lote:
+                self.espera.registrar(agora - chegada)
+
+            colunas = {nome: np.concatenate([item[0][nome] for item in lote]) for nome in lote[0][0]}
+            try:
+                resultado, segundos = await laco.run_in_executor(self._executor, self._pontuar, colunas)
+            except Exception as erro:
+                for _, futuro, _ in lote:
+                    if not futuro.done():
+                        futuro.set_exception(erro)
+                continue
+
+            self.lotes += 1
+            self.alunos += len(colunas['notas'])
+            self.inferencia.registrar(segundos)
+            inicio = 0
+            for colunas_requisicao, futuro, _ in lote:
+                fim = inicio + len(colunas_requisicao['notas'])
+                if not futuro.done():
+                    futuro.set_result({nome: valores[inicio:fim] for nome, valores in resultado.items()})
+                inicio = fim
+
+
+# === SERVIDOR HTTP ===
+
+def _resumo_latencia(histograma):
+    """Percentis de um histograma, em milissegundos"""
+    return {
+        'contagem': histograma.contagem,
+        'media_ms': 1000 * histograma.soma / histograma.contagem if histograma.contagem else 0.0,
+        'p50_ms': 1000 * histograma.percentil(0.50),
+        'p90_ms': 1000 * histograma.percentil(0.90),
+        'p95_ms': 1000 * histograma.percentil(0.95),
+        'p99_ms': 1000 * histograma.percentil(0.99),
+        'maximo_ms': 1000 * histograma.maximo
+    }
+
+
+def endereco_local(host):
+    """Confere se o endereço é de loopback (o serviço não é exposto à rede)"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ServicoAvaliacao:
+    """
+    Servidor HTTP/1.1 mínimo (conexões persistentes, corpo com Content-Length)
+
+    Args:
+        sistema (SistemaCompilado): Sistema fuzzy compilado
+        host (str): Endereço de loopback
+        porta (int): Porta TCP (0 escolhe uma livre)
+        janela (float): Janela de agrupamento, em segundos
+        lote_maximo (int): Alunos por lote de inferência
+        maximo_conexoes (int): Conexões simultâneas; as excedentes recebem 503
+        maximo_pendentes (int): Alunos aguardando inferência; acima disso as requisições recebem 503
+        maximo_alunos (int): Alunos por requisição
+        tamanho_maximo_corpo (int): Bytes do corpo de uma requisição
+    """
+
+    def __init__(self, sistema, host="127.0.0.1", porta=PORTA_PADRAO, janela=0.002, lote_maximo=1024,
+                 maximo_conexoes=256, maximo_pendentes=20000, maximo_alunos=10000,
+                 tamanho_maximo_corpo=8 * 1024 * 1024):
+        if not endereco_local(host):
+            raise ValueError(f"O serviço atende apenas no endereço local; {host} não é de loopback.")
+        self.sistema = sistema
+        self.host = host
+        self.porta = porta
+        self.janela = janela
+        self.lote_maximo = lote_maximo
+        self.maximo_conexoes = maximo_conexoes
+        self.maximo_pendentes = maximo_pendentes
+        self.maximo_alunos = maximo_alunos
+        self.tamanho_maximo_corpo = tamanho_maximo_corpo
+        self.base_regras = sistema.impressao_digital()[:16]
+
+        self.conexoes = 0
+        self.requisicoes = 0
+        self.recusadas = 0
+        self.erros = 0
+        self.latencia = Histograma()
+        self.agrupador = None
+        self.servidor = None
+        self.iniciado_em = None
+        # Conexões em atendimento: tarefa -> escritor (fechadas ao encerrar)
+        self._abertas = {}
+
+    async def iniciar(self):
+        """Abre a porta e inicia o agrupador; devolve o asyncio.Server"""
+        # Primeira avaliação fora das requisições (aquece caches e imports tardios)
+        pontuar_alunos(self.sistema, [5.0], [""], [""], [50.0], [5.0], [5.0], [5.0], ["Média"])
+        self.agrupador = AgrupadorLotes(self.sistema, self.janela, self.lote_maximo)
+        self.agrupador.iniciar()
+        self.servidor = await asyncio.start_server(self._atender, self.host, self.porta,
+                                                   limit=TAMANHO_MAXIMO_CABECALHO)
+        self.porta = self.servidor.sockets[0].getsockname()[1]
+        self.iniciado_em = time.monotonic()
+        return self.servidor
+
+    async def encerrar(self):
+        if self.servidor is not None:
+            self.servidor.close()
+            # Conexões ociosas à espera da próxima requisição terminam com o fechamento
+            for escritor in self._abertas.values():
+                escritor.close()
+            await asyncio.gather(*self._abertas, return_exceptions=True)
+            await self.servidor.wait_closed()
+        if self.agrupador is not None:
+            await self.agrupador.encerrar()
+
+    # --- Rotas ---
+
+    def saude(self):
+        return {
+            'status': "ok",
+            'base_regras': self.base_regras,
+            'conexoes': self.conexoes,
+            'alunos_na_fila': self.agrupador.na_fila,
+            'tempo_ativo_s': round(time.monotonic() - self.iniciado_em, 3)
+        }
+
+    def metricas(self):
+        agrupador = self.agrupador
+        return {
+            'requisicoes': self.requisicoes,
+            'recusadas': self.recusadas,
+            'erros': self.erros,
+            'alunos': agrupador.alunos,
+            'lotes': agrupador.lotes,
+            'alunos_por_lote': agrupador.alunos / agrupador.lotes if agrupador.lotes else 0.0,
+            'latencia': {
+                'requisicao': _resumo_latencia(self.latencia),
+                'espera_lote': _resumo_latencia(agrupador.espera),
+                'inferencia': _resumo_latencia(agrupador.inferencia)
+            }
+        }
+
+    async def avaliar(self, corpo):
+        """Rota POST /avaliar: devolve o resultado de um aluno (objeto) ou de vários (lista)"""
+        try:
+            dados = json.loads(corpo)
+        except (UnicodeDecodeError, json.JSONDecodeError) as erro:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, f"JSON inválido: {erro}.") from None
+
+        individual = isinstance(dados, dict)
+        alunos = [dados] if individual else dados
+        if not isinstance(alunos, list) or not alunos:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Envie um aluno (objeto) ou uma lista de alunos.")
+        if len(alunos) > self.maximo_alunos:
+            raise RequisicaoInvalida(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                     f"No máximo {self.maximo_alunos} alunos por requisição.")
+        if self.agrupador.na_fila + len(alunos) > self.maximo_pendentes:
+            raise RequisicaoInvalida(HTTPStatus.SERVICE_UNAVAILABLE, "Serviço sobrecarregado; tente novamente.")
+
+        resultado = await self.agrupador.avaliar(montar_colunas(alunos))
+        respostas = []
+        for indice, aluno in enumerate(alunos):
+            resposta = {'Matricula': aluno['Matricula']} if 'Matricula' in aluno else {}
+            resposta['Nota_Ajustada'] = float(resultado['nota_ajustada'][indice])
+            resposta['Desempenho'] = float(resultado['desempenho'][indice])
+            resposta['Classificacao'] = str(resultado['classificacao'][indice])
+            respostas.append(resposta)
+        return respostas[0] if individual else respostas
+
+    async def _rotear(self, metodo, caminho, corpo):
+        caminho = caminho.split("?", 1)[0]
+        rotas = {"/avaliar": "POST", "/saude": "GET", "/metricas": "GET"}
+        if caminho not in rotas:
+            raise RequisicaoInvalida(HTTPStatus.NOT_FOUND, f"Rota desconhecida: {caminho}.")
+        if metodo != rotas[caminho] and not (metodo == "HEAD" and rotas[caminho] == "GET"):
+            raise RequisicaoInvalida(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {rotas[caminho]} em {caminho}.")
+        if caminho == "/avaliar":
+            return await self.avaliar(corpo)
+        return self.saude() if caminho == "/saude" else self.metricas()
+
+    # --- Protocolo ---
+
+    async def _ler_requisicao(self, leitor):
+        """
+        Lê uma requisição da conexão
+
+        Returns:
+            tuple: (método, caminho, versão, cabeçalhos, corpo), ou None se a conexão terminou
+        """
+        try:
+            cabecalho = await asyncio.wait_for(leitor.readuntil(b"\r\n\r\n"), TEMPO_OCIOSO)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise RequisicaoInvalida(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeçalho muito grande.") from None
+
+        linhas = cabecalho.decode("latin-1").split("\r\n")
+        try:
+            metodo, caminho, versao = linhas[0].split(" ")
+        except ValueError:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Linha de requisição inválida.") from None
+        cabecalhos = {}
+        for linha in linhas[1:]:
+            if linha:
+                nome, _, valor = linha.partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+
+        if "chunked" in cabecalhos.get("transfer-encoding", "").lower():
+            raise RequisicaoInvalida(HTTPStatus.LENGTH_REQUIRED, "Envie o corpo com Content-Length.")
+        try:
+            tamanho = int(cabecalhos.get("content-length", "0"))
+        except ValueError:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Content-Length inválido.") from None
+        if tamanho > self.tamanho_maximo_corpo:
+            raise RequisicaoInvalida(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                     f"Corpo maior que {self.tamanho_maximo_corpo} bytes.")
+        try:
+            corpo = await asyncio.wait_for(leitor.readexactly(tamanho), TEMPO_OCIOSO) if tamanho else b""
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        return metodo, caminho, versao, cabecalhos, corpo
+
+    @staticmethod
+    async def _responder(escritor, status, conteudo, manter=True, cabecalhos_extras=(), sem_corpo=False):
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode("utf-8")
+        linhas = [f"HTTP/1.1 {status.value} {status.phrase}",
+                  "Content-Type: application/json; charset=utf-8",
+                  f"Content-Length: {len(corpo)}",
+                  f"Connection: {'keep-alive' if manter else 'close'}",
+                  *cabecalhos_extras]
+        escritor.write(("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1") + (b"" if sem_corpo else corpo))
+        await escritor.drain()
+
+    async def _atender(self, leitor, escritor):
+        """Atende uma conexão: requisições em sequência até o cliente encerrar"""
+        if self.conexoes >= self.maximo_conexoes:
+            self.recusadas += 1
+            try:
+                await self._responder(escritor, HTTPStatus.SERVICE_UNAVAILABLE,
+                                      {'erro': "Conexões demais; tente novamente."}, manter=False,
+                                      cabecalhos_extras=["Retry-After: 1"])
+            except ConnectionError:
+                pass
+            escritor.close()
+            return
+
+        self.conexoes += 1
+        self._abertas[asyncio.current_task()] = escritor
+        try:
+            while True:
+                try:
+                    requisicao = await self._ler_requisicao(leitor)
+                except RequisicaoInvalida as erro:
+                    # Não dá para saber onde começa a próxima requisição: responde e fecha
+                    self.erros += 1
+                    await self._responder(escritor, HTTPStatus(erro.status), {'erro': str(erro)}, manter=False)
+                    break
+                if requisicao is None:
+                    break
+
+                inicio = time.perf_counter()
+                metodo, caminho, versao, cabecalhos, corpo = requisicao
+                conexao = cabecalhos.get("connection", "").lower()
+                manter = conexao != "close" if versao == "HTTP/1.1" else conexao == "keep-alive"
+                self.requisicoes += 1
+                extras = []
+                try:
+                    status, conteudo = HTTPStatus.OK, await self._rotear(metodo, caminho, corpo)
+                except RequisicaoInvalida as erro:
+                    status, conteudo = HTTPStatus(erro.status), {'erro': str(erro)}
+                    if status == HTTPStatus.SERVICE_UNAVAILABLE:
+                        self.recusadas += 1
+                        extras.append("Retry-After: 1")
+                    else:
+                        self.erros += 1
+                except Exception as erro:
+                    self.erros += 1
+                    status, conteudo = HTTPStatus.INTERNAL_SERVER_ERROR, {'erro': f"Erro na avaliação: {erro}"}
+
+                await self._responder(escritor, status, conteudo, manter, extras, sem_corpo=(metodo == "HEAD"))
+                if caminho.startswith("/avaliar"):
+                    self.latencia.registrar(time.perf_counter() - inicio)
+                if not manter:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.conexoes -= 1
+            self._abertas.pop(asyncio.current_task(), None)
+            escritor.close()
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de avaliação fuzzy de alunos")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de loopback (padrão: %(default)s)")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO, help="Porta TCP (padrão: %(default)s)")
+    parser.add_argument("--janela-ms", type=float, default=2.0,
+                        help="Espera por outras requisições antes de avaliar um lote (padrão: %(default)s ms)")
+    parser.add_argument("--lote-maximo", type=int, default=1024, help="Alunos por lote de inferência")
+    parser.add_argument("--maximo-conexoes", type=int, default=256, help="Conexões simultâneas")
+    parser.add_argument("--maximo-pendentes", type=int, default=20000,
+                        help="Alunos aguardando inferência antes de recusar requisições (503)")
+    parser.add_argument("--maximo-alunos", type=int, default=10000, help="Alunos por requisição")
+    parser.add_argument("--regras", default=None,
+                        help="Definição da base de regras em JSON ou TOML (padrão: modules/regras_padrao.json)")
+    args = parser.parse_args(argumentos)
+
+    if not endereco_local(args.host):
+        parser.error(f"o serviço atende apenas no endereço local; {args.host} não é de loopback")
+    if not math.isfinite(args.janela_ms) or args.janela_ms < 0:
+        parser.error("--janela-ms deve ser um número não negativo")
+
+    servico = ServicoAvaliacao(carregar_sistema(arquivo_regras=args.regras), args.host, args.porta,
+                               args.janela_ms / 1000, args.lote_maximo, args.maximo_conexoes,
+                               args.maximo_pendentes, args.maximo_alunos)
+
+    async def executar():
+        await servico.iniciar()
+        print(f"Atendendo em http://{servico.host}:{servico.porta} (base de regras {servico.base_regras})",
+              flush=True)
+        try:
+            await servico.servidor.serve_forever()
+        finally:
+            await servico.encerrar()
+
+    try:
+        asyncio.run(executar())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from modules import historico
+from modules.motor_compilado import carregar_sistema
+
+
+@pytest.fixture(scope="session")
+def sistema():
+    """Sistema compilado padrão, construído uma vez por sessão (sem ler nem gravar o cache em disco)"""
+    return carregar_sistema(arquivo=None)
+
+
+@pytest.fixture
+def entradas():
+    """Entradas aleatórias do sistema fuzzy; as primeiras caem sobre pontos do universo amostrado"""
+    gerador = np.random.default_rng(7)
+    n = 60
+    entradas = {
+        'nota': gerador.uniform(0, 10, n),
+        'frequencia': gerador.uniform(0, 100, n),
+        'participacao': gerador.uniform(0, 10, n),
+        'socioemocional': gerador.uniform(0, 10, n),
+        'contexto': gerador.uniform(0, 10, n),
+        'motivacao': gerador.choice([2.0, 5.0, 9.0], n)
+    }
+    for nome, valores in entradas.items():
+        valores[:15] = np.round(valores[:15], -1 if nome == 'frequencia' else 0)
+    return entradas
+
+
+@pytest.fixture
+def diretorio(tmp_path, monkeypatch):
+    """Diretório de trabalho temporário para o histórico (CSV), com os índices em memória zerados"""
+    monkeypatch.chdir(tmp_path)
+    historico.configurar_backend("csv")
+    historico._indices_linhas.clear()
+    historico._cursores_paginas.update(banco=None, ids={})
+    yield tmp_path
+    historico.configurar_backend("csv")
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from modules.analise import CAMPOS_DADOS, adicionar_analise_personalizada, analise_personalizada, gerar_analises
+from modules.avaliacao import CLASSIFICACOES
+
+
+def _tabela(quantidade, semente=3):
+    gerador = np.random.default_rng(semente)
+    tabela = pd.DataFrame({coluna: gerador.uniform(0, 10, quantidade) for coluna in
+                           ('Nota_Teoria1', 'Nota_Teoria2', 'Nota_Pratica', 'Nota_Grupo', 'Participacao',
+                            'Socioemocional', 'Contexto', 'Motivacao')})
+    tabela['Frequencia'] = gerador.uniform(0, 100, quantidade)
+    tabela['Motivacao_Cat'] = gerador.choice(["", "Alta", "Baixa"], quantidade)
+    tabela['Perfil_Aluno'] = gerador.choice(["", "Visual", "Prático"], quantidade)
+    tabela['Metodo_Ensino'] = gerador.choice(["", "Visual", "Expositivo"], quantidade)
+    tabela['Desempenho'] = gerador.uniform(0, 100, quantidade)
+    tabela['Classificacao'] = gerador.choice([nome for _, nome in CLASSIFICACOES] + ["Outra"], quantidade)
+    return tabela
+
+
+def _dados(linha):
+    dados = {campo: linha[coluna] for coluna, campo in CAMPOS_DADOS.items()}
+    return dados, linha['Desempenho'], linha['Classificacao']
+
+
+def test_lote_igual_a_analise_de_cada_aluno():
+    tabela = _tabela(300)
+
+    textos = gerar_analises(tabela)
+
+    assert len(textos) == 300
+    for texto, (_, linha) in zip(textos, tabela.iterrows()):
+        assert texto == analise_personalizada(*_dados(linha))
+
+
+def test_observacoes_discrepancia_e_recomendacoes():
+    tabela = {'Nota_Teoria1': [3, 9], 'Nota_Teoria2': [8, 9], 'Frequencia': [50, 90],
+              'Perfil_Aluno': ["Visual", "Visual"], 'Metodo_Ensino': ["Expositivo", None],
+              'Desempenho': [40, 90], 'Classificacao': ["Insuficiente", "Desconhecida"]}
+
+    primeiro, segundo = gerar_analises(tabela)
+
+    assert "evolução significativa" in primeiro and "baixa frequência" in primeiro
+    assert "método de ensino Expositivo apresenta discrepância com o perfil de aprendizagem Visual" in primeiro
+    assert "Criar plano de recuperação" in primeiro
+    assert "evolução significativa" not in segundo and "discrepância" not in segundo
+    assert segundo.endswith("\nRecomendações:\n")
+
+
+def test_adicionar_insere_no_fim_do_texto():
+    class Texto:
+        def __init__(self):
+            self.inseridos = []
+
+        def insert(self, posicao, texto):
+            self.inseridos.append((posicao, texto))
+
+    texto = Texto()
+    dados, resultado, classificacao = _dados(_tabela(1).iloc[0])
+
+    adicionar_analise_personalizada(texto, dados, resultado, classificacao)
+
+    assert texto.inseridos == [("end", analise_personalizada(dados, resultado, classificacao))]
@@ -0,0 +1,14 @@
+import numpy as np
+
+from modules.avaliacao import classificar_desempenho
+
+
+def test_classificacao_nos_limites():
+    assert classificar_desempenho(0.0) == "Insuficiente"
+    assert classificar_desempenho(100.0) == "Excelente com equilíbrio"
+    assert list(classificar_desempenho([0.0, 100.0])) == ["Insuficiente", "Excelente com equilíbrio"]
+
+
+def test_nan_nao_e_classificado():
+    assert classificar_desempenho(np.nan) == ""
+    assert list(classificar_desempenho(np.array([np.nan, 100.0]))) == ["", "Excelente com equilíbrio"]
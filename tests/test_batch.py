@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from modules import batch
+from modules.benchmark import gerar_turma
+
+
+@pytest.fixture(autouse=True)
+def sistema_da_sessao(monkeypatch, sistema):
+    """A linha de comando usa o sistema da sessão em vez do cache em disco do usuário"""
+    monkeypatch.setattr(batch, "carregar_sistema", lambda **opcoes: sistema)
+
+
+def test_avalia_o_arquivo(tmp_path, sistema):
+    turma = gerar_turma(40, semente=3)
+    turma.to_csv(tmp_path / "alunos.csv", index=False)
+
+    assert batch.main([str(tmp_path / "alunos.csv"), str(tmp_path / "saida.csv"), "--tamanho-bloco", "7",
+                       "--silencioso"]) == 0
+
+    saida = pd.read_csv(tmp_path / "saida.csv", dtype={"Matricula": str})
+    esperado, rejeitados = batch.avaliar_bloco(sistema, turma)
+    assert rejeitados == []
+    assert list(saida["Matricula"]) == list(turma["Matricula"])
+    pd.testing.assert_series_equal(saida["Desempenho"], esperado["Desempenho"].reset_index(drop=True))
+    assert list(saida["Classificacao"]) == list(esperado["Classificacao"])
+
+
+def test_trabalhadores_produzem_a_mesma_saida(tmp_path):
+    gerar_turma(30, semente=4).to_csv(tmp_path / "alunos.csv", index=False)
+
+    for trabalhadores in ("1", "2"):
+        batch.main([str(tmp_path / "alunos.csv"), str(tmp_path / f"saida{trabalhadores}.csv"),
+                    "--tamanho-bloco", "8", "--trabalhadores", trabalhadores, "--silencioso"])
+
+    assert (tmp_path / "saida1.csv").read_text() == (tmp_path / "saida2.csv").read_text()
+
+
+def test_linhas_invalidas_sao_relatadas_e_ignoradas(tmp_path, capsys):
+    turma = gerar_turma(6, semente=5)
+    turma["Frequencia"] = turma["Frequencia"].astype(object)
+    turma["Nota_Pratica"] = turma["Nota_Pratica"].astype(object)
+    turma.loc[1, "Frequencia"] = ""
+    turma.loc[2, "Nota_Pratica"] = "abc"
+    turma.loc[3, "Frequencia"] = 150
+    turma.loc[4, "Motivacao_Cat"] = "Xyz"
+    turma.to_csv(tmp_path / "alunos.csv", index=False)
+
+    assert batch.main([str(tmp_path / "alunos.csv"), str(tmp_path / "saida.csv"), "--silencioso"]) == 0
+
+    erros = capsys.readouterr().err
+    assert "Linha 3: O campo Frequencia não pode estar vazio." in erros
+    assert "Linha 4: O valor 'abc' no campo Nota_Pratica não é um número válido." in erros
+    assert "Linha 5: O valor do campo Frequencia deve estar entre 0 e 100." in erros
+    assert "Linha 6: O campo Motivacao_Cat deve ser" in erros
+    saida = pd.read_csv(tmp_path / "saida.csv", dtype={"Matricula": str})
+    assert list(saida["Matricula"]) == [turma.loc[0, "Matricula"], turma.loc[5, "Matricula"]]
+    assert "" not in set(saida["Classificacao"])
+
+
+def test_colunas_ausentes_nao_criam_saida(tmp_path, capsys):
+    (tmp_path / "alunos.csv").write_text("Matricula,Nota_Teoria1\n1,5\n")
+    (tmp_path / "saida.csv").write_text("anterior")
+
+    assert batch.main([str(tmp_path / "alunos.csv"), str(tmp_path / "saida.csv")]) == 1
+
+    assert "Colunas ausentes" in capsys.readouterr().err
+    assert (tmp_path / "saida.csv").read_text() == "anterior"
+    assert sorted(caminho.name for caminho in tmp_path.iterdir()) == ["alunos.csv", "saida.csv"]
@@ -0,0 +1,50 @@
+import json
+
+from modules import batch, benchmark
+
+
+def test_medir_descarta_o_aquecimento():
+    chamadas = []
+
+    medida = benchmark.medir(lambda: chamadas.append(1), repeticoes=5, aquecimento=2)
+
+    assert len(chamadas) == 7
+    assert medida['repeticoes'] == 5 and medida['minimo'] <= medida['segundos'] <= medida['maximo']
+
+
+def test_lote_avaliado_em_blocos(sistema, monkeypatch):
+    tamanhos = []
+    avaliar_bloco = batch.avaliar_bloco
+    monkeypatch.setattr(batch, "avaliar_bloco",
+                        lambda sistema, bloco: tamanhos.append(len(bloco)) or avaliar_bloco(sistema, bloco))
+
+    resultados = benchmark.medir_lote(sistema, tamanhos=(25,), repeticoes=2, tamanho_bloco=10)
+
+    assert tamanhos == [10, 10, 5] * 2
+    assert resultados['lote_25']['alunos'] == 25
+
+
+def test_comparar_aponta_regressao():
+    anterior = {'resultados': {'a': {'segundos': 1.0}, 'b': {'segundos': 1.0}}}
+    atual = {'resultados': {'a': {'segundos': 1.1}, 'b': {'segundos': 1.5}, 'c': {'segundos': 9.0}}}
+
+    linhas = benchmark.comparar(atual, anterior, tolerancia=0.2)
+
+    assert [(nome, regressao) for nome, _, _, _, regressao in linhas] == [('a', False), ('b', True)]
+
+
+def test_linha_de_comando(tmp_path, sistema, monkeypatch, capsys):
+    monkeypatch.setattr("modules.motor_compilado.carregar_sistema", lambda **opcoes: sistema)
+    saida = tmp_path / "benchmark.json"
+
+    assert benchmark.main(["--grupos", "lote", "--tamanhos-lote", "30", "--tamanho-bloco", "8",
+                           "--saida", str(saida)]) == 0
+
+    relatorio = json.loads(saida.read_text(encoding="utf-8"))
+    assert list(relatorio['resultados']) == ["lote_30"]
+
+    anterior = tmp_path / "anterior.json"
+    anterior.write_text(json.dumps({'resultados': {'lote_30': {'segundos': 1e-9}}}), encoding="utf-8")
+    assert benchmark.main(["--grupos", "lote", "--tamanhos-lote", "30", "--saida", str(saida),
+                           "--comparar", str(anterior)]) == 1
+    assert "REGRESSÃO" in capsys.readouterr().out
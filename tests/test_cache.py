@@ -0,0 +1,63 @@
+from modules.cache import CacheAvaliacoes
+
+
+class Contador:
+    """Função de avaliação que registra as entradas recebidas"""
+
+    def __init__(self):
+        self.chamadas = []
+
+    def __call__(self, **entradas):
+        self.chamadas.append(entradas)
+        return sum(entradas.values())
+
+
+def test_chave_usa_valores_exatos():
+    funcao = Contador()
+    cache = CacheAvaliacoes(funcao, "base")
+
+    assert cache.avaliar(nota=7.04, frequencia=80.0) == 87.04
+    assert cache.avaliar(nota=7.06, frequencia=80.0) == 87.06
+    assert cache.avaliar(frequencia=80.0, nota=7.04) == 87.04
+    assert funcao.chamadas == [{'nota': 7.04, 'frequencia': 80.0}, {'nota': 7.06, 'frequencia': 80.0}]
+    assert cache.estatisticas()['acertos'] == 1
+
+
+def test_descarta_o_usado_ha_mais_tempo():
+    funcao = Contador()
+    cache = CacheAvaliacoes(funcao, "base", capacidade=2)
+    for valor in (1.0, 2.0, 1.0, 3.0):
+        cache.avaliar(nota=valor)
+
+    cache.avaliar(nota=1.0)
+    cache.avaliar(nota=2.0)
+
+    assert [chamada['nota'] for chamada in funcao.chamadas] == [1.0, 2.0, 3.0, 2.0]
+
+
+def test_persistencia_separada_por_base(tmp_path):
+    arquivo = str(tmp_path / "cache.db")
+    cache = CacheAvaliacoes(Contador(), "base", arquivo=arquivo)
+    cache.avaliar(nota=5.5)
+    cache.fechar()
+
+    funcao = Contador()
+    reaberto = CacheAvaliacoes(funcao, "base", arquivo=arquivo)
+    outra_base = CacheAvaliacoes(funcao, "outra", arquivo=arquivo)
+
+    assert reaberto.avaliar(nota=5.5) == 5.5
+    assert reaberto.estatisticas()['acertos_disco'] == 1
+    assert outra_base.avaliar(nota=5.5) == 5.5
+    assert len(funcao.chamadas) == 1
+    reaberto.fechar()
+    outra_base.fechar()
+
+
+def test_cria_o_diretorio_do_banco(tmp_path):
+    arquivo = tmp_path / "cache" / "usuario" / "cache.db"
+
+    cache = CacheAvaliacoes(Contador(), "base", arquivo=str(arquivo))
+    cache.avaliar(nota=1.0)
+    cache.fechar()
+
+    assert arquivo.exists()
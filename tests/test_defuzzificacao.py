@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+import skfuzzy as fuzz
+
+from modules.defuzzificacao import defuzzificar_analitico
+
+
+@pytest.mark.parametrize("metodo", ['centroid', 'bisector', 'mom'])
+def test_igual_ao_skfuzzy_em_universo_fino(metodo, sistema):
+    cortes = np.random.default_rng(5).uniform(0, 1, (40, len(sistema.termos_saida)))
+    cortes[:5, 1:] = 0.0
+    x = np.linspace(*sistema.limites_saida, 200001)
+    mfs = [fuzz.trapmf(x, pontos) for pontos in sistema.pontos_saida]
+
+    esperado = [fuzz.defuzz(x, np.max([np.minimum(corte, mf) for corte, mf in zip(linha, mfs)], axis=0), metodo)
+                for linha in cortes]
+
+    np.testing.assert_allclose(defuzzificar_analitico(sistema.pontos_saida, cortes, metodo, sistema.limites_saida),
+                               esperado, rtol=0, atol=1e-3)
+
+
+def test_sem_ativacao_e_nan(sistema):
+    cortes = np.zeros((1, len(sistema.termos_saida)))
+
+    assert np.isnan(defuzzificar_analitico(sistema.pontos_saida, cortes, 'centroid', sistema.limites_saida)[0])
+
+
+def test_metodo_nao_suportado(sistema):
+    with pytest.raises(ValueError):
+        defuzzificar_analitico(sistema.pontos_saida, np.ones((1, len(sistema.termos_saida))), 'som')
@@ -0,0 +1,123 @@
+import json
+
+import numpy as np
+import pytest
+from skfuzzy import control as ctrl
+
+from modules.fuzzy_logic import (ARQUIVO_REGRAS_PADRAO, DEFINICAO_PADRAO, _interpretar_condicao, avaliar_lote,
+                                 carregar_definicao, configurar_sistema_fuzzy, defuzzificar_lote)
+
+METODOS = ['centroid', 'bisector', 'mom', 'som', 'lom']
+
+# A simulação do skfuzzy usa chamadas do NumPy marcadas como obsoletas
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning:skfuzzy.*")
+
+
+def _simular(sistema_ctrl, entradas):
+    """Referência: uma ControlSystemSimulation do skfuzzy por aluno"""
+    resultado = np.empty(len(entradas['nota']))
+    for indice in range(len(resultado)):
+        simulacao = ctrl.ControlSystemSimulation(sistema_ctrl)
+        simulacao.inputs({nome: valores[indice] for nome, valores in entradas.items()})
+        simulacao.compute()
+        resultado[indice] = simulacao.output['desempenho']
+    return resultado
+
+
+@pytest.mark.parametrize("metodo", METODOS)
+def test_avaliar_lote_igual_a_simulacao(metodo, entradas):
+    sistema_ctrl, desempenho = configurar_sistema_fuzzy()
+    desempenho.defuzzify_method = metodo
+
+    np.testing.assert_allclose(avaliar_lote(sistema_ctrl, **entradas), _simular(sistema_ctrl, entradas),
+                               rtol=0, atol=1e-9)
+
+
+def test_avaliar_lote_mantem_formato_das_entradas(entradas):
+    sistema_ctrl, _ = configurar_sistema_fuzzy()
+    grade = {nome: valores.reshape(6, 10) for nome, valores in entradas.items()}
+
+    resultado = avaliar_lote(sistema_ctrl, **grade)
+
+    assert resultado.shape == (6, 10)
+    np.testing.assert_array_equal(resultado.ravel(), avaliar_lote(sistema_ctrl, **entradas))
+
+
+def test_avaliar_lote_com_broadcast_entre_entradas():
+    sistema_ctrl, _ = configurar_sistema_fuzzy()
+    notas = np.linspace(0, 10, 4)[:, None]
+    frequencias = np.linspace(0, 100, 5)[None, :]
+
+    resultado = avaliar_lote(sistema_ctrl, notas, frequencias, 6.0, 7.0, 5.0, 9.0, tamanho_bloco=3)
+
+    assert resultado.shape == (4, 5)
+    esperado = avaliar_lote(sistema_ctrl, np.repeat(notas, 5, axis=1).ravel(), np.tile(frequencias, (4, 1)).ravel(),
+                            6.0, 7.0, 5.0, 9.0)
+    np.testing.assert_array_equal(resultado.ravel(), esperado)
+
+
+@pytest.mark.parametrize("metodo", ['centroid', 'bisector'])
+def test_defuzzificar_lote_sem_ativacao_e_nan(metodo):
+    _, desempenho = configurar_sistema_fuzzy()
+    mfs = [termo.mf for termo in desempenho.terms.values()]
+    cortes = np.array([np.zeros(len(mfs)), np.full(len(mfs), 0.5)])
+
+    resultado = defuzzificar_lote(desempenho.universe, mfs, cortes, metodo)
+
+    assert np.isnan(resultado[0])
+    assert 0 <= resultado[1] <= 100
+
+
+def test_precedencia_da_condicao():
+    arvore = _interpretar_condicao("~nota[bom] | nota[regular] & (frequencia[alta] | frequencia[baixa])",
+                                   DEFINICAO_PADRAO['variaveis'])
+
+    assert arvore == ('ou', ('nao', ('termo', 'nota', 'bom')),
+                      ('e', ('termo', 'nota', 'regular'),
+                       ('ou', ('termo', 'frequencia', 'alta'), ('termo', 'frequencia', 'baixa'))))
+
+
+@pytest.mark.parametrize("condicao", ["nota[bom] &", "(nota[bom]", "nota[bom] nota[regular]", "nota[otimo]",
+                                      "desempenho[insuficiente]", "nota bom"])
+def test_condicao_invalida(condicao):
+    with pytest.raises(ValueError):
+        _interpretar_condicao(condicao, DEFINICAO_PADRAO['variaveis'])
+
+
+def test_definicao_invalida_indica_a_regra(tmp_path):
+    with open(ARQUIVO_REGRAS_PADRAO, encoding="utf-8") as entrada:
+        definicao = json.load(entrada)
+    definicao['regras'][2]['entao'] = "desempenho[inexistente]"
+    arquivo = tmp_path / "regras.json"
+    arquivo.write_text(json.dumps(definicao), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Regra 3"):
+        carregar_definicao(str(arquivo))
+
+
+def test_definicao_em_toml(tmp_path):
+    arquivo = tmp_path / "regras.toml"
+    arquivo.write_text('''
+regras = [{ se = "nota[bom] & ~frequencia[baixa]", entao = ["saida[alto] % 0.5"], peso = 2 }]
+
+[variaveis.nota]
+tipo = "entrada"
+limites = [0, 10]
+termos = { bom = ["trimf", [5, 7, 9]] }
+
+[variaveis.frequencia]
+tipo = "entrada"
+limites = [0, 100]
+termos = { baixa = ["trapmf", [0, 0, 50, 60]] }
+
+[variaveis.saida]
+tipo = "saida"
+limites = [0, 1]
+termos = { alto = ["trimf", [0, 1, 1]] }
+''', encoding="utf-8")
+
+    definicao = carregar_definicao(str(arquivo))
+
+    (regra,) = definicao['regras']
+    assert regra['consequentes'] == [('saida', 'alto', 0.5)] and regra['peso'] == 2.0
+    assert definicao['variaveis']['saida']['defuzzificacao'] == 'centroid'
@@ -0,0 +1,54 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from modules.grafico import atualizar_grafico, capturar_fundo, montar_grafico, redesenhar_dinamicos
+
+
+def _montar(sistema):
+    grafico = montar_grafico(sistema)
+    canvas = FigureCanvasAgg(grafico['figura'])
+    canvas.mpl_connect('draw_event', lambda evento: capturar_fundo(grafico, canvas))
+    return grafico, canvas
+
+
+def _avaliar(sistema, grafico, nota):
+    entradas = {'nota': nota, 'frequencia': 80.0, 'participacao': 7.0, 'socioemocional': 6.0,
+                'contexto': 5.0, 'motivacao': 9.0}
+    resultado = float(sistema.avaliar(**entradas))
+    atualizar_grafico(grafico, resultado, sistema.graus_categorias(resultado),
+                      sistema.saida_agregada(sistema.ativacoes(**entradas)[0]))
+    return resultado
+
+
+def test_primeiro_desenho_captura_o_fundo(sistema):
+    grafico, canvas = _montar(sistema)
+    assert grafico['fundo'] is None
+
+    _avaliar(sistema, grafico, 6.0)
+    redesenhar_dinamicos(grafico, canvas)
+
+    assert grafico['fundo'] is not None
+    assert all(artista.get_animated() for artista in grafico['dinamicos'])
+
+
+def test_blitting_igual_ao_desenho_completo(sistema):
+    grafico, canvas = _montar(sistema)
+    _avaliar(sistema, grafico, 2.0)
+    redesenhar_dinamicos(grafico, canvas)
+    resultado = _avaliar(sistema, grafico, 9.0)
+    redesenhar_dinamicos(grafico, canvas)
+
+    completo, canvas_completo = _montar(sistema)
+    _avaliar(sistema, completo, 9.0)
+    canvas_completo.draw()
+
+    assert grafico['rotulo_resultado'].get_text() == f' Resultado: {resultado:.1f}'
+    np.testing.assert_array_equal(np.asarray(canvas.buffer_rgba()), np.asarray(canvas_completo.buffer_rgba()))
+
+
+def test_sem_saida_agregada_a_area_fica_oculta(sistema):
+    grafico, canvas = _montar(sistema)
+    atualizar_grafico(grafico, 50.0, np.zeros(len(sistema.termos_saida)))
+
+    assert not grafico['saida_agregada'].get_visible()
+    assert grafico['linha_resultado'].get_xdata()[0] == 50.0
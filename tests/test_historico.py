@@ -0,0 +1,170 @@
+import csv
+import os
+from multiprocessing import Process
+
+import numpy as np
+import pytest
+
+from modules import historico
+from modules.historico import (COLUNAS_HISTORICO, anexar_registros, carregar_pagina, codificar_rastro,
+                               contar_registros, decodificar_rastro, montar_registro)
+
+
+def _registros(quantidade, prefixo="m"):
+    return [{coluna: f"{prefixo}{indice}" for coluna in COLUNAS_HISTORICO} for indice in range(quantidade)]
+
+
+def _linhas(arquivo=historico.ARQUIVO_HISTORICO):
+    with open(arquivo, newline="", encoding="utf-8") as entrada:
+        return list(csv.reader(entrada))
+
+
+def _gravar_em_outro_processo(prefixo):
+    for registro in _registros(60, prefixo):
+        anexar_registros([registro])
+
+
+def test_cria_cabecalho_e_acrescenta(diretorio):
+    anexar_registros(_registros(2))
+    anexar_registros(_registros(3, "n"))
+
+    linhas = _linhas()
+    assert linhas[0] == COLUNAS_HISTORICO
+    assert [linha[0] for linha in linhas[1:]] == ["m0", "m1", "n0", "n1", "n2"]
+
+
+def test_linha_incompleta_nao_e_emendada(diretorio):
+    anexar_registros(_registros(1))
+    with open(historico.ARQUIVO_HISTORICO, "a", encoding="utf-8") as arquivo:
+        arquivo.write("interrompida,")
+
+    anexar_registros(_registros(1, "n"))
+
+    assert [linha[0] for linha in _linhas()[1:]] == ["m0", "interrompida", "n0"]
+
+
+def test_gravacao_parcial_e_completada(diretorio, monkeypatch):
+    gravar = os.write
+    monkeypatch.setattr(os, "write", lambda descritor, dados: gravar(descritor, bytes(dados[:7])))
+
+    anexar_registros(_registros(3))
+
+    monkeypatch.setattr(os, "write", gravar)
+    assert [linha[0] for linha in _linhas()[1:]] == ["m0", "m1", "m2"]
+
+
+def test_gravacao_sem_progresso_falha(diretorio, monkeypatch):
+    anexar_registros(_registros(1))
+    monkeypatch.setattr(os, "write", lambda descritor, dados: 0)
+
+    with pytest.raises(OSError):
+        anexar_registros(_registros(1, "n"))
+
+
+def test_historico_antigo_recebe_colunas_novas(diretorio):
+    antigas = COLUNAS_HISTORICO[:12]
+    with open(historico.ARQUIVO_HISTORICO, "w", encoding="utf-8") as arquivo:
+        arquivo.write(",".join(antigas) + "\n" + ",".join(["a"] * 12) + "\n")
+
+    anexar_registros(_registros(1))
+
+    linhas = _linhas()
+    assert linhas[0] == COLUNAS_HISTORICO
+    assert linhas[1] == ["a"] * 12 + [""] * (len(COLUNAS_HISTORICO) - 12)
+    assert linhas[2][0] == "m0"
+
+
+@pytest.mark.skipif(historico.fcntl is None, reason="trava compartilhada só com fcntl")
+def test_migracao_com_gravacoes_simultaneas_nao_perde_linhas(diretorio):
+    antigas = COLUNAS_HISTORICO[:12]
+    with open(historico.ARQUIVO_HISTORICO, "w", encoding="utf-8") as arquivo:
+        arquivo.write(",".join(antigas) + "\n" + (",".join(["a"] * 12) + "\n") * 5000)
+
+    processos = [Process(target=_gravar_em_outro_processo, args=(f"p{numero}_",)) for numero in range(3)]
+    for processo in processos:
+        processo.start()
+    for processo in processos:
+        processo.join()
+
+    linhas = _linhas()
+    assert linhas[0] == COLUNAS_HISTORICO
+    assert len(linhas) == 1 + 5000 + 3 * 60
+    assert {len(linha) for linha in linhas} == {len(COLUNAS_HISTORICO)}
+
+
+def test_rastro_gravado_e_lido_de_volta(sistema, entradas):
+    rastro = sistema.rastro(**{nome: valores[:1] for nome, valores in entradas.items()})[0]
+
+    texto = montar_registro({'rastro': rastro})["Rastro"]
+
+    assert texto == codificar_rastro(rastro)
+    np.testing.assert_allclose(decodificar_rastro(texto), rastro, rtol=1e-5, atol=1e-12)
+    assert codificar_rastro(None) == ""
+    assert decodificar_rastro("") is None and decodificar_rastro("x;1") is None
+
+
+def test_paginas_do_csv(diretorio):
+    anexar_registros(_registros(25))
+    anexar_registros(_registros(2, "n"))
+
+    assert contar_registros() == 27
+    assert [linha[0] for linha in carregar_pagina(20, 10)] == ["m20", "m21", "m22", "m23", "m24", "n0", "n1"]
+    assert carregar_pagina(30, 10) == []
+
+
+def test_paginas_do_sqlite(diretorio):
+    historico.configurar_backend("sqlite", str(diretorio / "historico.db"), migrar_csv=False)
+    historico.obter_banco().inserir(_registros(25))
+
+    assert contar_registros() == 25
+    assert [linha[0] for linha in carregar_pagina(0, 10)] == [f"m{indice}" for indice in range(10)]
+    assert [linha[0] for linha in carregar_pagina(10, 10)] == [f"m{indice}" for indice in range(10, 20)]
+    # Salto para uma posição não visitada e volta para uma já visitada
+    assert [linha[0] for linha in carregar_pagina(22, 10)] == ["m22", "m23", "m24"]
+    assert [linha[0] for linha in carregar_pagina(10, 2)] == ["m10", "m11"]
+
+
+def test_linha_final_incompleta_nao_e_contada(diretorio):
+    anexar_registros(_registros(3))
+    with open(historico.ARQUIVO_HISTORICO, "a", encoding="utf-8") as arquivo:
+        arquivo.write("interrompida,")
+
+    assert contar_registros() == 3
+    assert [linha[0] for linha in carregar_pagina(0, 10)] == ["m0", "m1", "m2"]
+
+    with open(historico.ARQUIVO_HISTORICO, "a", encoding="utf-8") as arquivo:
+        arquivo.write("x\n")
+    assert contar_registros() == 4
+
+
+def test_indice_salvo_e_reaproveitado(diretorio, monkeypatch):
+    monkeypatch.setattr(historico, "_LINHAS_POR_GRAVACAO_INDICE", 10)
+    anexar_registros(_registros(25))
+    assert contar_registros() == 25
+    assert os.path.exists(historico.ARQUIVO_HISTORICO + ".indice")
+
+    # Um novo processo parte do índice salvo e só varre as linhas acrescentadas depois
+    historico._indices_linhas.clear()
+    anexar_registros(_registros(2, "n"))
+    carregar = historico._carregar_indice
+    salvos = []
+    monkeypatch.setattr(historico, "_carregar_indice", lambda *argumentos: salvos.append(carregar(*argumentos))
+                        or salvos[-1])
+
+    assert contar_registros() == 27
+    assert [linha[0] for linha in carregar_pagina(24, 10)] == ["m24", "n0", "n1"]
+    assert len(salvos) == 1 and len(salvos[0]) == 1 + 1 + 25
+
+
+def test_indice_de_arquivo_substituido_e_refeito(diretorio, monkeypatch):
+    monkeypatch.setattr(historico, "_LINHAS_POR_GRAVACAO_INDICE", 10)
+    anexar_registros(_registros(25))
+    contar_registros()
+    historico._indices_linhas.clear()
+
+    temporario = historico.ARQUIVO_HISTORICO + ".novo"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(",".join(COLUNAS_HISTORICO) + "\n" + "a,b\n" * 3)
+    os.replace(temporario, historico.ARQUIVO_HISTORICO)
+
+    assert contar_registros() == 3
@@ -0,0 +1,91 @@
+import os
+
+import pandas as pd
+import pytest
+
+from modules.historico import COLUNAS_HISTORICO
+from modules.historico_sqlite import HistoricoSQLite
+
+
+class Interrupcao(Exception):
+    pass
+
+
+@pytest.fixture
+def banco(tmp_path):
+    banco = HistoricoSQLite(str(tmp_path / "historico.db"))
+    yield banco
+    banco.fechar()
+
+
+@pytest.fixture
+def arquivo_csv(tmp_path):
+    caminho = tmp_path / "historico.csv"
+    tabela = pd.DataFrame({coluna: range(10) for coluna in COLUNAS_HISTORICO})
+    tabela["Matricula"] = [f"m{indice}" for indice in range(10)]
+    tabela["Classificacao"] = ["A", "B"] * 5
+    tabela.to_csv(caminho, index=False)
+    return str(caminho)
+
+
+def _matriculas(linhas):
+    return [linha[COLUNAS_HISTORICO.index("Matricula")] for linha in linhas]
+
+
+def test_migracao_ocorre_uma_vez_por_arquivo(banco, arquivo_csv, monkeypatch):
+    assert banco.migrar_csv(arquivo_csv, tamanho_bloco=3) == 10
+
+    # O mesmo arquivo por outro caminho relativo não é importado de novo
+    monkeypatch.chdir(os.path.dirname(arquivo_csv))
+    assert banco.migrar_csv(os.path.basename(arquivo_csv)) == 0
+    assert _matriculas(banco.listar()) == [f"m{indice}" for indice in range(10)]
+
+
+def test_migracao_interrompida_continua_sem_duplicar(banco, arquivo_csv, monkeypatch):
+    ler_csv = pd.read_csv
+
+    def interromper_no_terceiro_bloco(*argumentos, **opcoes):
+        for numero, bloco in enumerate(ler_csv(*argumentos, **opcoes)):
+            if numero == 2:
+                raise Interrupcao
+            yield bloco
+
+    monkeypatch.setattr(pd, "read_csv", interromper_no_terceiro_bloco)
+    with pytest.raises(Interrupcao):
+        banco.migrar_csv(arquivo_csv, tamanho_bloco=3)
+    monkeypatch.setattr(pd, "read_csv", ler_csv)
+    assert banco.contar() == 6
+
+    assert banco.migrar_csv(arquivo_csv, tamanho_bloco=3) == 4
+    assert _matriculas(banco.listar()) == [f"m{indice}" for indice in range(10)]
+
+
+def test_marcador_de_versoes_anteriores_e_respeitado(banco, arquivo_csv):
+    with banco._conexao:
+        banco._conexao.execute("INSERT INTO metadados (chave, valor) VALUES (?, '10')",
+                               (f"migracao_csv:{arquivo_csv}",))
+
+    assert banco.migrar_csv(arquivo_csv) == 0
+    assert banco.contar() == 0
+
+
+def test_paginacao_pelo_ultimo_id(banco, arquivo_csv):
+    banco.migrar_csv(arquivo_csv)
+
+    primeira = banco.listar(4, com_id=True)
+    segunda = banco.listar(4, apos=primeira[-1][0], com_id=True)
+
+    assert _matriculas(linha[1:] for linha in primeira) == ["m0", "m1", "m2", "m3"]
+    assert _matriculas(linha[1:] for linha in segunda) == ["m4", "m5", "m6", "m7"]
+    assert banco.id_na_posicao(0, 4) == primeira[-1][0]
+    assert banco.id_na_posicao(0, 100) == banco.listar(com_id=True)[-1][0]
+
+
+def test_consulta_por_classificacao_paginada(banco, arquivo_csv):
+    banco.migrar_csv(arquivo_csv)
+
+    primeira = banco.consultar_por_classificacao("B", limite=3, com_id=True)
+    resto = banco.consultar_por_classificacao("B", apos=primeira[-1][0])
+
+    assert _matriculas(linha[1:] for linha in primeira) == ["m1", "m3", "m5"]
+    assert _matriculas(resto) == ["m7", "m9"]
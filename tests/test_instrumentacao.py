@@ -0,0 +1,86 @@
+import json
+import threading
+
+import pytest
+
+from modules import instrumentacao
+
+
+@pytest.fixture(autouse=True)
+def medicoes():
+    """Cada teste começa com a instrumentação ligada e sem medições; o estado anterior é restaurado"""
+    ativa = instrumentacao.ativa()
+    instrumentacao.zerar()
+    instrumentacao.ativar()
+    yield
+    instrumentacao.zerar()
+    if not ativa:
+        instrumentacao.desativar()
+
+
+def test_desligada_nao_mede():
+    instrumentacao.desativar()
+
+    with instrumentacao.etapa("inferencia"):
+        pass
+
+    assert instrumentacao.resumo() == {}
+
+
+def test_resumo_das_etapas():
+    for segundos in (0.0002, 0.0002, 0.003, 10.0):
+        instrumentacao.registrar("inferencia", segundos)
+    with instrumentacao.etapa("historico"):
+        pass
+
+    resumo = instrumentacao.resumo()
+
+    assert resumo["inferencia"]["chamadas"] == 4 and resumo["historico"]["chamadas"] == 1
+    assert resumo["inferencia"]["maximo"] == 10.0
+    assert resumo["inferencia"]["faixas"]["0.00025"] == 2 and resumo["inferencia"]["faixas"]["+Inf"] == 1
+
+
+def test_exporta_json(tmp_path):
+    instrumentacao.registrar("inferencia", 0.001)
+    arquivo = tmp_path / "metricas.json"
+
+    instrumentacao.exportar(str(arquivo))
+
+    assert json.loads(arquivo.read_text(encoding="utf-8"))["etapas"]["inferencia"]["chamadas"] == 1
+
+
+def test_exporta_prometheus_acumulado(tmp_path):
+    instrumentacao.registrar('etapa "x"', 0.0002)
+    instrumentacao.registrar('etapa "x"', 0.003)
+    arquivo = tmp_path / "metricas.prom"
+
+    instrumentacao.exportar(str(arquivo))
+
+    linhas = arquivo.read_text(encoding="utf-8").splitlines()
+    metrica = instrumentacao.METRICA_PROMETHEUS
+    assert f'{metrica}_bucket{{etapa="etapa \\"x\\"",le="0.00025"}} 1' in linhas
+    assert f'{metrica}_bucket{{etapa="etapa \\"x\\"",le="+Inf"}} 2' in linhas
+    assert f'{metrica}_count{{etapa="etapa \\"x\\""}} 2' in linhas
+
+
+def test_exportacoes_simultaneas_nao_deixam_temporarios(tmp_path):
+    instrumentacao.registrar("inferencia", 0.001)
+    arquivo = tmp_path / "metricas.json"
+    erros = []
+
+    def exportar():
+        try:
+            for _ in range(50):
+                instrumentacao.exportar(str(arquivo))
+        except Exception as e:
+            erros.append(e)
+
+    threads = [threading.Thread(target=exportar) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert erros == []
+    assert [caminho.name for caminho in tmp_path.iterdir()] == ["metricas.json"]
+    json.loads(arquivo.read_text(encoding="utf-8"))
@@ -0,0 +1,112 @@
+import json
+import shutil
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from modules import interface, motor_compilado
+from modules.interface import AvaliacaoFuzzyApp
+
+ENTRADAS = {'nota': 9.5, 'frequencia': 95.0, 'participacao': 9.0, 'socioemocional': 9.0, 'contexto': 9.0,
+            'motivacao': 9.0}
+
+
+class Raiz:
+    """Substitui a janela do Tk: guarda as chamadas agendadas com after"""
+
+    def __init__(self):
+        self.agendadas = []
+
+    def after(self, intervalo, funcao):
+        self.agendadas.append(funcao.__name__)
+
+
+class Widget:
+    def __init__(self):
+        self.destruido = False
+        self.texto = None
+
+    def get_tk_widget(self):
+        return self
+
+    def destroy(self):
+        self.destruido = True
+
+    def config(self, text):
+        self.texto = text
+
+
+@pytest.fixture
+def aplicativo(tmp_path, monkeypatch):
+    """Estado do aplicativo usado na recarga da base de regras, sem a janela do Tk"""
+    carregar = motor_compilado.carregar_sistema
+    monkeypatch.setattr(motor_compilado, "DIRETORIO_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setattr(motor_compilado, "carregar_sistema",
+                        lambda arquivo_regras=None: carregar(arquivo=None, arquivo_regras=arquivo_regras))
+    arquivo_regras = tmp_path / "regras.json"
+    shutil.copy(motor_compilado.ARQUIVO_REGRAS_PADRAO, arquivo_regras)
+
+    aplicativo = types.SimpleNamespace(
+        root=Raiz(), motor="compilado", arquivo_regras=str(arquivo_regras), versao_regras=None,
+        recompilacao=None, sistema_ctrl=None, desempenho=None, sistema_compilado=None, cache=None,
+        base_regras=None, trava_sistema=threading.Lock(), grafico=None, avaliacoes_pendentes=[],
+        rotulo_progresso=Widget(), executor=ThreadPoolExecutor(max_workers=1))
+    for nome in ("construir_sistema", "instalar_sistema", "versao_arquivo_regras", "verificar_regras",
+                 "verificar_recompilacao", "inferir_desempenho"):
+        setattr(aplicativo, nome, types.MethodType(getattr(AvaliacaoFuzzyApp, nome), aplicativo))
+    aplicativo.instalar_sistema(aplicativo.construir_sistema())
+    yield aplicativo
+    aplicativo.executor.shutdown()
+    aplicativo.cache.fechar()
+
+
+def _alterar_regras(arquivo, alteracao):
+    with open(arquivo, encoding="utf-8") as entrada:
+        definicao = json.load(entrada)
+    alteracao(definicao)
+    with open(arquivo, "w", encoding="utf-8") as saida:
+        json.dump(definicao, saida, ensure_ascii=False, indent=1)
+
+
+def test_recarga_troca_sistema_e_grafico_na_thread_do_tk(aplicativo):
+    anterior = aplicativo.sistema_compilado
+    grafico = aplicativo.grafico = {'canvas': Widget()}
+    _alterar_regras(aplicativo.arquivo_regras,
+                    lambda definicao: definicao['regras'][0].update(entao="desempenho[insuficiente]"))
+
+    aplicativo.verificar_regras()
+    aplicativo.recompilacao.result()
+
+    # Construído na thread de avaliação, mas só trocado pela verificação agendada no Tk
+    assert aplicativo.root.agendadas == ["verificar_recompilacao", "verificar_regras"]
+    assert aplicativo.sistema_compilado is anterior and aplicativo.grafico is grafico
+
+    aplicativo.verificar_recompilacao()
+
+    assert aplicativo.sistema_compilado is not anterior
+    assert aplicativo.grafico is None and grafico['canvas'].destruido
+    assert aplicativo.rotulo_progresso.texto == "Base de regras recarregada"
+    assert aplicativo.cache.avaliar(**ENTRADAS) < float(anterior.avaliar(**ENTRADAS))
+    assert np.isclose(aplicativo.cache.avaliar(**ENTRADAS), float(aplicativo.sistema_compilado.avaliar(**ENTRADAS)))
+
+
+def test_base_invalida_mantem_o_sistema(aplicativo, monkeypatch):
+    avisos = []
+    monkeypatch.setattr(interface.messagebox, "showwarning", lambda titulo, texto: avisos.append(texto))
+    anterior, grafico = aplicativo.sistema_compilado, {'canvas': Widget()}
+    aplicativo.grafico = grafico
+    _alterar_regras(aplicativo.arquivo_regras, lambda definicao: definicao['regras'][0].update(se="nota[otimo]"))
+
+    aplicativo.verificar_regras()
+    aplicativo.recompilacao.exception()
+    aplicativo.verificar_recompilacao()
+
+    assert "Regra 1" in avisos[0]
+    assert aplicativo.sistema_compilado is anterior and aplicativo.grafico is grafico
+    assert aplicativo.recompilacao is None
+    # A versão inválida não é recompilada de novo a cada verificação
+    aplicativo.verificar_regras()
+    assert aplicativo.recompilacao is None
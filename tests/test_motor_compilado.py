@@ -0,0 +1,113 @@
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from modules.fuzzy_logic import avaliar_lote, configurar_sistema_fuzzy
+from modules.motor_compilado import _ler_cache_sistemas, carregar_sistema
+
+
+@pytest.mark.parametrize("metodo", ['centroid', 'bisector', 'mom'])
+def test_universo_amostrado_igual_a_avaliar_lote(metodo, entradas):
+    sistema_ctrl, desempenho = configurar_sistema_fuzzy()
+    desempenho.defuzzify_method = metodo
+    compilado = carregar_sistema(arquivo=None, metodo_defuzzificacao=metodo, defuzzificacao_analitica=False)
+
+    np.testing.assert_allclose(compilado.avaliar(**entradas), avaliar_lote(sistema_ctrl, **entradas),
+                               rtol=0, atol=1e-9)
+
+
+def test_analitico_proximo_do_universo_amostrado(sistema, entradas):
+    sistema_ctrl, _ = configurar_sistema_fuzzy()
+
+    np.testing.assert_allclose(sistema.avaliar(**entradas), avaliar_lote(sistema_ctrl, **entradas),
+                               rtol=0, atol=1e-2)
+
+
+def test_escalar_igual_ao_lote(sistema, entradas):
+    lote = sistema.avaliar(**entradas)
+    escalar = sistema.avaliar(**{nome: float(valores[3]) for nome, valores in entradas.items()})
+
+    assert np.ndim(escalar) == 0
+    assert float(escalar) == lote[3]
+
+
+def test_blocos_nao_mudam_o_resultado(sistema, entradas):
+    grade = {nome: valores.reshape(6, 10) for nome, valores in entradas.items()}
+
+    np.testing.assert_array_equal(sistema.avaliar(tamanho_bloco=7, **grade), sistema.avaliar(**grade))
+    np.testing.assert_array_equal(sistema.rastro(tamanho_bloco=7, **entradas), sistema.rastro(**entradas))
+    np.testing.assert_array_equal(sistema.ativacoes(tamanho_bloco=7, **entradas), sistema.ativacoes(**entradas))
+
+
+def test_memoria_limitada_pelo_bloco(sistema):
+    """Só o resultado cresce com o número de alunos; as tabelas intermediárias ficam no tamanho do bloco"""
+    picos = []
+    for quantidade in (20000, 80000):
+        notas = np.linspace(0, 10, quantidade)
+        tracemalloc.start()
+        sistema.avaliar(nota=notas, frequencia=80.0, participacao=5.0, socioemocional=6.0, contexto=5.0,
+                        motivacao=9.0, tamanho_bloco=512)
+        picos.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    assert picos[1] - picos[0] < 2 * 60000 * 8
+
+
+def test_tabelas_da_saida_somente_leitura(sistema):
+    with pytest.raises(ValueError):
+        sistema.mfs_saida[0, 0] = 1.0
+
+
+def test_graus_categorias_igual_a_interpolacao(sistema):
+    desempenho = np.linspace(0, 100, 37)
+
+    graus = sistema.graus_categorias(desempenho)
+
+    esperado = np.stack([np.interp(desempenho, sistema.universo_saida, curva) for curva in sistema.mfs_saida],
+                        axis=-1)
+    np.testing.assert_allclose(graus, esperado, atol=1e-9)
+
+
+def test_cache_em_disco_sem_pickle(tmp_path, sistema, entradas):
+    arquivo = str(tmp_path / "cache" / "sistema.npz")
+
+    gravado = carregar_sistema(arquivo=arquivo)
+    lido = carregar_sistema(arquivo=arquivo)
+
+    assert lido is not gravado
+    assert lido.impressao_digital() == sistema.impressao_digital()
+    np.testing.assert_array_equal(lido.avaliar(**entradas), sistema.avaliar(**entradas))
+    assert not lido.mfs_saida.flags.writeable
+    with np.load(arquivo, allow_pickle=False) as tabelas:
+        assert "indice" in tabelas
+    if hasattr(os, "getuid"):
+        assert os.stat(arquivo).st_mode & 0o777 == 0o600
+
+
+def test_cache_guarda_cada_opcao(tmp_path):
+    arquivo = str(tmp_path / "sistema.npz")
+    carregar_sistema(arquivo=arquivo)
+    carregar_sistema(arquivo=arquivo, metodo_defuzzificacao="mom")
+
+    (sistemas,) = _ler_cache_sistemas(arquivo).values()
+    assert {opcoes[0] for opcoes in sistemas} == {None, "mom"}
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="permissões POSIX")
+def test_cache_alteravel_por_outros_e_ignorado(tmp_path):
+    arquivo = str(tmp_path / "sistema.npz")
+    carregar_sistema(arquivo=arquivo)
+    os.chmod(arquivo, 0o666)
+
+    assert _ler_cache_sistemas(arquivo) == {}
+
+
+def test_cache_corrompido_e_reconstruido(tmp_path, sistema):
+    arquivo = tmp_path / "sistema.npz"
+    arquivo.write_bytes(b"nao e um npz")
+    arquivo.chmod(0o600)
+
+    assert carregar_sistema(arquivo=str(arquivo)).impressao_digital() == sistema.impressao_digital()
+    assert len(_ler_cache_sistemas(str(arquivo))) == 1
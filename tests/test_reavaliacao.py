@@ -0,0 +1,128 @@
+import json
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import historico, motor_compilado, reavaliacao
+from modules.batch import avaliar_bloco
+from modules.benchmark import gerar_turma
+from modules.historico import COLUNAS_HISTORICO, decodificar_rastro
+from modules.historico_sqlite import HistoricoSQLite
+
+
+def _regras(tmp_path, nome, alteracao=None):
+    with open(motor_compilado.ARQUIVO_REGRAS_PADRAO, encoding="utf-8") as entrada:
+        definicao = json.load(entrada)
+    if alteracao:
+        alteracao(definicao)
+    arquivo = tmp_path / nome
+    arquivo.write_text(json.dumps(definicao, ensure_ascii=False), encoding="utf-8")
+    return str(arquivo)
+
+
+def _primeira_regra_insuficiente(definicao):
+    definicao['regras'][0]['entao'] = "desempenho[insuficiente]"
+
+
+@pytest.fixture(autouse=True)
+def sem_cache_em_disco(monkeypatch):
+    carregar = motor_compilado.carregar_sistema
+    monkeypatch.setattr(reavaliacao, "carregar_sistema",
+                        lambda arquivo_regras=None: carregar(arquivo=None, arquivo_regras=arquivo_regras))
+
+
+@pytest.fixture
+def regras(tmp_path):
+    return _regras(tmp_path, "antigas.json"), _regras(tmp_path, "novas.json", _primeira_regra_insuficiente)
+
+
+@pytest.fixture
+def pontuados(sistema):
+    """Turma pontuada com a base padrão, com as colunas do histórico e um rastro antigo"""
+    bloco, _ = avaliar_bloco(sistema, gerar_turma(300, semente=9))
+    bloco["Nota_Ajustada"] = ""
+    bloco["Base_Regras"] = "antiga"
+    bloco["Rastro"] = "1;2"
+    return bloco
+
+
+def test_comparar_sistemas(regras):
+    antigas, novas = (reavaliacao.carregar_sistema(arquivo_regras=arquivo) for arquivo in regras)
+
+    assert reavaliacao.comparar_sistemas(antigas, antigas)['regras'] == []
+    mudancas = reavaliacao.comparar_sistemas(antigas, novas)
+    assert len(mudancas['removidas']) == len(mudancas['adicionadas']) == 1
+    assert [regra[0] for regra in mudancas['regras']] == ["-", "+"] and not mudancas['completa']
+
+
+def test_mudanca_de_universo_reavalia_tudo(tmp_path, regras):
+    outra = _regras(tmp_path, "outra.json",
+                    lambda definicao: definicao['variaveis']['desempenho'].update(defuzzificacao="mom"))
+    antigas, novas = (reavaliacao.carregar_sistema(arquivo_regras=arquivo) for arquivo in (regras[0], outra))
+
+    assert reavaliacao.comparar_sistemas(antigas, novas)['completa']
+
+
+def test_reavalia_o_csv_sob_a_trava_exclusiva(tmp_path, regras, pontuados, monkeypatch):
+    arquivo = tmp_path / "historico.csv"
+    pontuados.to_csv(arquivo, index=False)
+    eventos = []
+    trava, substituir = historico._trava_historico, os.replace
+
+    @contextmanager
+    def registrar_trava(arquivo_csv, exclusiva=False):
+        with trava(arquivo_csv, exclusiva):
+            eventos.append(("trava", exclusiva))
+            yield
+            eventos.append(("libera", exclusiva))
+
+    monkeypatch.setattr(historico, "_trava_historico", registrar_trava)
+    monkeypatch.setattr(os, "replace", lambda *caminhos: eventos.append(("substitui",)) or substituir(*caminhos))
+
+    relatorio = reavaliacao.reavaliar_historico(*regras, arquivo_csv=str(arquivo))
+
+    assert eventos == [("trava", True), ("substitui",), ("libera", True)]
+    assert 0 < relatorio['alterados'] <= relatorio['reavaliados'] < relatorio['registros'] == 300
+    novo = reavaliacao.carregar_sistema(arquivo_regras=regras[1])
+    saida = pd.read_csv(arquivo, dtype=str, keep_default_na=False)
+    esperado, _ = avaliar_bloco(novo, pontuados.drop(columns=["Desempenho", "Classificacao"]))
+    np.testing.assert_allclose(saida["Desempenho"].astype(float), esperado["Desempenho"])
+
+    alteradas = saida["Base_Regras"] != "antiga"
+    assert alteradas.sum() == relatorio['alterados']
+    assert set(saida.loc[alteradas, "Base_Regras"]) == {novo.impressao_digital()[:16]}
+    assert (saida.loc[~alteradas, "Rastro"] == "1;2").all()
+    posicao = int(np.flatnonzero(alteradas)[0])
+    entradas, _, _ = reavaliacao.entradas_fuzzy(saida.iloc[[posicao]])
+    np.testing.assert_allclose(decodificar_rastro(saida.loc[posicao, "Rastro"]), novo.rastro(**entradas)[0],
+                               rtol=1e-5)
+
+
+def test_simulacao_nao_altera_o_csv(tmp_path, regras, pontuados):
+    arquivo = tmp_path / "historico.csv"
+    pontuados.to_csv(arquivo, index=False)
+    antes = arquivo.read_bytes()
+
+    relatorio = reavaliacao.reavaliar_historico(*regras, arquivo_csv=str(arquivo), simular=True)
+
+    assert relatorio['alterados'] > 0
+    assert arquivo.read_bytes() == antes
+
+
+def test_reavalia_o_sqlite(tmp_path, regras, pontuados):
+    banco = HistoricoSQLite(str(tmp_path / "historico.db"))
+    banco.inserir(pontuados.reindex(columns=COLUNAS_HISTORICO).to_dict("records"))
+
+    relatorio = reavaliacao.reavaliar_historico(*regras, banco=banco)
+
+    linhas = pd.DataFrame.from_records(banco.listar(), columns=COLUNAS_HISTORICO + ["Data_Avaliacao"])
+    banco.fechar()
+    novo = reavaliacao.carregar_sistema(arquivo_regras=regras[1])
+    alteradas = linhas["Base_Regras"] != "antiga"
+    assert 0 < alteradas.sum() == relatorio['alterados']
+    assert set(linhas.loc[alteradas, "Base_Regras"]) == {novo.impressao_digital()[:16]}
+    assert all(len(decodificar_rastro(rastro)) == len(novo.termos_saida) + len(novo.regras)
+               for rastro in linhas.loc[alteradas, "Rastro"])
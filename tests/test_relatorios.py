@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+from modules import relatorios
+from modules.benchmark import gerar_turma
+
+
+@pytest.fixture
+def turma_csv(tmp_path):
+    turma = gerar_turma(6, semente=8)
+    turma.loc[2, "Frequencia"] = float("nan")
+    caminho = tmp_path / "turma.csv"
+    turma.to_csv(caminho, index=False)
+    return str(caminho)
+
+
+def _relatorios(destino):
+    return sorted(arquivo for arquivo in os.listdir(destino) if arquivo.endswith(".html")
+                  and arquivo != relatorios.ARQUIVO_INDICE)
+
+
+def test_exporta_relatorios_e_indice(tmp_path, turma_csv, sistema):
+    destino = str(tmp_path / "saida")
+
+    resultado = relatorios.exportar_turma(turma_csv, destino, sistema, trabalhadores=1)
+
+    assert resultado['alunos'] == 6 and resultado['relatorios'] == 5 and resultado['incompletos'] == 1
+    assert len(_relatorios(destino)) == 5
+    indice = (tmp_path / "saida" / relatorios.ARQUIVO_INDICE).read_text(encoding="utf-8")
+    assert indice.count('">relatório</a>') == 5 and "dados incompletos" in indice
+
+
+def test_retoma_exportacao_interrompida(tmp_path, turma_csv, sistema, monkeypatch):
+    destino = str(tmp_path / "saida")
+    monkeypatch.setattr(relatorios, "ALUNOS_POR_TAREFA", 2)
+    exportar_bloco = relatorios.exportar_bloco
+    blocos = []
+
+    def interromper_no_segundo(sistema, tarefa):
+        blocos.append([aluno[0] for aluno in tarefa['alunos']])
+        if len(blocos) == 2:
+            raise KeyboardInterrupt
+        return exportar_bloco(sistema, tarefa)
+
+    monkeypatch.setattr(relatorios, "exportar_bloco", interromper_no_segundo)
+    with pytest.raises(KeyboardInterrupt):
+        relatorios.exportar_turma(turma_csv, destino, sistema, trabalhadores=1)
+    monkeypatch.setattr(relatorios, "exportar_bloco", exportar_bloco)
+
+    retomada = relatorios.exportar_turma(turma_csv, destino, sistema, trabalhadores=1)
+
+    assert retomada['retomados'] == 2 and retomada['relatorios'] == 5
+    with open(os.path.join(destino, relatorios.ARQUIVO_PROGRESSO), encoding="utf-8") as progresso:
+        posicoes = [json.loads(linha).get('posicao') for linha in progresso][1:]
+    assert sorted(posicoes) == [0, 1, 3, 4, 5]
+
+
+def test_recomecar_e_relatorio_apagado(tmp_path, turma_csv, sistema):
+    destino = str(tmp_path / "saida")
+    relatorios.exportar_turma(turma_csv, destino, sistema, trabalhadores=1)
+    apagado = _relatorios(destino)[0]
+    os.remove(os.path.join(destino, apagado))
+
+    retomada = relatorios.exportar_turma(turma_csv, destino, sistema, trabalhadores=1)
+    assert retomada['retomados'] == 4 and apagado in _relatorios(destino)
+
+    assert relatorios.exportar_turma(turma_csv, destino, sistema, trabalhadores=1, recomecar=True)['retomados'] == 0
+
+
+def test_progresso_de_outra_turma_e_ignorado(tmp_path, turma_csv, sistema):
+    destino = str(tmp_path / "saida")
+    relatorios.exportar_turma(turma_csv, destino, sistema, trabalhadores=1)
+    with open(turma_csv, "a", encoding="utf-8") as arquivo:
+        arquivo.write("\n")
+
+    assert relatorios.ler_progresso(destino, relatorios.assinatura_exportacao(turma_csv, sistema, "html")) == {}
+    assert relatorios.exportar_turma(turma_csv, destino, sistema, trabalhadores=1)['retomados'] == 0
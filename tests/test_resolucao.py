@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from modules.fuzzy_logic import DEFINICAO_PADRAO, LIMITES_UNIVERSO, criar_universo
+from modules.resolucao import comparar_resolucao, main
+
+
+def test_universo_de_passo_fixo_inclui_o_maximo():
+    universo = criar_universo('nota', 0.3)
+
+    assert universo[0] == 0 and universo[-1] == 10
+    np.testing.assert_allclose(np.diff(universo[:-1]), 0.3)
+
+
+def test_universo_adaptativo_contem_os_pontos_de_quebra():
+    universo = criar_universo('nota', 'adaptativa')
+
+    for _, parametros in DEFINICAO_PADRAO['variaveis']['nota']['termos'].values():
+        assert set(np.clip(parametros, 0, 10)) <= set(universo)
+    assert len(universo) < len(criar_universo('nota'))
+
+
+def test_resolucao_invalida():
+    with pytest.raises(ValueError):
+        criar_universo('nota', 0)
+
+
+def test_referencia_comparada_consigo_mesma_nao_tem_erro():
+    r = comparar_resolucao(0.1, referencia=0.1, amostras=300)
+
+    assert r['erro_maximo'] == 0.0 and r['divergencias'] == 0
+    assert r['bytes'] == r['bytes_referencia']
+
+
+def test_antecedentes_adaptativos_mantem_a_saida():
+    opcao = {variavel: 'adaptativa' for variavel in LIMITES_UNIVERSO if variavel != 'desempenho'}
+
+    r = comparar_resolucao(opcao, amostras=300)
+
+    assert r['bytes'] < r['bytes_referencia']
+    assert r['erro_maximo'] < 1e-6
+
+
+def test_linha_de_comando(capsys):
+    assert main(['0.5', '--saida', '0.1', '--amostras', '200']) == 0
+
+    assert 'erro máx.' in capsys.readouterr().out
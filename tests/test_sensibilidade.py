@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from modules import sensibilidade
+
+
+def test_forma_entradas_segue_o_broadcast(sistema):
+    entradas = sensibilidade.valores_fixos(sistema)
+    x, y = sistema.variaveis[:2]
+    entradas.update({x: np.full((3, 1), entradas[x]), y: np.full(4, entradas[y])})
+
+    forma = sistema.forma_entradas(**entradas)
+
+    assert forma == (3, 4)
+
+
+def test_avaliar_grade_igual_a_avaliar(sistema):
+    x, y = sistema.variaveis[:2]
+    fixas = {nome: valor for nome, valor in sensibilidade.valores_fixos(sistema).items() if nome not in (x, y)}
+    (min_x, max_x), (min_y, max_y) = sistema.limites[:2]
+    grade = {x: np.linspace(min_x, max_x, 15)[:, None], y: np.linspace(min_y, max_y, 12)[None, :]}
+
+    esperado = sistema.avaliar(**fixas, **grade)
+    obtido = sensibilidade.avaliar_grade(sistema, **fixas, **grade)
+
+    assert obtido.shape == (15, 12)
+    np.testing.assert_allclose(obtido, esperado, equal_nan=True)
+
+
+def test_varrer_dois_eixos_marca_fronteiras(sistema):
+    x, y = sistema.variaveis[:2]
+
+    resultado = sensibilidade.varrer(sistema, [x, y], pontos=30)
+
+    assert list(resultado['eixos']) == [x, y]
+    assert resultado['desempenho'].shape == resultado['fronteiras'].shape == (30, 30)
+    assert x not in resultado['fixas'] and y not in resultado['fixas']
+    nivel = sensibilidade._nivel_classificacao(resultado['desempenho'])
+    diferentes = nivel[:-1, :] != nivel[1:, :]
+    assert not diferentes.any() or resultado['fronteiras'][:-1, :][diferentes].all()
+
+
+def test_varrer_rejeita_entradas_invalidas(sistema):
+    with pytest.raises(ValueError):
+        sensibilidade.varrer(sistema, sistema.variaveis[:3])
+    with pytest.raises(ValueError):
+        sensibilidade.varrer(sistema, ["inexistente"])
+    with pytest.raises(ValueError):
+        sensibilidade.valores_fixos(sistema, {"inexistente": 1.0})
+
+
+def test_amostrar_respeita_fixas_e_indices_ordenados(sistema):
+    fixa = sistema.variaveis[0]
+
+    amostra = sensibilidade.amostrar(sistema, quantidade=2000, fixas={fixa: 5.0}, semente=1)
+    indices = sensibilidade.indices_sensibilidade(amostra)
+
+    assert np.all(amostra['entradas'][fixa] == 5.0)
+    assert indices[fixa] == 0.0
+    assert list(indices.values()) == sorted(indices.values(), reverse=True)
+    assert all(0.0 <= indice <= 1.0 for indice in indices.values())
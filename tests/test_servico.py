@@ -0,0 +1,113 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import numpy as np
+import pytest
+
+from modules.avaliacao import pontuar_alunos
+from modules.servico import AgrupadorLotes, RequisicaoInvalida, ServicoAvaliacao, montar_colunas
+
+
+def _aluno(**campos):
+    aluno = {'Matricula': "1", 'Nota_Teoria1': 7, 'Nota_Teoria2': 8, 'Nota_Pratica': 6, 'Nota_Grupo': 9,
+             'Frequencia': 90, 'Participacao': 7, 'Socioemocional': 8, 'Contexto': 5, 'Motivacao_Cat': "Alta"}
+    aluno.update(campos)
+    return aluno
+
+
+@pytest.mark.parametrize("aluno, trecho", [
+    (_aluno(Nota_Pratica=None), "Nota_Pratica não pode estar vazio"),
+    (_aluno(Frequencia=120), "entre 0 e 100"),
+    (_aluno(Contexto=True), "não é um número válido"),
+    (_aluno(Motivacao_Cat="Enorme"), "Motivacao_Cat deve ser"),
+    (_aluno(Motivacao_Cat=["Alta"]), "Motivacao_Cat deve ser um texto"),
+    (_aluno(Motivacao_Cat={"Alta": 1}), "Motivacao_Cat deve ser um texto"),
+    ("aluno", "objeto JSON"),
+])
+def test_campos_invalidos(aluno, trecho):
+    with pytest.raises(RequisicaoInvalida) as erro:
+        montar_colunas([_aluno(), aluno])
+
+    assert erro.value.status == HTTPStatus.BAD_REQUEST
+    assert str(erro.value).startswith("Aluno 1: ") and trecho in str(erro.value)
+
+
+def test_motivacao_numerica_sem_categoria():
+    colunas = montar_colunas([_aluno(Motivacao_Cat="", Motivacao="3.5")])
+
+    assert colunas['motivacao'][0] == 3.5 and colunas['motivacao_cat'][0] == ""
+
+
+def test_requisicoes_simultaneas_dividem_lotes(sistema):
+    requisicoes = [[_aluno(Nota_Pratica=indice % 11, Frequencia=10 * (indice % 10))] * (1 + indice % 3)
+                   for indice in range(12)]
+
+    async def avaliar_todas():
+        agrupador = AgrupadorLotes(sistema, janela=0.05, tamanho_maximo=8)
+        agrupador.iniciar()
+        try:
+            resultados = await asyncio.gather(*(agrupador.avaliar(montar_colunas(alunos)) for alunos in requisicoes))
+        finally:
+            await agrupador.encerrar()
+        return agrupador, resultados
+
+    agrupador, resultados = asyncio.run(avaliar_todas())
+
+    total = sum(len(alunos) for alunos in requisicoes)
+    assert agrupador.alunos == total and agrupador.na_fila == 0
+    assert total / 8 <= agrupador.lotes < len(requisicoes)
+    for alunos, resultado in zip(requisicoes, resultados):
+        esperado = pontuar_alunos(sistema, **montar_colunas(alunos))
+        np.testing.assert_array_equal(resultado['desempenho'], esperado['desempenho'])
+        assert list(resultado['classificacao']) == list(esperado['classificacao'])
+
+
+async def _enviar(porta, pedidos):
+    leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    respostas = []
+    try:
+        for metodo, caminho, corpo in pedidos:
+            corpo = corpo.encode("utf-8")
+            escritor.write(f"{metodo} {caminho} HTTP/1.1\r\nHost: local\r\nContent-Length: {len(corpo)}\r\n\r\n"
+                           .encode("latin-1") + corpo)
+            await escritor.drain()
+            cabecalho = (await leitor.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            tamanho = next(int(linha.split(":")[1]) for linha in cabecalho if linha.startswith("Content-Length"))
+            respostas.append((int(cabecalho[0].split(" ")[1]), json.loads(await leitor.readexactly(tamanho))))
+    finally:
+        escritor.close()
+    return respostas
+
+
+def test_servico_responde_na_mesma_conexao(sistema):
+    async def executar():
+        servico = ServicoAvaliacao(sistema, porta=0, janela=0.001)
+        await servico.iniciar()
+        try:
+            return servico, await _enviar(servico.porta, [
+                ("POST", "/avaliar", json.dumps(_aluno())),
+                ("POST", "/avaliar", json.dumps([_aluno(Matricula="a"), _aluno(Matricula="b", Nota_Pratica=2)])),
+                ("POST", "/avaliar", json.dumps([_aluno(), _aluno(Motivacao_Cat=[1])])),
+                ("POST", "/avaliar", "{"),
+                ("GET", "/avaliar", ""),
+                ("GET", "/inexistente", ""),
+                ("GET", "/metricas", ""),
+            ])
+        finally:
+            await servico.encerrar()
+
+    servico, respostas = asyncio.run(executar())
+
+    status = [codigo for codigo, _ in respostas]
+    assert status == [200, 200, 400, 400, 405, 404, 200]
+    individual, lista = respostas[0][1], respostas[1][1]
+    assert individual['Matricula'] == "1" and 0 <= individual['Desempenho'] <= 100
+    assert [resposta['Matricula'] for resposta in lista] == ["a", "b"]
+    assert "Aluno 1" in respostas[2][1]['erro']
+    assert respostas[6][1]['alunos'] == 3 and servico.erros == 4
+
+
+def test_servico_so_no_endereco_local(sistema):
+    with pytest.raises(ValueError):
+        ServicoAvaliacao(sistema, host="0.0.0.0")